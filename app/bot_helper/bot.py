@@ -1,7 +1,56 @@
 import aiogram
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
 
-from app.config import get_settings
+from app.config import DefaultSettings, get_settings, on_settings_reload
+from app.utils.common import on_scheduler_loop
+
+
+class BotSession(AiohttpSession):
+    """
+    Connections of the session belong to the loop that opened them,
+    requests of scheduler jobs run on their own loop in pool threads
+    are sent by the scheduler loop.
+    """
+
+    async def make_request(  # pylint: disable=redefined-outer-name
+        self,
+        bot: aiogram.Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: int | None = None,
+    ) -> TelegramType:
+        return await on_scheduler_loop(
+            super().make_request(bot, method, timeout)
+        )
+
+
+def _bot_options(settings: DefaultSettings) -> tuple[str, str]:
+    return settings.TG_HELPER_BOT_TOKEN, settings.TG_API_URL
+
+
+def create_bot(settings: DefaultSettings) -> aiogram.Bot:
+    token, api_url = _bot_options(settings)
+    return aiogram.Bot(
+        token=token,
+        session=(
+            BotSession(api=TelegramAPIServer.from_base(api_url))
+            if api_url
+            else BotSession()
+        ),
+    )
 
 
 _settings = get_settings()
-bot = aiogram.Bot(token=_settings.TG_HELPER_BOT_TOKEN)
+bot = create_bot(_settings)
+
+
+@on_settings_reload
+def _reload_bot(settings: DefaultSettings) -> None:
+    # Senders refer to `bot.bot` on every request,
+    # requests already sent finish with the previous bot
+    global bot, _settings  # pylint: disable=global-statement
+    if _bot_options(settings) != _bot_options(_settings):
+        bot = create_bot(settings)
+    _settings = settings
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import os
+import pathlib
+import typing as tp
+
+import loguru
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.config import get_settings
+from app.metrics import TELEGRAM_SEND_FAILURES
+
+
+MAX_MESSAGE_LENGTH = 4000
+BATCH_SEPARATOR = '\n\n'
+T = tp.TypeVar('T')
+
+
+class Notification(tp.NamedTuple):
+    # Callable is formatted by the background task, off request path
+    text: str | tp.Callable[[], str]
+    level: str
+    chat_id: str | None
+
+
+async def retry_telegram(
+    call: tp.Callable[[], tp.Awaitable[T]], max_retries: int
+) -> T:
+    """
+    Retry Telegram request after `retry_after` of 429 responses and
+    with exponential backoff after other errors, the last error
+    is raised.
+    """
+    delay = 1.0
+    for _ in range(max_retries):
+        try:
+            return await call()
+        except TelegramRetryAfter as exc:
+            await asyncio.sleep(exc.retry_after)
+        except Exception:  # pylint: disable=broad-except
+            await asyncio.sleep(delay)
+            delay *= 2
+    return await call()
+
+
+def _render(notification: Notification) -> Notification:
+    if not callable(notification.text):
+        return notification
+    try:
+        text = notification.text()
+    except Exception as exc:  # pylint: disable=broad-except
+        loguru.logger.exception('Error while formatting message: {}', exc)
+        text = f'Error while formatting message: {exc}'
+    return notification._replace(text=text)
+
+
+def _coalesce(notifications: list[Notification]) -> list[Notification]:
+    """
+    Join notifications to the same chat into as few messages as fit
+    into Telegram limit, repeated texts are sent once with a counter.
+    """
+    counts: dict[Notification, int] = {}
+    for notification in notifications:
+        counts[notification] = counts.get(notification, 0) + 1
+
+    batches: dict[tuple[str, str | None], list[str]] = {}
+    for notification, count in counts.items():
+        text = str(notification.text)
+        if count > 1:
+            text = f'{text}\n(repeated {count} times)'
+        texts = batches.setdefault(
+            (notification.level, notification.chat_id), []
+        )
+        if (
+            texts
+            and len(texts[-1]) + len(BATCH_SEPARATOR) + len(text)
+            <= MAX_MESSAGE_LENGTH
+        ):
+            texts[-1] = f'{texts[-1]}{BATCH_SEPARATOR}{text}'
+        else:
+            texts.append(text)
+    return [
+        Notification(text, level, chat_id)
+        for (level, chat_id), texts in batches.items()
+        for text in texts
+    ]
+
+
+class NotificationDispatcher:
+    """
+    Background sender of Telegram messages.
+
+    `enqueue` never waits for Telegram: messages are put to a bounded
+    queue, collected for `TG_BATCH_DELAY` seconds, coalesced and sent
+    by a background task. Telegram 429 responses are retried after
+    `retry_after`, other errors with exponential backoff. When the
+    queue is full messages are rendered and appended to `TG_SPILL_FILE`
+    in a thread. Once the queue drains they are read back in a thread,
+    at most `TG_QUEUE_SIZE` at a time, and sent.
+    """
+
+    def __init__(
+        self,
+        send: tp.Callable[[str, str, str | None], tp.Awaitable[None]],
+    ) -> None:
+        self.send = send
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[Notification] | None = None
+        self._task: asyncio.Task[None] | None = None
+        # Taken from the queue, waiting for the batch to be sent
+        self._pending: list[Notification] = []
+        self._spills: set[asyncio.Future[None]] = set()
+        self._reloading: asyncio.Future[list[Notification]] | None = None
+        # Read position in the spill file taken over by this process
+        self._spill_offset = 0
+
+    def enqueue(
+        self,
+        message: str | tp.Callable[[], str],
+        level: str = 'error',
+        chat_id: str | None = None,
+    ) -> None:
+        loop = self._loop
+        if (
+            loop is not None
+            and loop.is_running()
+            and loop is not asyncio.get_running_loop()
+        ):
+            # Called by a job running on its own loop in a pool thread,
+            # the queue and its task stay with the scheduler loop
+            loop.call_soon_threadsafe(self.enqueue, message, level, chat_id)
+            return
+        notification = Notification(message, level, chat_id)
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            # Rendering and file writing are left to a thread,
+            # the caller may be handling a request
+            spill = asyncio.get_running_loop().run_in_executor(
+                None, self._spill, notification
+            )
+            self._spills.add(spill)
+            spill.add_done_callback(self._spilled)
+
+    async def close(self) -> None:
+        """
+        Send everything queued (and spilled) and stop background task.
+        """
+        if self._task is None or self._loop is not asyncio.get_running_loop():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        if self._reloading is not None:
+            self._pending.extend(await self._reloading)
+            self._reloading = None
+        await self._wait_spills()
+        notifications, self._pending = self._pending, []
+        notifications.extend(self._drain())
+        while spilled := await asyncio.to_thread(
+            self._load_spilled, self._queue_size()
+        ):
+            notifications.extend(spilled)
+        await self._send_batch(notifications)
+        self._task = None
+
+    def _ensure_started(self) -> asyncio.Queue[Notification]:
+        loop = asyncio.get_running_loop()
+        # Queue and task belong to one event loop, a new loop
+        # (forked worker, another asyncio.run) gets its own
+        if self._loop is not loop or self._queue is None:
+            self._loop = loop
+            self._queue = asyncio.Queue(get_settings().TG_QUEUE_SIZE)
+            self._task = None
+            self._pending = []
+            self._spills = set()
+            self._reloading = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    async def _run(self) -> None:
+        queue = self._queue
+        assert queue is not None  # nosec
+        while True:
+            # Messages spill only while the queue is full,
+            # they are sent once it drains
+            if queue.empty() and await self._reload_spilled():
+                continue
+            self._pending.append(await queue.get())
+            await asyncio.sleep(get_settings().TG_BATCH_DELAY)
+            await self._send_pending()
+
+    async def _reload_spilled(self) -> bool:
+        """
+        Send next batch of spilled messages, False if there are none.
+        """
+        await self._wait_spills()
+        # Shielded, so batch taken from the file is kept
+        # for `close` when the task is cancelled
+        self._reloading = asyncio.ensure_future(
+            asyncio.to_thread(self._load_spilled, self._queue_size())
+        )
+        self._pending.extend(await asyncio.shield(self._reloading))
+        self._reloading = None
+        if not self._pending:
+            return False
+        await self._send_pending()
+        return True
+
+    async def _send_pending(self) -> None:
+        await self._wait_spills()
+        notifications, self._pending = self._pending, []
+        await self._send_batch([*notifications, *self._drain()])
+
+    def _queue_size(self) -> int:
+        return self._queue.maxsize if self._queue is not None else 0
+
+    def _drain(self) -> list[Notification]:
+        notifications = []
+        while self._queue is not None and not self._queue.empty():
+            notifications.append(self._queue.get_nowait())
+        return notifications
+
+    async def _send_batch(self, notifications: list[Notification]) -> None:
+        rendered = [_render(notification) for notification in notifications]
+        for notification in _coalesce(rendered):
+            await self._send_with_retry(notification)
+
+    async def _send_with_retry(self, notification: Notification) -> None:
+        try:
+            await retry_telegram(
+                lambda: self.send(
+                    str(notification.text),
+                    notification.level,
+                    notification.chat_id,
+                ),
+                get_settings().TG_MAX_RETRIES,
+            )
+        except TelegramRetryAfter:
+            TELEGRAM_SEND_FAILURES.labels('dispatcher').inc()
+            loguru.logger.error('Telegram rate limit, message dropped')
+        except Exception as exc:  # pylint: disable=broad-except
+            TELEGRAM_SEND_FAILURES.labels('dispatcher').inc()
+            loguru.logger.exception('Error while sending message: {}', exc)
+
+    async def _wait_spills(self) -> None:
+        if self._spills:
+            await asyncio.wait(self._spills)
+
+    def _spilled(self, spill: asyncio.Future[None]) -> None:
+        self._spills.discard(spill)
+        if not spill.cancelled() and spill.exception() is not None:
+            loguru.logger.opt(exception=spill.exception()).error(
+                'Error while spilling message'
+            )
+
+    @staticmethod
+    def _spill(notification: Notification) -> None:
+        path = get_settings().TG_SPILL_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(_render(notification)._asdict()) + '\n')
+
+    def _load_spilled(self, limit: int) -> list[Notification]:
+        """
+        Read up to `limit` (all if not positive) spilled messages,
+        runs in a thread.
+        """
+        path = get_settings().TG_SPILL_FILE
+        taken = pathlib.Path(f'{path}.{os.getpid()}')
+        if not taken.exists():
+            # Take the file over atomically, other processes
+            # keep spilling to a new one
+            try:
+                os.replace(path, taken)
+            except FileNotFoundError:
+                return []
+            self._spill_offset = 0
+        notifications: list[Notification] = []
+        finished = False
+        with open(taken, encoding='utf-8') as file:
+            file.seek(self._spill_offset)
+            while limit <= 0 or len(notifications) < limit:
+                line = file.readline()
+                if not line:
+                    finished = True
+                    break
+                notifications.append(Notification(**json.loads(line)))
+            self._spill_offset = file.tell()
+        if finished:
+            taken.unlink()
+        return notifications
@@ -1,6 +1,11 @@
 from .db_dump import send_db_dump
 from .file import send_file
+from .large_file import assemble_file, send_large_file
 from .message import (
+    dispatcher,
+    error_aggregator,
+    format_traceback_message,
+    send_error_report_safe,
     send_message,
     send_message_safe,
     send_traceback_message,
@@ -10,11 +15,17 @@ from .ping_status import send_ping_status
 
 
 __all__ = [
+    'assemble_file',
+    'dispatcher',
+    'error_aggregator',
+    'format_traceback_message',
     'send_db_dump',
+    'send_error_report_safe',
     'send_message',
     'send_traceback_message',
     'send_message_safe',
     'send_traceback_message_safe',
     'send_ping_status',
     'send_file',
+    'send_large_file',
 ]
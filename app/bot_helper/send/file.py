@@ -1,30 +1,29 @@
 import pathlib
 
+from aiogram.types import FSInputFile
+
 from app.bot_helper import bot
 from app.config import get_settings
 
+from .large_file import send_large_file
+
 
 async def send_file(
     filename: str | pathlib.Path, caption: str, chat_id: str | None = None
 ) -> None:
-    chat_id = chat_id or get_settings().TG_ERROR_CHAT_ID
-    with open(filename, 'rb') as f:
-        await bot.bot.send_document(
-            chat_id=chat_id,
-            document=f,  # type: ignore
-            caption=caption,
-            disable_notification=True,
-        )
-    # TODO: pyrogram
-    # except aiogram_exceptions.NetworkError as exc:
-    #     if str(exc).startswith('File too large for uploading'):
-    #         with open(filename, 'rb') as f:
-    #             async with bot.bot_client:
-    #                 await bot.bot_client.send_document(
-    #                     chat_id=int(chat_id),
-    #                     document=f,
-    #                     caption=caption,
-    #                     disable_notification=True,
-    #                 )
-    #     else:
-    #         raise exc
+    """
+    Send file as a document, files larger than `TG_UPLOAD_LIMIT`
+    are sent in parts with `send_large_file`.
+    """
+    settings = get_settings()
+    chat_id = chat_id or settings.TG_ERROR_CHAT_ID
+    path = pathlib.Path(filename)
+    if path.stat().st_size > settings.TG_UPLOAD_LIMIT:
+        await send_large_file(path, caption, chat_id)
+        return
+    await bot.bot.send_document(
+        chat_id=chat_id,
+        document=FSInputFile(path),
+        caption=caption,
+        disable_notification=True,
+    )
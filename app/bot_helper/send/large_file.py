@@ -0,0 +1,199 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import pathlib
+import shutil
+import tempfile
+import typing as tp
+
+from aiogram.types import BufferedInputFile, InputFile
+
+from app.bot_helper import bot
+from app.bot_helper.dispatcher import retry_telegram
+from app.config import get_settings
+
+
+# Files with these suffixes are sent as is, compressing them gains nothing
+COMPRESSED_SUFFIXES = frozenset(
+    {'.gz', '.bz2', '.xz', '.zst', '.zip', '.dump'}
+)
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class FilePart(InputFile):
+    """
+    `length` bytes of file from `offset`, read from disk chunk by chunk.
+    """
+
+    def __init__(
+        self, path: pathlib.Path, offset: int, length: int, filename: str
+    ) -> None:
+        super().__init__(filename=filename, chunk_size=READ_CHUNK_SIZE)
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    async def read(
+        self, bot: tp.Any  # pylint: disable=redefined-outer-name
+    ) -> tp.AsyncGenerator[bytes, None]:
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(
+                    file.read, min(self.chunk_size, remaining)
+                )
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+class PartInfo(tp.NamedTuple):
+    name: str
+    offset: int
+    size: int
+    sha256: str
+
+
+def _compress(path: pathlib.Path, target: pathlib.Path) -> None:
+    with open(path, 'rb') as src, gzip.open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, READ_CHUNK_SIZE)
+
+
+def describe_parts(
+    path: pathlib.Path, part_size: int
+) -> tuple[str, list[PartInfo]]:
+    """
+    Checksum of the whole file and of each part, in one pass.
+    """
+    total = hashlib.sha256()
+    parts: list[PartInfo] = []
+    with open(path, 'rb') as file:
+        while True:
+            offset = file.tell()
+            part = hashlib.sha256()
+            size = 0
+            while size < part_size:
+                chunk = file.read(min(READ_CHUNK_SIZE, part_size - size))
+                if not chunk:
+                    break
+                total.update(chunk)
+                part.update(chunk)
+                size += len(chunk)
+            if size == 0:
+                break
+            parts.append(
+                PartInfo(
+                    f'{path.name}.part{len(parts) + 1:03d}',
+                    offset,
+                    size,
+                    part.hexdigest(),
+                )
+            )
+    return total.hexdigest(), parts
+
+
+async def send_large_file(
+    path: pathlib.Path, caption: str, chat_id: str
+) -> None:
+    """
+    Send file that doesn't fit into Bot API limit: compress it unless
+    already compressed, send `TG_UPLOAD_PART_SIZE` parts concurrently
+    and then the manifest to put them back together with
+    `assemble_file`.
+    """
+    settings = get_settings()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        upload = path
+        if path.suffix not in COMPRESSED_SUFFIXES:
+            upload = pathlib.Path(tmp_dir) / f'{path.name}.gz'
+            await asyncio.to_thread(_compress, path, upload)
+        sha256, parts = await asyncio.to_thread(
+            describe_parts, upload, settings.TG_UPLOAD_PART_SIZE
+        )
+
+        semaphore = asyncio.Semaphore(settings.TG_UPLOAD_CONCURRENCY)
+
+        async def send_part(number: int, part: PartInfo) -> None:
+            async with semaphore:
+                await retry_telegram(
+                    lambda: bot.bot.send_document(
+                        chat_id=chat_id,
+                        document=FilePart(
+                            upload, part.offset, part.size, part.name
+                        ),
+                        caption=f'{caption} (part {number}/{len(parts)})',
+                        disable_notification=True,
+                    ),
+                    settings.TG_MAX_RETRIES,
+                )
+
+        # One failed part cancels the rest before the file is removed
+        try:
+            async with asyncio.TaskGroup() as group:
+                for number, part in enumerate(parts, start=1):
+                    group.create_task(send_part(number, part))
+        except ExceptionGroup as exc:
+            error, *_ = exc.exceptions
+            raise error from exc
+
+    manifest = {
+        'name': path.name,
+        'compressed': upload is not path,
+        'size': sum(part.size for part in parts),
+        'sha256': sha256,
+        'parts': [part._asdict() for part in parts],
+    }
+    await bot.bot.send_document(
+        chat_id=chat_id,
+        document=BufferedInputFile(
+            json.dumps(manifest, indent=2).encode(),
+            filename=f'{path.name}.manifest.json',
+        ),
+        caption=f'{caption} (manifest, {len(parts)} parts)',
+        disable_notification=True,
+    )
+
+
+def _join_parts(
+    manifest: dict[str, tp.Any],
+    directory: pathlib.Path,
+    target: pathlib.Path,
+) -> None:
+    total = hashlib.sha256()
+    with open(target, 'wb') as dst:
+        for part in manifest['parts']:
+            part_sha256 = hashlib.sha256()
+            with open(directory / part['name'], 'rb') as src:
+                while chunk := src.read(READ_CHUNK_SIZE):
+                    part_sha256.update(chunk)
+                    total.update(chunk)
+                    dst.write(chunk)
+            if part_sha256.hexdigest() != part['sha256']:
+                raise ValueError(f'Checksum mismatch in {part["name"]}')
+    if total.hexdigest() != manifest['sha256']:
+        raise ValueError(f'Checksum mismatch in {manifest["name"]}')
+
+
+def assemble_file(manifest_path: pathlib.Path) -> pathlib.Path:
+    """
+    Join parts lying next to the manifest, check checksums
+    and decompress, return path of the restored file.
+    """
+    manifest = json.loads(manifest_path.read_text())
+    directory = manifest_path.parent
+    target = directory / manifest['name']
+    joined = target.with_name(f'{target.name}.joined')
+    try:
+        _join_parts(manifest, directory, joined)
+    except BaseException:
+        joined.unlink(missing_ok=True)
+        raise
+    if not manifest['compressed']:
+        return joined.replace(target)
+    with gzip.open(joined, 'rb') as src, open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, READ_CHUNK_SIZE)
+    joined.unlink()
+    return target
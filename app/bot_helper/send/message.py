@@ -1,10 +1,15 @@
+import sys
 import typing as tp
 
 import loguru
 from aiogram.exceptions import TelegramBadRequest
+from starlette.types import Scope
 
 from app.bot_helper import bot
-from app.config import get_settings
+from app.bot_helper.dispatcher import NotificationDispatcher
+from app.config import DefaultSettings, get_settings, on_settings_reload
+from app.metrics import TELEGRAM_SEND_FAILURES
+from app.utils.errors import ErrorAggregator, ErrorReport
 
 
 async def send_message(
@@ -36,31 +41,93 @@ async def send_message(
                 raise e
 
 
-async def send_traceback_message(
-    message: str, code: str, level: str = 'error'
-) -> None:
-    message = (
+def format_traceback_message(message: str, code: str) -> str:
+    return (
         f'{message.replace("<", "&lt;").replace(">", "&gt;")}\n\n'
         f'<code>'
         f'{code.replace("<", "&lt;").replace(">", "&gt;")}'
         f'</code>'
     )
-    return await send_message(message, level)
+
+
+async def send_traceback_message(
+    message: str, code: str, level: str = 'error'
+) -> None:
+    return await send_message(format_traceback_message(message, code), level)
+
+
+dispatcher = NotificationDispatcher(send_message)
+_settings = get_settings()
+error_aggregator = ErrorAggregator(
+    notify=dispatcher.enqueue,
+    window=_settings.ERROR_REPORT_WINDOW,
+    max_size=_settings.ERROR_STATS_SIZE,
+    sample_size=_settings.ERROR_SAMPLE_REQUEST_IDS,
+    quiet_period=_settings.ERROR_QUIET_PERIOD,
+)
+
+
+@on_settings_reload
+def _configure_error_aggregator(settings: DefaultSettings) -> None:
+    error_aggregator.window = settings.ERROR_REPORT_WINDOW
+    error_aggregator.max_size = settings.ERROR_STATS_SIZE
+    error_aggregator.sample_size = settings.ERROR_SAMPLE_REQUEST_IDS
+    error_aggregator.quiet_period = settings.ERROR_QUIET_PERIOD
 
 
 async def send_message_safe(
     logger: 'loguru.Logger', *args: tp.Any, **kwargs: tp.Any
 ) -> None:
+    """
+    Queue message for background sending, never waits for Telegram.
+    """
     try:
-        await send_message(*args, **kwargs)
+        dispatcher.enqueue(*args, **kwargs)
     except Exception as send_exc:  # pylint: disable=broad-except
+        TELEGRAM_SEND_FAILURES.labels('send_message').inc()
         logger.exception('Error while sending error message: {}', send_exc)
 
 
 async def send_traceback_message_safe(
-    logger: 'loguru.Logger', *args: tp.Any, **kwargs: tp.Any
+    logger: 'loguru.Logger',
+    message: str,
+    code: str,
+    level: str = 'error',
+    request_id: str | None = None,
+) -> None:
+    """
+    Queue traceback message for background sending.
+
+    Called while handling an exception, only its first occurrence
+    is sent, repeats are sent as a summary by `error_aggregator`.
+    """
+    exc = sys.exc_info()[1]
+    if exc is not None and not error_aggregator.record(exc, request_id):
+        return
+    try:
+        dispatcher.enqueue(format_traceback_message(message, code), level)
+    except Exception as send_exc:  # pylint: disable=broad-except
+        TELEGRAM_SEND_FAILURES.labels('send_traceback_message').inc()
+        logger.exception('Error while sending error message: {}', send_exc)
+
+
+async def send_error_report_safe(
+    logger: 'loguru.Logger', exc: BaseException, scope: Scope
 ) -> None:
+    """
+    Queue report of a failed request for background sending.
+
+    Only the first occurrence of an error is reported, repeats are
+    only counted before anything is taken from the request. The report
+    text is formatted by the dispatcher task, not by the caller.
+    """
+    if not error_aggregator.record(exc, scope.get('request_id')):
+        return
     try:
-        await send_traceback_message(*args, **kwargs)
+        report = ErrorReport(get_settings().PROJECT_NAME, scope, exc)
+        dispatcher.enqueue(
+            lambda: format_traceback_message(report.message, report.code)
+        )
     except Exception as send_exc:  # pylint: disable=broad-except
+        TELEGRAM_SEND_FAILURES.labels('send_error_report').inc()
         logger.exception('Error while sending error message: {}', send_exc)
@@ -7,7 +7,15 @@ from app.utils.common import get_datetime_msk_tz
 MESSAGE_ID = None
 
 
-async def send_ping_status(result: dict[str, dict[str, str]]) -> None:
+async def send_ping_status(
+    result: dict[str, dict[str, str]],
+    latency: dict[str, dict[str, tuple[float, float]]] | None = None,
+) -> None:
+    """
+    `latency` is p50 and p95 latency (milliseconds)
+    by host and endpoint.
+    """
+    latency = latency or {}
     all_ok = True
     message = (
         f'Ping status (last update: '
@@ -18,7 +26,11 @@ async def send_ping_status(result: dict[str, dict[str, str]]) -> None:
         for endpoint, status in endpoints.items():
             all_ok = all_ok and status == 'Successful'
             emoji = '✅' if status == 'Successful' else '❌'
-            message += f'{emoji}{endpoint}: {status}\n'
+            message += f'{emoji}{endpoint}: {status}'
+            if endpoint in latency.get(host, {}):
+                p50, p95 = latency[host][endpoint]
+                message += f' (p50 {p50:.0f} ms, p95 {p95:.0f} ms)'
+            message += '\n'
     global MESSAGE_ID  # pylint: disable=global-statement
     if MESSAGE_ID is None or not all_ok:
         MESSAGE_ID = await bot.bot.send_message(
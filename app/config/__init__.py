@@ -1,8 +1,18 @@
 from .default import DefaultSettings
-from .utils import get_settings
+from .utils import (
+    get_settings,
+    on_settings_reload,
+    override_settings,
+    reload_settings,
+    setup_reload_signal,
+)
 
 
 __all__ = [
     'DefaultSettings',
     'get_settings',
+    'on_settings_reload',
+    'reload_settings',
+    'override_settings',
+    'setup_reload_signal',
 ]
@@ -1,3 +1,4 @@
+import typing as tp
 from pathlib import Path
 
 from fastapi.security import OAuth2PasswordBearer
@@ -5,6 +6,8 @@ from passlib.context import CryptContext
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.schemas.database import EnginePool, RolePools
+
 
 class DefaultSettings(BaseSettings):
     """
@@ -21,6 +24,8 @@ class DefaultSettings(BaseSettings):
     PATH_PREFIX: str = Field('/api')
     APP_HOST: str = Field('http://127.0.0.1')
     APP_PORT: int = Field(8090)
+    APP_WORKERS: int = Field(0)  # 0 means number of CPU cores
+    APP_GRACEFUL_TIMEOUT: int = Field(30)
     NGINX_EXTERNAL_PORT: int = Field(80)
     DEBUG: bool = Field(True)
 
@@ -29,6 +34,79 @@ class DefaultSettings(BaseSettings):
     POSTGRES_USER: str = Field('pguser')
     POSTGRES_PORT: int = Field(5432)
     POSTGRES_PASSWORD: str = Field('pgpswd')
+    POSTGRES_MAX_CONNECTIONS: int = Field(150)
+    POSTGRES_RESERVED_CONNECTIONS: int = Field(3)
+
+    # Role of current process: app, scheduler, worker or tools
+    DB_ROLE: str = Field('app')
+    DB_POOLS: dict[str, RolePools] = Field(
+        {
+            'app': RolePools(
+                processes=0,
+                sync_engine=EnginePool(pool_size=1),
+                async_engine=EnginePool(pool_size=8, max_overflow=4),
+            ),
+            'scheduler': RolePools(
+                sync_engine=EnginePool(pool_size=1),
+                async_engine=EnginePool(pool_size=4, max_overflow=2),
+            ),
+            'worker': RolePools(
+                processes=0,
+                sync_engine=EnginePool(pool_size=1),
+                async_engine=EnginePool(pool_size=2),
+            ),
+            'tools': RolePools(
+                sync_engine=EnginePool(pool_size=1),
+                async_engine=EnginePool(pool_size=1, max_overflow=2),
+            ),
+        }
+    )
+
+    # Seconds to wait for free connection before responding with 503
+    DB_POOL_TIMEOUT: float = Field(3)
+    # Callers allowed to wait for connection when pool is exhausted
+    DB_POOL_MAX_WAITING: int = Field(20)
+    DB_RETRY_AFTER: int = Field(1)
+
+    # Log every statement with parameters (slow, for debugging only)
+    SQL_ECHO: bool = Field(False)
+    # Share of statements written to debug log
+    SQL_SAMPLE_RATE: float = Field(0.01)
+    SQL_SLOW_QUERY_MS: float = Field(200)
+    # Max number of statement fingerprints with aggregated stats
+    SQL_STATS_SIZE: int = Field(1000)
+
+    # Port of scheduler metrics exporter, 0 disables it
+    SCHEDULER_METRICS_PORT: int = Field(0)
+    # Only the replica holding advisory lock SCHEDULER_LOCK_KEY runs
+    # jobs, it checks its connection and others try to take the lock
+    # every SCHEDULER_LEASE_INTERVAL seconds
+    SCHEDULER_LEADER_ELECTION: bool = Field(True)
+    SCHEDULER_LOCK_KEY: int = Field(0x5C4ED)
+    SCHEDULER_LEASE_INTERVAL: float = Field(5)
+    # Size of pools running jobs with `executor: thread|process`
+    SCHEDULER_THREAD_POOL_SIZE: int = Field(4)
+    SCHEDULER_PROCESS_POOL_SIZE: int = Field(2)
+    # Logs of one job run kept in memory until sent (characters)
+    SCHEDULER_JOB_LOG_SIZE: int = Field(10 * 1024 * 1024)
+    # Health check job: timeout of one probe (seconds)
+    # and number of last latencies kept per probe
+    PING_TIMEOUT: float = Field(5)
+    PING_HISTORY_SIZE: int = Field(100)
+    # Database dump job streams pg_dump output to DB_DUMP_DIR
+    DB_DUMP_DIR: Path = Field(Path('dumps'))
+    # plain is one SQL file, custom and directory are restored
+    # with pg_restore, directory is dumped in parallel
+    DB_DUMP_FORMAT: tp.Literal['plain', 'custom', 'directory'] = Field('plain')
+    # pg_dump/pg_restore jobs for directory format (each one holds
+    # a database connection), 0 means number of CPU cores
+    DB_DUMP_JOBS: int = Field(0)
+    DB_DUMP_COMPRESSION: tp.Literal['gzip', 'none'] = Field('gzip')
+    DB_DUMP_COMPRESSION_LEVEL: int = Field(6)
+    DB_DUMP_CHUNK_SIZE: int = Field(1024 * 1024)
+    # Newest dump of each of the last days/weeks is kept in DB_DUMP_DIR
+    DB_DUMP_KEEP_DAILY: int = Field(7)
+    DB_DUMP_KEEP_WEEKLY: int = Field(4)
 
     LOGGING_FORMAT: str = (
         '%(filename)s %(funcName)s [%(thread)d] '
@@ -41,6 +119,14 @@ class DefaultSettings(BaseSettings):
     LOGGING_SCHEDULER_FILE: Path = LOGGING_FILE_DIR / 'scheduler_logfile.log'
     LOGGING_WORKER_FILE: Path = LOGGING_FILE_DIR / 'worker_logfile.log'
 
+    # Profile requests sent with `X-Profile: <PROFILING_TOKEN>` header
+    PROFILING_ENABLED: bool = Field(False)
+    PROFILING_TOKEN: str = Field('')
+    PROFILING_INTERVAL: float = Field(0.001)
+    PROFILING_DIR: Path = LOGGING_FILE_DIR / 'profiles'
+    # Notifications that didn't fit into queue, sent later
+    TG_SPILL_FILE: Path = LOGGING_FILE_DIR / 'telegram_spill.jsonl'
+
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent
     CONFIG_FILENAME: str = 'config.yaml'
 
@@ -50,6 +136,15 @@ class DefaultSettings(BaseSettings):
     SECRET_KEY: str = Field('')
     ALGORITHM: str = Field('HS256')
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(1440)
+    # Per worker process, changes made by other workers are seen
+    # after at most PRINCIPAL_CACHE_TTL seconds
+    PRINCIPAL_CACHE_SIZE: int = Field(1024)
+    PRINCIPAL_CACHE_TTL: int = Field(60)
+
+    PASSWORD_HASH_ROUNDS: int = Field(12)
+    PASSWORD_HASHER_EXECUTOR: str = Field('thread')  # thread or process
+    PASSWORD_HASHER_WORKERS: int = Field(2)
+    PASSWORD_HASHER_QUEUE_SIZE: int = Field(32)
 
     PWD_CONTEXT: CryptContext = CryptContext(
         schemes=['bcrypt'], deprecated='auto'
@@ -61,9 +156,27 @@ class DefaultSettings(BaseSettings):
     )
 
     TG_HELPER_BOT_TOKEN: str = Field('')
+    # Bot API server, e.g. local telegram-bot-api, empty means Telegram
+    TG_API_URL: str = Field('')
     TG_ERROR_CHAT_ID: str = Field('')
     TG_DB_DUMP_CHAT_ID: str = Field('')
     TG_LOG_SEND_CHAT_ID: str = Field('')
+    # Background sending of notifications
+    TG_QUEUE_SIZE: int = Field(1000)
+    TG_BATCH_DELAY: float = Field(1)
+    TG_MAX_RETRIES: int = Field(5)
+    # Larger files are compressed, split into parts and sent
+    # with a manifest, at most TG_UPLOAD_CONCURRENCY parts at a time
+    TG_UPLOAD_LIMIT: int = Field(50 * 1024 * 1024)
+    TG_UPLOAD_PART_SIZE: int = Field(45 * 1024 * 1024)
+    TG_UPLOAD_CONCURRENCY: int = Field(3)
+    # Repeats of an error are sent as one summary per window (seconds)
+    ERROR_REPORT_WINDOW: int = Field(60)
+    ERROR_STATS_SIZE: int = Field(500)
+    ERROR_SAMPLE_REQUEST_IDS: int = Field(5)
+    # Error not seen for this long (seconds) is reported in full again,
+    # longer than ERROR_REPORT_WINDOW so its repeats are sent first
+    ERROR_QUIET_PERIOD: int = Field(3600)
 
     CELERY_BROKER_URL: str = Field('redis://localhost:6379')
     CELERY_RESULT_BACKEND: str = Field('redis://localhost:6379')
@@ -1,10 +1,23 @@
+import asyncio
+import signal
+import typing as tp
+from contextlib import contextmanager
 from os import environ
 
+import loguru
+
 from .default import DefaultSettings
 from .production import ProductionSettings
 
 
-def get_settings() -> DefaultSettings:  # pragma: no cover
+_settings: DefaultSettings | None = None
+_reload_callbacks: list[tp.Callable[[DefaultSettings], None]] = []
+
+
+def create_settings() -> DefaultSettings:  # pragma: no cover
+    """
+    Build a new settings object for the current environment.
+    """
     env = environ.get('ENV', 'local')
     if env == 'local':
         return DefaultSettings()
@@ -14,3 +27,86 @@ def get_settings() -> DefaultSettings:  # pragma: no cover
     # space for other settings
     # ...
     return DefaultSettings()  # fallback to default
+
+
+def get_settings() -> DefaultSettings:
+    """
+    Get process-wide settings object.
+
+    Settings are built once on first call and then reused,
+    use `reload_settings` to re-read environment and `.env` file.
+    """
+    global _settings  # pylint: disable=global-statement
+    if _settings is None:
+        _settings = create_settings()
+    return _settings
+
+
+def on_settings_reload(
+    callback: tp.Callable[[DefaultSettings], None]
+) -> tp.Callable[[DefaultSettings], None]:
+    """
+    Call `callback` with new settings after every `reload_settings`.
+
+    For objects configured from settings once (clients, pools,
+    caches), so reloaded values take effect without restart.
+    """
+    _reload_callbacks.append(callback)
+    return callback
+
+
+def reload_settings() -> DefaultSettings:
+    """
+    Re-read environment, replace process-wide settings object
+    and apply it to objects subscribed with `on_settings_reload`.
+    """
+    global _settings  # pylint: disable=global-statement
+    _settings = create_settings()
+    for callback in _reload_callbacks:
+        try:
+            callback(_settings)
+        except Exception:  # pylint: disable=broad-except
+            loguru.logger.exception(
+                'Error while applying reloaded settings with {}',
+                getattr(callback, '__qualname__', callback),
+            )
+    loguru.logger.info('Settings reloaded (env={})', _settings.ENV)
+    return _settings
+
+
+@contextmanager
+def override_settings(
+    settings: DefaultSettings,
+) -> tp.Generator[DefaultSettings, None, None]:
+    """
+    Temporarily replace process-wide settings object (for tests).
+    """
+    global _settings  # pylint: disable=global-statement
+    previous_settings = _settings
+    _settings = settings
+    try:
+        yield settings
+    finally:
+        _settings = previous_settings
+
+
+def setup_reload_signal(
+    signum: int | None = getattr(signal, 'SIGHUP', None),
+) -> None:  # pragma: no cover
+    """
+    Reload settings when process receives `signum` (SIGHUP by default).
+    """
+    if signum is None:
+        return
+    signal.signal(signum, _reload_on_signal)
+
+
+def _reload_on_signal(*_: tp.Any) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        reload_settings()
+        return
+    # Handler interrupts arbitrary code, including the one using
+    # objects refreshed on reload, so reload runs as loop callback
+    loop.call_soon_threadsafe(reload_settings)
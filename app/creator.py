@@ -1,22 +1,27 @@
 import logging
 import sys
-import typing as tp
 import uuid
+import weakref
 
 import loguru
 import slowapi
 import slowapi.errors as slowapi_errors
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi_pagination import add_pagination
-from starlette import requests
+from starlette.datastructures import MutableHeaders
 from starlette.middleware import Middleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from uvicorn.protocols import utils
 
-from app.config import DefaultSettings, get_settings
-from app.endpoints import list_of_routes
+from app.bot_helper.send import dispatcher
+from app.config import DefaultSettings, get_settings, on_settings_reload
+from app.database.connection import DatabaseOverloadedError
+from app.endpoints import list_of_routes, metrics_router
 from app.limiter import limiter
+from app.metrics import MetricsMiddleware
+from app.profiler import ProfilingMiddleware
+from app.utils.common import request_id_context
 
 
 def bind_routes(application: FastAPI, setting: DefaultSettings) -> None:
@@ -25,53 +30,55 @@ def bind_routes(application: FastAPI, setting: DefaultSettings) -> None:
     """
     for route in list_of_routes:
         application.include_router(route, prefix=setting.PATH_PREFIX)
+    # Scraped by Prometheus at a fixed path, outside of API prefix
+    application.include_router(metrics_router)
 
 
-class UniqueIDMiddleware(BaseHTTPMiddleware):
-    def __init__(
-        self,
-        app: FastAPI,
-    ):
-        super().__init__(app)
-
-    async def dispatch(
-        self, request: requests.Request, call_next: tp.Any
-    ) -> Response:
-        # do something with the request object, for example
-        request.scope['request_id'] = uuid.uuid4().hex
-        # process the request and get the response
-        response = Response(status_code=500)
-        request_info_dict = {
-            'request': {
-                'id': request['request_id'],
-                'method': request.method,
-                'scheme': request['scheme'],
-                'http_version': request['http_version'],
-                'path': utils.get_path_with_query_string(request.scope),  # type: ignore  # pylint: disable=line-too-long
-                'client': utils.get_client_addr(request.scope),  # type: ignore
-            },
-            'uuid': request['request_id'],
-        }
-        try:
-            with loguru.logger.contextualize(**request_info_dict):
-                response = await call_next(request)
-        except Exception as exc:
-            with loguru.logger.contextualize(**request_info_dict):
+class UniqueIDMiddleware:
+    """
+    Sets `request_id` to scope, returns it in `log-id` header
+    and writes access log record.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = uuid.uuid4().hex
+        scope['request_id'] = request_id
+        request_id_token = request_id_context.set(request_id)
+        status_code = 500
+
+        async def send_with_log_id(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                MutableHeaders(scope=message).append('log-id', request_id)
+            await send(message)
+
+        with loguru.logger.contextualize(uuid=request_id):
+            try:
+                await self.app(scope, receive, send_with_log_id)
+            except Exception:
                 loguru.logger.exception('Exception occurred')
-            raise exc
-        finally:
-            request_info_dict['response'] = {
-                'status_code': response.status_code,
-            }
-            response.headers['log-id'] = request['request_id']
-            with loguru.logger.contextualize(**request_info_dict):
+                raise
+            finally:
                 loguru.logger.info(
-                    '{request[client]} - "{request[method]} {request[path]} '
-                    'HTTP/{request[http_version]}" {response[status_code]}',
-                    request=request_info_dict['request'],
-                    response=request_info_dict['response'],
+                    '{client} - "{method} {path} HTTP/{http_version}" '
+                    '{status_code}',
+                    client=utils.get_client_addr(scope),  # type: ignore
+                    method=scope['method'],
+                    path=utils.get_path_with_query_string(scope),  # type: ignore  # pylint: disable=line-too-long
+                    http_version=scope['http_version'],
+                    status_code=status_code,
                 )
-        return response
+                request_id_context.reset(request_id_token)
 
 
 class InterceptHandler(logging.Handler):  # pragma: no cover
@@ -106,7 +113,29 @@ def configure_logger(settings: DefaultSettings) -> None:  # pragma: no cover
         serialize=True,
         enqueue=True,
     )
-    logging.getLogger('sqlalchemy.engine').setLevel('INFO')
+
+
+async def database_overloaded_handler(
+    request: Request, exc: Exception
+) -> JSONResponse:
+    loguru.logger.warning('Database is overloaded: {}', exc)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': 'Database is overloaded, try again later'},
+        headers={
+            'Retry-After': str(request.app.state.settings.DB_RETRY_AFTER)
+        },
+    )
+
+
+# Applications keep settings in state, it is replaced on reload
+_applications: 'weakref.WeakSet[FastAPI]' = weakref.WeakSet()
+
+
+@on_settings_reload
+def _update_app_settings(settings: DefaultSettings) -> None:
+    for application in _applications:
+        application.state.settings = settings
 
 
 def get_app(set_up_logger: bool = True) -> FastAPI:
@@ -125,6 +154,8 @@ def get_app(set_up_logger: bool = True) -> FastAPI:
     settings = get_settings()
     middleware = [
         Middleware(UniqueIDMiddleware),
+        Middleware(MetricsMiddleware),
+        Middleware(ProfilingMiddleware),
     ]
     application = FastAPI(
         title=settings.PROJECT_NAME,
@@ -134,11 +165,13 @@ def get_app(set_up_logger: bool = True) -> FastAPI:
         version='0.1.0',
         openapi_tags=tags_metadata,
         middleware=middleware,
+        default_response_class=ORJSONResponse,
     )
 
     bind_routes(application, settings)
     add_pagination(application)
     application.state.settings = settings
+    _applications.add(application)
 
     if set_up_logger:
         configure_logger(settings)
@@ -148,5 +181,10 @@ def get_app(set_up_logger: bool = True) -> FastAPI:
         slowapi_errors.RateLimitExceeded,
         slowapi._rate_limit_exceeded_handler,  # pylint: disable=protected-access
     )
+    application.add_exception_handler(
+        DatabaseOverloadedError, database_overloaded_handler
+    )
+    # Send notifications queued by this worker before it exits
+    application.add_event_handler('shutdown', dispatcher.close)
 
     return application
@@ -1,6 +1,18 @@
+from .advisory_lock import AdvisoryLock, LeaderElection
+from .budget import check_connection_budget, get_connection_budget
+from .instrumentation import SQLInstrumentation, sql_instrumentation
+from .pool import DatabaseOverloadedError, get_pool_stats
 from .session import SessionManager
 
 
 __all__ = [
+    'AdvisoryLock',
+    'DatabaseOverloadedError',
+    'LeaderElection',
+    'SQLInstrumentation',
     'SessionManager',
+    'check_connection_budget',
+    'get_connection_budget',
+    'get_pool_stats',
+    'sql_instrumentation',
 ]
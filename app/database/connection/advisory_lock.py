@@ -0,0 +1,168 @@
+import asyncio
+import contextlib
+import typing as tp
+
+import loguru
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+HELD_LOCK_QUERY = sa.text(
+    'SELECT EXISTS (SELECT 1 FROM pg_locks '
+    "WHERE locktype = 'advisory' AND pid = pg_backend_pid() AND granted "
+    'AND classid::bigint = :classid AND objid::bigint = :objid '
+    'AND objsubid = 1)'
+)
+
+
+class AdvisoryLock:
+    """
+    Session level Postgres advisory lock held on a dedicated connection.
+
+    The lock lives as long as the connection, so if the process dies
+    or loses the database, Postgres releases it for others.
+    """
+
+    def __init__(self, engine: AsyncEngine, key: int) -> None:
+        self.engine = engine
+        self.key = key
+        self._connection: AsyncConnection | None = None
+
+    @property
+    def locked(self) -> bool:
+        return self._connection is not None
+
+    async def acquire(self) -> bool:
+        """
+        Try to take the lock without waiting.
+        """
+        if self._connection is not None:
+            return True
+        connection = await self.engine.connect()
+        try:
+            # No transaction is left open while the lock is held
+            await connection.execution_options(isolation_level='AUTOCOMMIT')
+            acquired = await connection.scalar(
+                sa.select(sa.func.pg_try_advisory_lock(self.key))
+            )
+        except BaseException:
+            await connection.invalidate()
+            raise
+        if not acquired:
+            await connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    async def check(self, timeout: float) -> bool:
+        """
+        Whether the lock is still held by the backend of its connection.
+        Lost connection (or one without the lock) is dropped.
+        """
+        if self._connection is None:
+            return False
+        try:
+            async with asyncio.timeout(timeout):
+                held = await self._connection.scalar(
+                    HELD_LOCK_QUERY,
+                    {
+                        # Bigint key is split into two oids
+                        'classid': self.key >> 32 & 0xFFFFFFFF,
+                        'objid': self.key & 0xFFFFFFFF,
+                    },
+                )
+        except Exception as exc:  # pylint: disable=broad-except
+            loguru.logger.warning('Advisory lock connection lost: {}', exc)
+            await self._drop()
+            return False
+        if not held:
+            loguru.logger.warning('Advisory lock is not held')
+            await self._drop()
+            return False
+        return True
+
+    async def release(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            await self._connection.scalar(
+                sa.select(sa.func.pg_advisory_unlock(self.key))
+            )
+        except Exception:  # pylint: disable=broad-except
+            await self._drop()
+            return
+        await self._connection.close()
+        self._connection = None
+
+    async def _drop(self) -> None:
+        # Connection goes away instead of back to the pool,
+        # where it would keep holding the lock
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            await connection.invalidate()
+        except Exception as exc:  # pylint: disable=broad-except
+            loguru.logger.warning('Error while dropping connection: {}', exc)
+
+
+class LeaderElection:
+    """
+    Keeps trying to take `lock` every `interval` seconds, the holder
+    is the leader. The leader checks its lock with the same interval
+    and steps down when the connection or the lock is lost.
+    """
+
+    def __init__(
+        self,
+        lock: AdvisoryLock,
+        interval: float,
+        on_elected: tp.Callable[[], None],
+        on_deposed: tp.Callable[[], None],
+    ) -> None:
+        self.lock = lock
+        self.interval = interval
+        self.on_elected = on_elected
+        self.on_deposed = on_deposed
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.locked
+
+    async def start(self) -> None:
+        """
+        Make the first attempt and keep electing in background.
+        """
+        await self.step()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if self.is_leader:
+            await self.lock.release()
+            self.on_deposed()
+
+    async def step(self) -> None:
+        if self.is_leader:
+            if not await self.lock.check(self.interval):
+                loguru.logger.warning('Leadership lost')
+                self.on_deposed()
+            return
+        try:
+            acquired = await self.lock.acquire()
+        except Exception as exc:  # pylint: disable=broad-except
+            loguru.logger.warning('Leader election failed: {}', exc)
+            return
+        if acquired:
+            loguru.logger.info('Elected as leader')
+            self.on_elected()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.step()
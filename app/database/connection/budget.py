@@ -0,0 +1,47 @@
+import multiprocessing
+
+import loguru
+
+from app.config import DefaultSettings
+
+
+def get_role_processes(settings: DefaultSettings, role: str) -> int:
+    if role == 'app' and settings.APP_WORKERS:
+        return settings.APP_WORKERS
+    return settings.DB_POOLS[role].processes or multiprocessing.cpu_count()
+
+
+def get_connection_budget(settings: DefaultSettings) -> dict[str, int]:
+    """
+    Maximum number of connections each process role can open:
+    processes * (sync pool + async pool, overflow included).
+    """
+    return {
+        role: get_role_processes(settings, role)
+        * (
+            pools.sync_engine.max_connections
+            + pools.async_engine.max_connections
+        )
+        for role, pools in settings.DB_POOLS.items()
+    }
+
+
+def check_connection_budget(settings: DefaultSettings) -> bool:
+    """
+    Warn if all roles together can open more connections than server allows.
+    """
+    budget = get_connection_budget(settings)
+    total = sum(budget.values())
+    limit = (
+        settings.POSTGRES_MAX_CONNECTIONS
+        - settings.POSTGRES_RESERVED_CONNECTIONS
+    )
+    if total > limit:
+        loguru.logger.warning(
+            'Database connection budget {} exceeds server limit {} ({})',
+            total,
+            limit,
+            budget,
+        )
+        return False
+    return True
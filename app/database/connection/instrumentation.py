@@ -0,0 +1,173 @@
+import functools
+import hashlib
+import random
+import re
+import time
+import typing as tp
+
+import loguru
+import sqlalchemy as sa
+
+from app.config import DefaultSettings, get_settings, on_settings_reload
+from app.utils.common import request_id_context
+
+
+_WHITESPACE = re.compile(r'\s+')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_PARAMETER = re.compile(r'\$\d+|%\(\w+\)s')
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """
+    Statement with literals and parameters replaced by `?`,
+    so queries that differ in values only look the same.
+    """
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _LITERAL.sub('?', _PARAMETER.sub('?', statement))
+    return _PARAMETER_LIST.sub('(?)', statement)
+
+
+@functools.lru_cache(maxsize=4096)
+def get_fingerprint(statement: str) -> str:
+    return hashlib.md5(  # nosec
+        normalize_statement(statement).encode(), usedforsecurity=False
+    ).hexdigest()[:16]
+
+
+class QueryStats:
+    __slots__ = ('statement', 'count', 'total_time', 'max_time', 'rows')
+
+    def __init__(self, statement: str) -> None:
+        self.statement = statement
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+
+    def add(self, duration: float, rowcount: int) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.rows += max(rowcount, 0)
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        return {
+            'statement': self.statement,
+            'count': self.count,
+            'total_ms': self.total_time * 1000,
+            'mean_ms': self.total_time * 1000 / self.count,
+            'max_ms': self.max_time * 1000,
+            'rows': self.rows,
+        }
+
+
+class SQLInstrumentation:
+    """
+    Measures statements executed by attached engines.
+
+    Statements are aggregated by fingerprint in memory (up to
+    `max_fingerprints` of them, new ones are only logged), statements
+    slower than `slow_query_ms` are logged with a warning and
+    `sample_rate` share of the rest is logged with debug level.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        slow_query_ms: float,
+        max_fingerprints: int,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.slow_query_time = slow_query_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self._stats: dict[str, QueryStats] = {}
+
+    def attach(self, engine: sa.Engine) -> None:
+        if sa.event.contains(
+            engine, 'before_cursor_execute', self._before_execute
+        ):
+            return
+        sa.event.listen(engine, 'before_cursor_execute', self._before_execute)
+        sa.event.listen(engine, 'after_cursor_execute', self._after_execute)
+        sa.event.listen(engine, 'handle_error', self._handle_error)
+
+    def stats(self, limit: int | None = None) -> dict[str, dict[str, tp.Any]]:
+        """
+        Aggregated stats by fingerprint, most time-consuming first.
+        """
+        items = sorted(
+            self._stats.items(),
+            key=lambda item: item[1].total_time,
+            reverse=True,
+        )
+        return {
+            fingerprint: query_stats.to_dict()
+            for fingerprint, query_stats in items[:limit]
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def record(self, statement: str, duration: float, rowcount: int) -> None:
+        fingerprint = get_fingerprint(statement)
+        query_stats = self._stats.get(fingerprint)
+        if query_stats is None and len(self._stats) < self.max_fingerprints:
+            query_stats = self._stats[fingerprint] = QueryStats(
+                normalize_statement(statement)
+            )
+        if query_stats is not None:
+            query_stats.add(duration, rowcount)
+
+        if duration >= self.slow_query_time:
+            log = loguru.logger.warning
+        elif random.random() < self.sample_rate:  # nosec
+            log = loguru.logger.debug
+        else:
+            return
+        log(
+            'SQL {fingerprint} took {duration_ms:.1f} ms, rows={rowcount}',
+            fingerprint=fingerprint,
+            duration_ms=duration * 1000,
+            rowcount=rowcount,
+            statement=normalize_statement(statement),
+            request_id=request_id_context.get(),
+        )
+
+    def _before_execute(self, conn: sa.Connection, *_: tp.Any) -> None:
+        conn.info.setdefault('query_start_time', []).append(
+            time.perf_counter()
+        )
+
+    def _after_execute(
+        self,
+        conn: sa.Connection,
+        cursor: tp.Any,
+        statement: str,
+        *_: tp.Any,
+    ) -> None:
+        duration = time.perf_counter() - conn.info['query_start_time'].pop()
+        self.record(statement, duration, cursor.rowcount)
+
+    def _handle_error(self, context: sa.ExceptionContext) -> None:
+        if context.connection is None:
+            return
+        start_times = context.connection.info.get('query_start_time')
+        if start_times:
+            start_times.pop()
+
+
+_settings = get_settings()
+sql_instrumentation = SQLInstrumentation(
+    sample_rate=_settings.SQL_SAMPLE_RATE,
+    slow_query_ms=_settings.SQL_SLOW_QUERY_MS,
+    max_fingerprints=_settings.SQL_STATS_SIZE,
+)
+
+
+@on_settings_reload
+def _configure_sql_instrumentation(settings: DefaultSettings) -> None:
+    sql_instrumentation.sample_rate = settings.SQL_SAMPLE_RATE
+    sql_instrumentation.slow_query_time = settings.SQL_SLOW_QUERY_MS / 1000
+    sql_instrumentation.max_fingerprints = settings.SQL_STATS_SIZE
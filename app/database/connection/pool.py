@@ -0,0 +1,149 @@
+import bisect
+import time
+import typing as tp
+
+import sqlalchemy as sa
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+from app.config import get_settings
+from app.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_REJECTED,
+    DB_POOL_WAIT,
+    DB_POOL_WAITING,
+)
+
+
+class DatabaseOverloadedError(sa.exc.TimeoutError):
+    """
+    Connection wasn't checked out within `DB_POOL_TIMEOUT`
+    or too many callers already wait for one.
+    """
+
+
+class PoolMetrics:
+    """
+    Checkout counters and cumulative histogram of checkout wait time.
+    """
+
+    WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self, engine: str) -> None:
+        self.engine = engine
+        self.waiting = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self._wait_buckets = [0] * (len(self.WAIT_BUCKETS) + 1)
+
+    def observe_wait(self, duration: float) -> None:
+        self.wait_count += 1
+        self.wait_sum += duration
+        self._wait_buckets[
+            bisect.bisect_left(self.WAIT_BUCKETS, duration)
+        ] += 1
+        DB_POOL_WAIT.labels(self.engine).observe(duration)
+
+    def wait_histogram(self) -> dict[str, int]:
+        """
+        Number of checkouts that waited less or equal to each bucket.
+        """
+        histogram, total = {}, 0
+        for bound, count in zip(
+            (*self.WAIT_BUCKETS, float('inf')), self._wait_buckets
+        ):
+            total += count
+            histogram[str(bound)] = total
+        return histogram
+
+
+class AdmissionControlMixin:
+    """
+    Fails fast with `DatabaseOverloadedError` instead of queueing
+    when all connections are busy and `DB_POOL_MAX_WAITING` callers
+    already wait, or when waiting takes longer than pool timeout.
+    """
+
+    metrics: PoolMetrics
+    max_waiting: int
+
+    def _init_admission_control(self, engine: str) -> None:
+        self.metrics = PoolMetrics(engine)
+        self.max_waiting = get_settings().DB_POOL_MAX_WAITING
+        self._checked_out_gauge = DB_POOL_CHECKED_OUT.labels(engine)
+        self._overflow_gauge = DB_POOL_OVERFLOW.labels(engine)
+        self._waiting_gauge = DB_POOL_WAITING.labels(engine)
+
+    def _update_gauges(self) -> None:
+        queue_pool = tp.cast(QueuePool, self)
+        self._checked_out_gauge.set(queue_pool.checkedout())
+        self._overflow_gauge.set(max(queue_pool.overflow(), 0))
+
+    def _is_exhausted(self) -> bool:
+        queue_pool = tp.cast(QueuePool, self)
+        # pylint: disable=protected-access
+        return bool(
+            queue_pool._pool.empty()
+            and queue_pool._overflow >= queue_pool._max_overflow
+        )
+
+    def connect(self) -> PoolProxiedConnection:
+        metrics = self.metrics
+        if metrics.waiting >= self.max_waiting and self._is_exhausted():
+            metrics.rejected += 1
+            DB_POOL_REJECTED.labels(metrics.engine, 'queue_full').inc()
+            raise DatabaseOverloadedError(
+                f'Too many callers wait for connection: {metrics.waiting}'
+            )
+        metrics.waiting += 1
+        self._waiting_gauge.inc()
+        start = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore
+        except sa.exc.TimeoutError as exc:
+            metrics.timeouts += 1
+            DB_POOL_REJECTED.labels(metrics.engine, 'timeout').inc()
+            raise DatabaseOverloadedError(str(exc)) from exc
+        finally:
+            metrics.waiting -= 1
+            self._waiting_gauge.dec()
+            metrics.observe_wait(time.perf_counter() - start)
+            self._update_gauges()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)  # type: ignore
+        self._update_gauges()
+
+
+class AdmissionQueuePool(AdmissionControlMixin, QueuePool):
+    def __init__(self, *args: tp.Any, **kwargs: tp.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._init_admission_control('sync')
+
+
+class AsyncAdmissionQueuePool(AdmissionControlMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args: tp.Any, **kwargs: tp.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._init_admission_control('async')
+
+
+def get_pool_stats(engine_pool: sa.Pool) -> dict[str, tp.Any]:
+    pool = tp.cast(AdmissionQueuePool, engine_pool)
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'overflow': max(pool.overflow(), 0),
+        'waiting': pool.metrics.waiting,
+        'rejected': pool.metrics.rejected,
+        'timeouts': pool.metrics.timeouts,
+        'wait_count': pool.metrics.wait_count,
+        'wait_sum': pool.metrics.wait_sum,
+        'wait_histogram': pool.metrics.wait_histogram(),
+    }
@@ -1,62 +1,199 @@
+import asyncio
 import functools
 import typing as tp
+import weakref
 from contextlib import asynccontextmanager, contextmanager
 
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.config import get_settings
+from app.config import DefaultSettings, get_settings, on_settings_reload
+from app.schemas.database import RolePools
+from app.utils.common import scheduler_loop_context
+
+from .instrumentation import sql_instrumentation
+from .pool import AdmissionQueuePool, AsyncAdmissionQueuePool
+
+
+def _has_pending_work(session: Session | AsyncSession) -> bool:
+    """
+    Whether session has begun transaction or has objects to flush,
+    a session that was never used doesn't need COMMIT.
+    """
+    return bool(
+        session.in_transaction()
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+def _get_job_loop() -> asyncio.AbstractEventLoop | None:
+    """
+    Loop of a scheduler job run in a pool thread, None elsewhere.
+    """
+    scheduler_loop = scheduler_loop_context.get()
+    if scheduler_loop is None:
+        return None
+    loop = asyncio.get_running_loop()
+    return None if loop is scheduler_loop else loop
 
 
 class SessionManager:  # pragma: no cover
+    # pylint: disable=too-many-public-methods
     """
     A class that implements the necessary
     functionality for working with the database:
     issuing sessions, storing and updating connection settings.
     """
 
-    ENGINE_KWARGS = {
-        'max_overflow': 16,
-        'pool_size': 32,
-        'pool_timeout': 60,
+    ASYNC_SESSION_KWARGS = {
+        'expire_on_commit': False,
     }
 
+    role: str
+    _engine: sa.Engine | None
+    _async_engine: AsyncEngine | None
+    _session_maker: 'sessionmaker[Session] | None'
+    _async_session_maker: async_sessionmaker[AsyncSession] | None
+    _job_engines: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, AsyncEngine
+    ]
+
     def __new__(cls) -> 'SessionManager':
         if not hasattr(cls, 'instance'):
             cls.instance = super(SessionManager, cls).__new__(cls)
-            cls.instance.engine = None  # type: ignore
-            cls.instance.async_engine = None  # type: ignore
-            cls.instance.refresh()  # type: ignore
+            cls.instance.role = get_settings().DB_ROLE
+            cls.instance._engine = None
+            cls.instance._async_engine = None
+            cls.instance._job_engines = weakref.WeakKeyDictionary()
+            cls.instance.refresh()
         return cls.instance  # noqa
 
-    def get_session_maker(self) -> sessionmaker:  # type: ignore
-        return sessionmaker(bind=self.engine)  # type: ignore
+    @property
+    def _pools(self) -> RolePools:
+        return get_settings().DB_POOLS[self.role]
 
-    def get_async_session_maker(self) -> async_sessionmaker:  # type: ignore
-        return async_sessionmaker(self.async_engine, expire_on_commit=False)  # type: ignore  # pylint: disable=line-too-long
+    @property
+    def engine(self) -> sa.Engine:
+        """
+        Sync engine, created on first use.
+        """
+        if self._engine is None:
+            self._engine = sa.create_engine(
+                get_settings().database_uri_sync,
+                echo=get_settings().SQL_ECHO,
+                poolclass=AdmissionQueuePool,
+                pool_timeout=get_settings().DB_POOL_TIMEOUT,
+                **self._pools.sync_engine.model_dump(),
+            )
+            sql_instrumentation.attach(self._engine)
+        return self._engine
 
-    def refresh(self) -> None:
-        settings = get_settings()
-        if self.engine:  # type: ignore
-            self.engine.dispose()  # type: ignore
-        if self.async_engine:  # type: ignore
-            self.async_engine.dispose()  # type: ignore
-        self.engine = sa.create_engine(
-            settings.database_uri_sync,
-            **self.ENGINE_KWARGS,
-        )
-        self.async_engine = create_async_engine(
-            settings.database_uri,
-            echo=True,
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """
+        Async engine, created on first use.
+
+        Connections belong to the loop that opened them, scheduler jobs
+        run on their own loop in pool threads get an engine of that loop
+        without pooling, disposed by `dispose_job_engine`.
+        """
+        job_loop = _get_job_loop()
+        if job_loop is not None:
+            engine = self._job_engines.get(job_loop)
+            if engine is None:
+                engine = self._job_engines[
+                    job_loop
+                ] = self._create_async_engine(poolclass=NullPool)
+            return engine
+        if self._async_engine is None:
+            self._async_engine = self._create_async_engine(
+                poolclass=AsyncAdmissionQueuePool,
+                pool_timeout=get_settings().DB_POOL_TIMEOUT,
+                **self._pools.async_engine.model_dump(),
+            )
+        return self._async_engine
+
+    async def dispose_job_engine(self) -> None:
+        """
+        Close engine of the running job loop, if it was used.
+        """
+        engine = self._job_engines.pop(asyncio.get_running_loop(), None)
+        if engine is not None:
+            await engine.dispose()
+
+    @staticmethod
+    def _create_async_engine(**kwargs: tp.Any) -> AsyncEngine:
+        engine = create_async_engine(
+            get_settings().database_uri,
+            echo=get_settings().SQL_ECHO,
             future=True,
             pool_pre_ping=True,
-            **self.ENGINE_KWARGS,
+            **kwargs,
         )
+        sql_instrumentation.attach(engine.sync_engine)
+        return engine
+
+    def get_session_maker(self, **kwargs: tp.Any) -> 'sessionmaker[Session]':
+        """
+        Session factory built once per `refresh`,
+        a new one is built only if `kwargs` override its settings.
+        """
+        if kwargs:
+            return sessionmaker(bind=self.engine, **kwargs)
+        if self._session_maker is None:
+            self._session_maker = sessionmaker(bind=self.engine)
+        return self._session_maker
+
+    def get_async_session_maker(
+        self, **kwargs: tp.Any
+    ) -> async_sessionmaker[AsyncSession]:
+        """
+        Async session factory built once per `refresh`,
+        a new one is built only if `kwargs` override its settings.
+        """
+        if kwargs or _get_job_loop() is not None:
+            return async_sessionmaker(
+                self.async_engine,
+                **{**self.ASYNC_SESSION_KWARGS, **kwargs},
+            )
+        if self._async_session_maker is None:
+            self._async_session_maker = async_sessionmaker(
+                self.async_engine, **self.ASYNC_SESSION_KWARGS  # type: ignore
+            )
+        return self._async_session_maker
+
+    def set_role(self, role: str) -> None:
+        """
+        Use pool sizes of process `role` (app, scheduler, worker or tools).
+        """
+        if role not in get_settings().DB_POOLS:
+            raise ValueError(f'Unknown database role: {role}')
+        self.role = role
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Drop engines and factories, they are created again on first use.
+        """
+        if self._engine:
+            self._engine.dispose()
+        if self._async_engine:
+            # Connections can't be closed without running event loop,
+            # pool is dropped and its connections are closed on GC.
+            self._async_engine.sync_engine.dispose(close=False)
+        self._engine = None
+        self._async_engine = None
+        self._session_maker = None
+        self._async_session_maker = None
 
     @contextmanager
     def create_session(
@@ -65,7 +202,8 @@ class SessionManager:  # pragma: no cover
         with self.get_session_maker()(**kwargs) as new_session:
             try:
                 yield new_session
-                new_session.commit()
+                if _has_pending_work(new_session):
+                    new_session.commit()
             except Exception:
                 new_session.rollback()
                 raise
@@ -79,7 +217,8 @@ class SessionManager:  # pragma: no cover
         async with self.get_async_session_maker()(**kwargs) as new_session:
             try:
                 yield new_session
-                await new_session.commit()
+                if _has_pending_work(new_session):
+                    await new_session.commit()
             except Exception:
                 await new_session.rollback()
                 raise
@@ -87,6 +226,11 @@ class SessionManager:  # pragma: no cover
                 await new_session.close()
 
     async def get_async_session(self) -> tp.AsyncGenerator[AsyncSession, None]:
+        """
+        Request-scoped session dependency. FastAPI caches it per request,
+        so all dependencies of one request share the session. Connection
+        is checked out on first query only.
+        """
         async with self.create_async_session() as session:
             yield session
 
@@ -97,3 +241,10 @@ class SessionManager:  # pragma: no cover
                 return await func(*args, session=session, **kwargs)
 
         return wrapper
+
+
+@on_settings_reload
+def _refresh_session_manager(_: DefaultSettings) -> None:
+    # Database URL and pool sizes are read when engines are created
+    if hasattr(SessionManager, 'instance'):
+        SessionManager.instance.refresh()
@@ -0,0 +1,35 @@
+from .pg import (
+    dump_database,
+    get_dump_suffix,
+    get_jobs,
+    restore_dump,
+    run_command,
+    verify_dump,
+)
+from .retention import apply_retention, get_expired
+from .stream import (
+    COMPRESSION_SUFFIXES,
+    DumpError,
+    DumpResult,
+    get_compressor,
+    get_pg_env,
+    stream_to_file,
+)
+
+
+__all__ = [
+    'COMPRESSION_SUFFIXES',
+    'DumpError',
+    'DumpResult',
+    'apply_retention',
+    'dump_database',
+    'get_compressor',
+    'get_dump_suffix',
+    'get_expired',
+    'get_jobs',
+    'get_pg_env',
+    'restore_dump',
+    'run_command',
+    'stream_to_file',
+    'verify_dump',
+]
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import typing as tp
+from pathlib import Path
+
+from app.config import DefaultSettings
+
+from .stream import (
+    COMPRESSION_SUFFIXES,
+    DumpError,
+    DumpResult,
+    NoCompression,
+    create_process,
+    get_compressor,
+    get_pg_env,
+    stream_to_file,
+)
+
+
+def get_jobs(jobs: int) -> int:
+    return jobs or os.cpu_count() or 1
+
+
+def get_dump_suffix(settings: DefaultSettings) -> str:
+    match settings.DB_DUMP_FORMAT:
+        case 'custom':
+            return '.dump'
+        case 'directory':
+            return '.tar'
+    return f'.sql{COMPRESSION_SUFFIXES[settings.DB_DUMP_COMPRESSION]}'
+
+
+def _get_level(settings: DefaultSettings) -> int:
+    if settings.DB_DUMP_COMPRESSION == 'none':
+        return 0
+    return settings.DB_DUMP_COMPRESSION_LEVEL
+
+
+async def run_command(command: tp.Sequence[str], env: dict[str, str]) -> str:
+    proc = await create_process(command, env)
+    try:
+        stdout, stderr = await proc.communicate()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise DumpError(
+            f'{command[0]} exited with code {proc.returncode}: '
+            f'{stderr.decode(errors="replace").strip()}'
+        )
+    return stdout.decode(errors='replace')
+
+
+async def verify_dump(path: Path, env: dict[str, str]) -> int:
+    """
+    Read table of contents of custom or directory dump
+    with `pg_restore --list`, return number of entries.
+    """
+    listing = await run_command(('pg_restore', '--list', str(path)), env)
+    entries = [
+        line
+        for line in listing.splitlines()
+        if line.strip() and not line.startswith(';')
+    ]
+    if not entries:
+        raise DumpError(f'Dump {path} has no entries')
+    return len(entries)
+
+
+def _get_size(directory: Path) -> int:
+    return sum(
+        path.stat().st_size for path in directory.rglob('*') if path.is_file()
+    )
+
+
+def _pack(directory: Path, path: Path) -> None:
+    # Files are already compressed by pg_dump
+    with tarfile.open(path, 'w') as tar:
+        tar.add(directory, arcname=directory.name)
+
+
+def _unpack(path: Path, directory: Path) -> Path:
+    with tarfile.open(path) as tar:
+        tar.extractall(directory, filter='data')
+    (dump,) = directory.iterdir()
+    return dump
+
+
+async def _dump_directory(
+    path: Path, settings: DefaultSettings, env: dict[str, str]
+) -> DumpResult:
+    start = time.perf_counter()
+    directory = path.with_suffix('')
+    try:
+        await run_command(
+            (
+                'pg_dump',
+                '--format=directory',
+                f'--jobs={get_jobs(settings.DB_DUMP_JOBS)}',
+                f'--compress={_get_level(settings)}',
+                f'--file={directory}',
+            ),
+            env,
+        )
+        await verify_dump(directory, env)
+        raw_size = await asyncio.to_thread(_get_size, directory)
+        await asyncio.to_thread(_pack, directory, path)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    finally:
+        await asyncio.to_thread(shutil.rmtree, directory, ignore_errors=True)
+    return DumpResult(
+        path, raw_size, path.stat().st_size, time.perf_counter() - start
+    )
+
+
+async def dump_database(path: Path, settings: DefaultSettings) -> DumpResult:
+    """
+    Dump database to `path` in `DB_DUMP_FORMAT`.
+
+    Plain dump is streamed through `DB_DUMP_COMPRESSION` compressor,
+    custom and directory dumps are compressed by pg_dump and verified
+    with `pg_restore --list`, directory dump is packed to tar.
+    """
+    env = get_pg_env(settings)
+    match settings.DB_DUMP_FORMAT:
+        case 'directory':
+            return await _dump_directory(path, settings, env)
+        case 'custom':
+            result = await stream_to_file(
+                (
+                    'pg_dump',
+                    '--format=custom',
+                    f'--compress={_get_level(settings)}',
+                ),
+                path,
+                env,
+                NoCompression(),
+                settings.DB_DUMP_CHUNK_SIZE,
+            )
+            try:
+                await verify_dump(path, env)
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+            return result
+    return await stream_to_file(
+        ('pg_dump',),
+        path,
+        env,
+        get_compressor(
+            settings.DB_DUMP_COMPRESSION, settings.DB_DUMP_COMPRESSION_LEVEL
+        ),
+        settings.DB_DUMP_CHUNK_SIZE,
+    )
+
+
+async def restore_dump(
+    path: Path, settings: DefaultSettings, jobs: int = 0
+) -> None:
+    """
+    Restore custom, directory or packed directory dump
+    with parallel `pg_restore`, existing objects are replaced.
+    """
+    if path.is_file() and path.suffix not in ('.tar', '.dump'):
+        raise ValueError(f'Plain dump {path} has to be restored with psql')
+    env = get_pg_env(settings)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = path
+        if path.suffix == '.tar':
+            source = await asyncio.to_thread(_unpack, path, Path(tmp_dir))
+        await verify_dump(source, env)
+        await run_command(
+            (
+                'pg_restore',
+                f'--jobs={get_jobs(jobs or settings.DB_DUMP_JOBS)}',
+                '--clean',
+                '--if-exists',
+                '--no-owner',
+                f'--dbname={settings.POSTGRES_DB}',
+                str(source),
+            ),
+            env,
+        )
@@ -0,0 +1,48 @@
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+
+def get_expired(
+    dumps: list[tuple[Path, datetime]], keep_daily: int, keep_weekly: int
+) -> list[Path]:
+    """
+    Dumps that are neither the newest of one of the last `keep_daily`
+    days nor the newest of one of the last `keep_weekly` weeks.
+    """
+    keep = set()
+    days: set[object] = set()
+    weeks: set[object] = set()
+    for path, created in sorted(dumps, key=lambda dump: dump[1], reverse=True):
+        day = created.date()
+        week = created.isocalendar()[:2]
+        if day not in days and len(days) < keep_daily:
+            days.add(day)
+            keep.add(path)
+        if week not in weeks and len(weeks) < keep_weekly:
+            weeks.add(week)
+            keep.add(path)
+    return [path for path, _ in dumps if path not in keep]
+
+
+def apply_retention(
+    directory: Path, prefix: str, keep_daily: int, keep_weekly: int
+) -> list[Path]:
+    """
+    Remove expired dumps (files or directories starting with `prefix`),
+    return removed paths.
+    """
+    if not directory.exists():
+        return []
+    dumps = [
+        (path, datetime.fromtimestamp(path.stat().st_mtime))
+        for path in directory.iterdir()
+        if path.name.startswith(prefix)
+    ]
+    expired = get_expired(dumps, keep_daily, keep_weekly)
+    for path in expired:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    return expired
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import time
+import typing as tp
+import zlib
+from pathlib import Path
+
+from app.config import DefaultSettings
+
+
+class DumpError(Exception):
+    """
+    Dump command exited with non-zero code.
+    """
+
+
+class Compressor(tp.Protocol):
+    def compress(self, data: bytes, /) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        ...
+
+
+class NoCompression:
+    def compress(self, data: bytes, /) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b''
+
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'none': ''}
+
+
+def get_compressor(compression: str, level: int) -> Compressor:
+    if compression == 'gzip':
+        # 16 + MAX_WBITS writes gzip header, so `gunzip` reads the file
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if compression == 'none':
+        return NoCompression()
+    raise ValueError(f'Unknown compression: {compression}')
+
+
+def get_pg_env(settings: DefaultSettings) -> dict[str, str]:
+    return {
+        'PATH': os.environ.get('PATH', os.defpath),
+        'PGPASSWORD': settings.POSTGRES_PASSWORD,
+        'PGDATABASE': settings.POSTGRES_DB,
+        'PGPORT': str(settings.POSTGRES_PORT),
+        'PGHOST': settings.POSTGRES_HOST,
+        'PGUSER': settings.POSTGRES_USER,
+    }
+
+
+class DumpResult(tp.NamedTuple):
+    path: Path
+    raw_size: int
+    size: int
+    duration: float
+
+    @property
+    def rate(self) -> float:
+        """
+        Bytes of command output processed per second.
+        """
+        return self.raw_size / self.duration if self.duration else 0.0
+
+
+async def create_process(
+    command: tp.Sequence[str], env: dict[str, str], limit: int = 2**16
+) -> asyncio.subprocess.Process:  # pylint: disable=no-member
+    return await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        limit=limit,
+    )
+
+
+def _write_chunk(
+    file: tp.BinaryIO, compressor: Compressor, chunk: bytes
+) -> int:
+    data = compressor.compress(chunk)
+    file.write(data)
+    return len(data)
+
+
+async def _read_stderr(stream: asyncio.StreamReader | None) -> bytes:
+    return await stream.read() if stream is not None else b''
+
+
+async def stream_to_file(  # pylint: disable=too-many-arguments
+    command: tp.Sequence[str],
+    path: Path,
+    env: dict[str, str],
+    compressor: Compressor,
+    chunk_size: int,
+) -> DumpResult:
+    """
+    Run `command` and write its output to `path` through `compressor`.
+
+    Output is read chunk by chunk and compressed in a thread,
+    so the event loop isn't blocked and memory use doesn't depend
+    on the dump size. The file is removed if the command fails.
+    """
+    start = time.perf_counter()
+    proc = await create_process(command, env, limit=chunk_size)
+    assert proc.stdout is not None  # nosec
+    stderr = asyncio.create_task(_read_stderr(proc.stderr))
+    raw_size = size = 0
+    try:
+        with open(path, 'wb') as file:
+            while chunk := await proc.stdout.read(chunk_size):
+                raw_size += len(chunk)
+                size += await asyncio.to_thread(
+                    _write_chunk, file, compressor, chunk
+                )
+            tail = compressor.flush()
+            await asyncio.to_thread(file.write, tail)
+            size += len(tail)
+        returncode = await proc.wait()
+        if returncode != 0:
+            message = (await stderr).decode(errors='replace').strip()
+            raise DumpError(
+                f'{command[0]} exited with code {returncode}: {message}'
+            )
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        stderr.cancel()
+        path.unlink(missing_ok=True)
+        raise
+    await stderr
+    return DumpResult(path, raw_size, size, time.perf_counter() - start)
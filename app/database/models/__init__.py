@@ -1,8 +1,10 @@
 from .base import BaseModel
+from .job_run import JobRun
 from .user import User
 
 
 __all__ = [
     'BaseModel',
+    'JobRun',
     'User',
 ]
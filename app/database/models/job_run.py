@@ -0,0 +1,61 @@
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.orm import Mapped
+
+from .base import BaseModel
+
+
+class JobRun(BaseModel):
+    __tablename__ = 'job_run'
+    __table_args__ = (
+        # Keyset pagination and stats scan runs in start time order
+        sa.Index(None, 'dt_started', 'id'),
+        sa.Index(None, 'name', 'dt_started', 'id'),
+    )
+
+    name = sa.Column(
+        'name',
+        sa.String,
+        nullable=False,
+        doc='Scheduler job name.',
+    )
+    dt_started = sa.Column(
+        'dt_started',
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        doc='Date and time of job start.',
+    )
+    dt_finished = sa.Column(
+        'dt_finished',
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        doc='Date and time of job finish.',
+    )
+    # mypy plugin types Float column as Mapped[_N]
+    duration: Mapped[float] = sa.Column(  # type: ignore[misc]
+        'duration',
+        sa.Float,
+        nullable=False,
+        doc='Run duration in seconds.',
+    )
+    status = sa.Column(
+        'status',
+        sa.String,
+        nullable=False,
+        doc='ok, error or timeout.',
+    )
+    log_id = sa.Column(
+        'log_id',
+        sa.String,
+        nullable=False,
+        doc='Id bound to job log records.',
+    )
+    error_fingerprint = sa.Column(
+        'error_fingerprint',
+        sa.String,
+        nullable=True,
+        doc='Fingerprint of the error the job failed with.',
+    )
+
+    def __repr__(self) -> str:
+        return f'<JobRun {self.name} {self.dt_started} {self.status}>'
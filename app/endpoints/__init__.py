@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.endpoints.metrics import api_router as metrics_router
 from app.endpoints.v1 import router as v1_router
 
 
@@ -10,4 +11,5 @@ list_of_routes: list[APIRouter] = [
 
 __all__ = [
     'list_of_routes',
+    'metrics_router',
 ]
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Response
+
+from app.metrics import generate_metrics
+
+
+api_router = APIRouter(
+    tags=['Application Health'],
+)
+
+
+@api_router.get(
+    '/metrics',
+    include_in_schema=False,
+)
+def metrics() -> Response:
+    # Sync handler: merging multiprocess files runs in threadpool
+    content, content_type = generate_metrics()
+    return Response(content=content, media_type=content_type)
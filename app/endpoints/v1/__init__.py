@@ -1,7 +1,10 @@
 from fastapi import APIRouter
 
 from .auth import api_router as auth_router
+from .errors import api_router as errors_router
+from .jobs import api_router as jobs_router
 from .ping import api_router as ping_router
+from .queries import api_router as queries_router
 
 
 prefix = '/v1'
@@ -11,6 +14,9 @@ router = APIRouter(
 
 router.include_router(ping_router)
 router.include_router(auth_router)
+router.include_router(errors_router)
+router.include_router(jobs_router)
+router.include_router(queries_router)
 
 
 __all__ = [
@@ -7,8 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.database.connection import SessionManager
-from app.database.models import User
-from app.schemas.auth import Token, UserSchema
+from app.schemas.auth import Principal, Token, UserSchema
+from app.utils.common import ModelResponse
+from app.utils.password import PasswordHasherOverloadedError
 from app.utils.user import (
     authenticate_user,
     create_access_token,
@@ -26,15 +27,27 @@ api_router = APIRouter(
     '/authentication',
     status_code=status.HTTP_200_OK,
     response_model=Token,
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            'description': 'Too many authentication requests',
+        },
+    },
 )
 async def authentication(
     _: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(SessionManager().get_async_session),
-) -> Token:
-    user = await authenticate_user(
-        session, form_data.username, form_data.password
-    )
+) -> ModelResponse:
+    try:
+        user = await authenticate_user(
+            session, form_data.username, form_data.password
+        )
+    except PasswordHasherOverloadedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Too many authentication requests',
+            headers={'Retry-After': '1'},
+        ) from exc
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,7 +60,7 @@ async def authentication(
     access_token = create_access_token(
         data={'sub': user.username}, expires_delta=access_token_expires
     )
-    return Token(access_token=access_token, token_type='bearer')
+    return ModelResponse(Token(access_token=access_token, token_type='bearer'))
 
 
 @api_router.get(
@@ -62,6 +75,6 @@ async def authentication(
 )
 async def get_me(
     _: Request,
-    current_user: User = Depends(get_current_user),
-) -> UserSchema:
-    return UserSchema.model_validate(current_user)
+    current_user: Principal = Depends(get_current_user),
+) -> ModelResponse:
+    return ModelResponse(UserSchema.model_validate(current_user))
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Request, status
+
+from app.bot_helper.send import error_aggregator
+from app.schemas.auth import Principal
+from app.schemas.errors import ErrorStats, ErrorStatsResponse
+from app.utils.common import ModelResponse
+from app.utils.user import get_current_user
+
+
+api_router = APIRouter(
+    prefix='/errors',
+    tags=['Errors'],
+)
+
+
+@api_router.get(
+    '',
+    response_model=ErrorStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_errors(
+    _: Request,
+    __: Principal = Depends(get_current_user),
+) -> ModelResponse:
+    """
+    Errors of this worker process grouped by fingerprint,
+    most recent first.
+    """
+    return ModelResponse(
+        ErrorStatsResponse(
+            errors=[
+                ErrorStats(fingerprint=fingerprint, **stats)
+                for fingerprint, stats in error_aggregator.stats().items()
+            ]
+        )
+    )
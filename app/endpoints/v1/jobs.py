@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.connection import SessionManager
+from app.schemas.auth import Principal
+from app.schemas.job_run import (
+    JobRun,
+    JobRunsResponse,
+    JobStats,
+    JobStatsResponse,
+)
+from app.utils.common import ModelResponse
+from app.utils.job_run import (
+    decode_cursor,
+    encode_cursor,
+    get_job_runs,
+    get_job_stats,
+)
+from app.utils.user import get_current_user
+
+
+api_router = APIRouter(
+    prefix='/jobs',
+    tags=['Jobs'],
+)
+
+
+@api_router.get(
+    '/runs',
+    response_model=JobRunsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_runs(
+    _: Request,
+    name: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(SessionManager().get_async_session),
+    __: Principal = Depends(get_current_user),
+) -> ModelResponse:
+    """
+    Scheduler job runs, newest first. Pages are chained
+    with `next_cursor`.
+    """
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    runs = [
+        JobRun.model_validate(run)
+        for run in await get_job_runs(session, limit + 1, name, before)
+    ]
+    next_cursor = None
+    if len(runs) > limit:
+        runs = runs[:limit]
+        next_cursor = encode_cursor(runs[-1].dt_started, runs[-1].id)
+    return ModelResponse(JobRunsResponse(runs=runs, next_cursor=next_cursor))
+
+
+@api_router.get(
+    '/stats',
+    response_model=JobStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_stats(
+    _: Request,
+    name: str | None = None,
+    days: int = Query(7, ge=1, le=90),
+    session: AsyncSession = Depends(SessionManager().get_async_session),
+    __: Principal = Depends(get_current_user),
+) -> ModelResponse:
+    """
+    Run count, errors and duration percentiles (seconds)
+    per job and day for the last `days` days.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    rows = await get_job_stats(session, since, name)
+    return ModelResponse(
+        JobStatsResponse(
+            stats=[JobStats.model_validate(row._asdict()) for row in rows]
+        )
+    )
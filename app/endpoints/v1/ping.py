@@ -1,9 +1,12 @@
+import typing as tp
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import SessionManager
-from app.database.models import User
+from app.database.connection import SessionManager, get_pool_stats
 from app.schemas import PingMessage, PingResponse
+from app.schemas.auth import Principal
+from app.utils.common import ModelResponse
 from app.utils.health_check import health_check_db
 from app.utils.user import get_current_user
 
@@ -21,8 +24,8 @@ api_router = APIRouter(
 )
 async def ping_application(
     _: Request,
-) -> PingResponse:
-    return PingResponse(message=PingMessage.OK)
+) -> ModelResponse:
+    return ModelResponse(PingResponse(message=PingMessage.OK))
 
 
 @api_router.get(
@@ -38,15 +41,26 @@ async def ping_application(
 async def ping_database(
     _: Request,
     session: AsyncSession = Depends(SessionManager().get_async_session),
-) -> PingResponse:
+) -> ModelResponse:
     if await health_check_db(session):
-        return PingResponse(message=PingMessage.OK)
+        return ModelResponse(PingResponse(message=PingMessage.OK))
     raise HTTPException(  # pragma: no cover
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         detail=PingMessage.DB_ERROR,
     )
 
 
+@api_router.get(
+    '/database_pool',
+    status_code=status.HTTP_200_OK,
+)
+async def database_pool(
+    _: Request,
+    __: Principal = Depends(get_current_user),
+) -> dict[str, tp.Any]:
+    return get_pool_stats(SessionManager().async_engine.pool)
+
+
 @api_router.get(
     '/ping_auth',
     response_model=PingResponse,
@@ -54,6 +68,8 @@ async def ping_database(
 )
 async def ping_auth(
     _: Request,
-    user: User = Depends(get_current_user),
-) -> PingResponse:
-    return PingResponse(message=PingMessage.OK, detail=user.username)
+    user: Principal = Depends(get_current_user),
+) -> ModelResponse:
+    return ModelResponse(
+        PingResponse(message=PingMessage.OK, detail=user.username)
+    )
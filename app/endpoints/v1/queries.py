@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from app.database.connection import sql_instrumentation
+from app.schemas.auth import Principal
+from app.schemas.queries import QueryStats, QueryStatsResponse
+from app.utils.common import ModelResponse
+from app.utils.user import get_current_user
+
+
+api_router = APIRouter(
+    prefix='/queries',
+    tags=['Queries'],
+)
+
+
+@api_router.get(
+    '',
+    response_model=QueryStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_queries(
+    _: Request,
+    limit: int = Query(50, ge=1),
+    __: Principal = Depends(get_current_user),
+) -> ModelResponse:
+    """
+    SQL statements of this worker process grouped by fingerprint,
+    most time-consuming first.
+    """
+    return ModelResponse(
+        QueryStatsResponse(
+            queries=[
+                QueryStats(fingerprint=fingerprint, **stats)
+                for fingerprint, stats in sql_instrumentation.stats(
+                    limit
+                ).items()
+            ]
+        )
+    )
@@ -0,0 +1,40 @@
+from .collectors import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_REJECTED,
+    DB_POOL_WAIT,
+    DB_POOL_WAITING,
+    PRINCIPAL_CACHE_EVICTIONS,
+    PRINCIPAL_CACHE_LOOKUPS,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    SCHEDULER_JOB_DURATION,
+    TELEGRAM_SEND_FAILURES,
+)
+from .exposition import (
+    clear_multiprocess_dir,
+    generate_metrics,
+    get_registry,
+    mark_process_dead,
+)
+from .middleware import MetricsMiddleware
+
+
+__all__ = [
+    'DB_POOL_CHECKED_OUT',
+    'DB_POOL_OVERFLOW',
+    'DB_POOL_REJECTED',
+    'DB_POOL_WAIT',
+    'DB_POOL_WAITING',
+    'MetricsMiddleware',
+    'PRINCIPAL_CACHE_EVICTIONS',
+    'PRINCIPAL_CACHE_LOOKUPS',
+    'REQUESTS_IN_FLIGHT',
+    'REQUEST_LATENCY',
+    'SCHEDULER_JOB_DURATION',
+    'TELEGRAM_SEND_FAILURES',
+    'clear_multiprocess_dir',
+    'generate_metrics',
+    'get_registry',
+    'mark_process_dead',
+]
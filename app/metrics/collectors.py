@@ -0,0 +1,66 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route template.',
+    ['method', 'route', 'status_code'],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight',
+    'HTTP requests being handled.',
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out_connections',
+    'Connections checked out from pool.',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_OVERFLOW = Gauge(
+    'db_pool_overflow_connections',
+    'Connections opened above pool size.',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_WAITING = Gauge(
+    'db_pool_waiting_callers',
+    'Callers waiting for connection.',
+    ['engine'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_WAIT = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent waiting for connection checkout.',
+    ['engine'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0),
+)
+DB_POOL_REJECTED = Counter(
+    'db_pool_rejected',
+    'Checkouts rejected by admission control.',
+    ['engine', 'reason'],
+)
+
+SCHEDULER_JOB_DURATION = Histogram(
+    'scheduler_job_duration_seconds',
+    'Scheduler job run time.',
+    ['job', 'status'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+PRINCIPAL_CACHE_LOOKUPS = Counter(
+    'principal_cache_lookups',
+    'Principal cache lookups by result.',
+    ['result'],
+)
+PRINCIPAL_CACHE_EVICTIONS = Counter(
+    'principal_cache_evictions',
+    'Principal cache entries evicted by size limit.',
+)
+
+TELEGRAM_SEND_FAILURES = Counter(
+    'telegram_send_failures',
+    'Telegram messages that failed to send.',
+    ['method'],
+)
@@ -0,0 +1,46 @@
+import os
+import pathlib
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
+
+
+MULTIPROCESS_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Registry to export. With `PROMETHEUS_MULTIPROC_DIR` set every
+    worker writes its values to files in that directory, and any
+    worker handling the scrape merges all of them.
+    """
+    if MULTIPROCESS_DIR_ENV not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)  # type: ignore
+    return registry
+
+
+def generate_metrics() -> tuple[bytes, str]:
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
+
+
+def clear_multiprocess_dir() -> None:
+    """
+    Remove values left by previous run, call before forking workers.
+    """
+    directory = os.environ.get(MULTIPROCESS_DIR_ENV)
+    if directory is None:
+        return
+    for path in pathlib.Path(directory).glob('*.db'):
+        path.unlink()
+
+
+def mark_process_dead(pid: int) -> None:
+    if MULTIPROCESS_DIR_ENV in os.environ:
+        multiprocess.mark_process_dead(pid)  # type: ignore
@@ -0,0 +1,57 @@
+import time
+import typing as tp
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .collectors import REQUEST_LATENCY, REQUESTS_IN_FLIGHT
+
+
+class MetricsMiddleware:
+    """
+    Measures request latency by route template, method and status code.
+
+    Histogram child for each label combination is looked up once
+    and reused, so a request costs one tuple and one dict lookup.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._observers: dict[
+            tuple[str, str, int], tp.Callable[[float], None]
+        ] = {}
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get('route')
+            # Unmatched paths share one label value to bound cardinality
+            key = (
+                scope['method'],
+                route.path if route is not None else 'unmatched',
+                status_code,
+            )
+            observe = self._observers.get(key)
+            if observe is None:
+                observe = self._observers[key] = REQUEST_LATENCY.labels(
+                    *key
+                ).observe
+            observe(duration)
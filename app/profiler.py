@@ -0,0 +1,76 @@
+import asyncio
+import hmac
+import pathlib
+
+import loguru
+from pyinstrument import Profiler
+from pyinstrument.renderers import SpeedscopeRenderer
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import DefaultSettings, get_settings
+
+
+PROFILE_HEADER = b'x-profile'
+
+
+def _get_profile_token(scope: Scope) -> str | None:
+    # Header only: query string ends up in access and proxy logs
+    for name, value in scope['headers']:
+        if name == PROFILE_HEADER:
+            return value.decode('latin-1')
+    return None
+
+
+def _is_profiling_requested(scope: Scope, settings: DefaultSettings) -> bool:
+    if not settings.PROFILING_ENABLED or not settings.PROFILING_TOKEN:
+        return False
+    token = _get_profile_token(scope)
+    return token is not None and hmac.compare_digest(
+        token, settings.PROFILING_TOKEN
+    )
+
+
+def _save_profile(profiler: Profiler, path: pathlib.Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(profiler.output(renderer=SpeedscopeRenderer()))
+
+
+class ProfilingMiddleware:
+    """
+    Runs sampling profiler for a request with `X-Profile` header equal
+    to `PROFILING_TOKEN`, and saves speedscope profile
+    to `PROFILING_DIR/<log-id>.speedscope.json`.
+
+    Only one request per process is profiled at a time,
+    other requests with the flag run as usual.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._running = False
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http' or self._running:
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
+        if not _is_profiling_requested(scope, settings):
+            await self.app(scope, receive, send)
+            return
+
+        self._running = True
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            self._running = False
+            path = (
+                settings.PROFILING_DIR
+                / f'{scope.get("request_id", "request")}.speedscope.json'
+            )
+            await asyncio.to_thread(_save_profile, profiler, path)
+            loguru.logger.info('Request profile saved to {}', path)
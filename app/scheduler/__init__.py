@@ -11,13 +11,28 @@ list_of_jobs: list[scheduler_schemas.JobInfo] = [
         **{
             'trigger': 'interval',
             'minutes': 1,
+            'executor': 'asyncio',
+            'timeout': 30,
+            'max_instances': 1,
+            'coalesce': True,
+            'misfire_grace_time': 30,
             'config': {'send_logs': False},
         },
         func=ping,
         name='ping',
     ),
     scheduler_schemas.JobInfo(
-        **{'trigger': 'cron', 'hour': 3, 'config': {'send_logs': True}},
+        **{
+            'trigger': 'cron',
+            'hour': 3,
+            'executor': 'asyncio',
+            'timeout': 3600,
+            'max_instances': 1,
+            'coalesce': True,
+            'misfire_grace_time': 3600,
+            'jitter': 300,
+            'config': {'send_logs': True},
+        },
         func=db_dump,
         name='db_dump',
     ),
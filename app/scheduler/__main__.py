@@ -2,116 +2,237 @@ import asyncio
 import functools
 import pathlib
 import sys
+import time
 import traceback
+import typing as tp
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 import loguru
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from prometheus_client import start_http_server
 
 from app.bot_helper import send
 from app.config import get_settings
+from app.database.connection import (
+    AdvisoryLock,
+    LeaderElection,
+    SessionManager,
+    check_connection_budget,
+)
+from app.metrics import (
+    SCHEDULER_JOB_DURATION,
+    TELEGRAM_SEND_FAILURES,
+    get_registry,
+)
 from app.scheduler import list_of_jobs
 from app.schemas import scheduler as scheduler_schemas
+from app.utils.errors import get_error_fingerprint
+from app.utils.job_executor import PROCESS_CONTEXT, run_job, shutdown_executors
+from app.utils.job_run import (
+    has_log_id,
+    job_logs,
+    record_job_run,
+    wait_job_runs,
+)
+
+
+# Tasks of job runs in progress, cancelled when leadership is lost
+_running_jobs: set[asyncio.Task[tp.Any]] = set()
+
+
+def _track_job_run() -> None:
+    task = asyncio.current_task()
+    if task is not None:
+        _running_jobs.add(task)
+        task.add_done_callback(_running_jobs.discard)
+
+
+def _step_down(_scheduler: AsyncIOScheduler) -> None:
+    """
+    Stop running jobs when another replica may become the leader,
+    so runs don't overlap with its runs.
+    """
+    _scheduler.pause()
+    for task in _running_jobs:
+        task.cancel()
+
+
+def _write_log_file(path: pathlib.Path, logs: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(logs, encoding='utf-8')
+
+
+async def _send_job_logs(
+    name: str, log_id: str, base_logger: 'loguru.Logger'
+) -> None:
+    """
+    Send logs collected for the job run as a file.
+    """
+    # Records of the run may still wait in the sink queue
+    await asyncio.to_thread(loguru.logger.complete)
+    logs = job_logs.pop(log_id)
+    log_file_name = (
+        get_settings().LOGGING_FILE_DIR / f'scheduler/job-{name}-{log_id}.log'
+    )
+    try:
+        await asyncio.to_thread(_write_log_file, log_file_name, logs)
+        await send.send_file(
+            log_file_name,
+            f'job-{name}-{log_id}',
+            chat_id=get_settings().TG_LOG_SEND_CHAT_ID,
+        )
+    except Exception as send_exc:  # pylint: disable=broad-except
+        TELEGRAM_SEND_FAILURES.labels('send_file').inc()
+        base_logger.exception('Error while sending log file: {}', send_exc)
+        await send.send_traceback_message_safe(
+            logger=base_logger,
+            message=f'Error while sending log file: {send_exc}',
+            code=traceback.format_exc(),
+        )
+
+    try:
+        log_file_name.unlink(missing_ok=True)
+    except Exception as exc:  # pylint: disable=broad-except
+        base_logger.exception('Error while deleting log file: {}', exc)
+        await send.send_traceback_message_safe(
+            logger=base_logger,
+            message=f'Error while deleting log file: {exc}',
+            code=traceback.format_exc(),
+        )
 
 
 def _job_info_wrapper(  # pylint: disable=too-many-statements
     job_info: scheduler_schemas.JobInfo,
 ) -> scheduler_schemas.JobInfo:
+    """
+    Job info for `add_job`: function wrapped with logging, metrics,
+    timeout and executor, without options handled by the wrapper.
+    """
     config = job_info.config or scheduler_schemas.JobConfig(send_logs=False)
-    job_info.config = None
-
-    def _job_wrapper(func):  # type: ignore
-        @functools.wraps(func)
-        async def _wrapped(*args, **kwargs):  # type: ignore
-            log_id = uuid.uuid4().hex
-            log_file_name = (
-                settings.LOGGING_FILE_DIR
-                / f'scheduler/job-{job_info.name}-{log_id}.log'
+    job_timeout = job_info.timeout
+    job_executor = job_info.executor or 'asyncio'
+    func = job_info.func
+
+    async def _run(log_id: str, *args: tp.Any, **kwargs: tp.Any) -> tp.Any:
+        # pylint: disable=too-many-statements
+        base_logger = loguru.logger.bind(uuid=log_id)
+        if config.send_logs:
+            await send.send_message_safe(
+                logger=base_logger,
+                message=f'Job {job_info.name} started (log_id={log_id})',
+                level='info',
+                chat_id=get_settings().TG_LOG_SEND_CHAT_ID,
             )
-            base_logger = loguru.logger.bind(uuid=log_id)
-            if config.send_logs:
-                handler_id = base_logger.add(
-                    log_file_name,
-                    serialize=True,
-                    enqueue=True,
-                    filter=lambda record: record['extra'].get('uuid')
-                    == log_id,
-                )
-                await send.send_message_safe(
-                    logger=base_logger,
-                    message=f'Job {job_info.name} started '
-                    f'(log_id={log_id})',
-                    level='info',
-                    chat_id=get_settings().TG_LOG_SEND_CHAT_ID,
-                )
 
-            base_logger.info(
-                'Job {} started (args={}, kwargs={})',
+        base_logger.info(
+            'Job {} started (args={}, kwargs={})',
+            job_info.name,
+            args,
+            kwargs,
+        )
+        dt_started = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        timeout = asyncio.timeout(job_timeout)
+        try:
+            async with timeout:
+                result = await run_job(
+                    job_executor, func, log_id, *args, **kwargs
+                )
+        except Exception as exc:  # pylint: disable=broad-except
+            duration = time.perf_counter() - start
+            status = 'timeout' if timeout.expired() else 'error'
+            SCHEDULER_JOB_DURATION.labels(job_info.name, status).observe(
+                duration
+            )
+            record_job_run(
                 job_info.name,
-                args,
-                kwargs,
+                dt_started,
+                duration,
+                status,
+                log_id,
+                get_error_fingerprint(exc),
             )
-            kwargs.update(base_logger=base_logger)
-            try:
-                result = await func(*args, **kwargs)
-            except Exception as exc:  # pylint: disable=broad-except
-                base_logger.exception(
-                    'Error in job {}: {}', job_info.name, exc
+            if status == 'timeout':
+                message = (
+                    f'Job {job_info.name} cancelled after {job_timeout} s'
                 )
-                await send.send_traceback_message_safe(
-                    logger=base_logger,
-                    message=f'Error in job {job_info.name}',
-                    code=traceback.format_exc(),
-                )
-                raise
-            base_logger.info('Job {} finished', job_info.name)
-
-            if not config.send_logs:
-                return result
+            else:
+                message = f'Error in job {job_info.name}'
+            base_logger.exception('{}: {}', message, exc)
+            await send.send_traceback_message_safe(
+                logger=base_logger,
+                message=message,
+                code=traceback.format_exc(),
+            )
+            if config.send_logs:
+                await _send_job_logs(job_info.name, log_id, base_logger)
+            raise
+        duration = time.perf_counter() - start
+        SCHEDULER_JOB_DURATION.labels(job_info.name, 'ok').observe(duration)
+        record_job_run(job_info.name, dt_started, duration, 'ok', log_id)
+        base_logger.info('Job {} finished', job_info.name)
 
+        if config.send_logs:
             await send.send_message_safe(
                 logger=base_logger,
                 message=f'Job {job_info.name} finished (log_id={log_id})',
                 level='info',
                 chat_id=get_settings().TG_LOG_SEND_CHAT_ID,
             )
+            await _send_job_logs(job_info.name, log_id, base_logger)
 
-            base_logger.remove(handler_id)
-
-            try:
-                await send.send_file(
-                    log_file_name,
-                    f'job-{job_info.name}-{log_id}',
-                    chat_id=settings.TG_LOG_SEND_CHAT_ID,
-                )
-            except Exception as send_exc:  # pylint: disable=broad-except
-                base_logger.exception(
-                    'Error while sending log file: {}', send_exc
-                )
-                await send.send_traceback_message_safe(
-                    logger=base_logger,
-                    message=f'Error while sending log file: {send_exc}',
-                    code=traceback.format_exc(),
-                )
-
-            try:
-                pathlib.Path(log_file_name).unlink()
-            except Exception as exc:  # pylint: disable=broad-except
-                base_logger.exception('Error while deleting log file: {}', exc)
-                await send.send_traceback_message_safe(
-                    logger=base_logger,
-                    message=f'Error while deleting log file: {exc}',
-                    code=traceback.format_exc(),
-                )
+        return result
 
-            return result
+    @functools.wraps(func)
+    async def _wrapped(*args, **kwargs):  # type: ignore
+        _track_job_run()
+        log_id = uuid.uuid4().hex
+        if not config.send_logs:
+            return await _run(log_id, *args, **kwargs)
+        job_logs.start(log_id)
+        try:
+            return await _run(log_id, *args, **kwargs)
+        finally:
+            # Logs of a cancelled run are never sent
+            job_logs.pop(log_id)
 
-        return _wrapped
+    return job_info.model_copy(
+        update={
+            'func': _wrapped,
+            'config': None,
+            'timeout': None,
+            'executor': None,
+        }
+    )
 
-    job_info.func = _job_wrapper(job_info.func)
 
-    return job_info
+def configure_logger() -> None:
+    """
+    Scheduler sinks, enqueued: process pool workers log through them.
+    """
+    loguru.logger.remove()
+    loguru.logger.add(
+        sink=sys.stderr,
+        serialize=True,
+        enqueue=True,
+        context=PROCESS_CONTEXT,
+    )
+    loguru.logger.add(
+        get_settings().LOGGING_SCHEDULER_FILE,
+        rotation='500 MB',
+        serialize=True,
+        enqueue=True,
+        context=PROCESS_CONTEXT,
+    )
+    # Logs of runs with `send_logs`, sent when a run ends
+    loguru.logger.add(
+        job_logs.write,
+        serialize=True,
+        enqueue=True,
+        context=PROCESS_CONTEXT,
+        filter=has_log_id,
+    )
 
 
 def get_scheduler() -> AsyncIOScheduler:
@@ -120,39 +241,48 @@ def get_scheduler() -> AsyncIOScheduler:
     """
     _scheduler = AsyncIOScheduler()
     for job_info in list_of_jobs:
-        print(
-            {
-                k: v
-                for k, v in _job_info_wrapper(job_info).dict().items()
-                if v is not None
-            }
-        )
         _scheduler.add_job(
-            **{
-                k: v
-                for k, v in _job_info_wrapper(job_info).dict().items()
-                if v is not None
-            }
+            **_job_info_wrapper(job_info).model_dump(exclude_none=True)
         )
+        loguru.logger.info('Job {} added', job_info.name)
     return _scheduler
 
 
 if __name__ == '__main__':
     settings = get_settings()
-    loguru.logger.remove()
-    loguru.logger.add(sink=sys.stderr, serialize=True, enqueue=True)
-    loguru.logger.add(
-        settings.LOGGING_SCHEDULER_FILE,
-        rotation='500 MB',
-        serialize=True,
-        enqueue=True,
-    )
+    SessionManager().set_role('scheduler')
+    configure_logger()
+    check_connection_budget(settings)
+    if settings.SCHEDULER_METRICS_PORT:
+        start_http_server(
+            settings.SCHEDULER_METRICS_PORT, registry=get_registry()
+        )
     scheduler = get_scheduler()
     for job in scheduler.get_jobs():
         job.modify(next_run_time=datetime.now())
-    scheduler.start()
+    loop = asyncio.get_event_loop()
+    election = None
+    if settings.SCHEDULER_LEADER_ELECTION:
+        # Replicas wait paused, only the leader runs jobs
+        election = LeaderElection(
+            AdvisoryLock(
+                SessionManager().async_engine, settings.SCHEDULER_LOCK_KEY
+            ),
+            settings.SCHEDULER_LEASE_INTERVAL,
+            on_elected=scheduler.resume,
+            on_deposed=functools.partial(_step_down, scheduler),
+        )
+        scheduler.start(paused=True)
+        loop.run_until_complete(election.start())
+    else:
+        scheduler.start()
     try:
         loguru.logger.info('Starting scheduler')
-        asyncio.get_event_loop().run_forever()
+        loop.run_forever()
     except (KeyboardInterrupt, SystemExit):
         loguru.logger.info('Scheduler stopped')
+    if election is not None:
+        loop.run_until_complete(election.stop())
+    shutdown_executors()
+    loop.run_until_complete(wait_job_runs())
+    loop.run_until_complete(send.dispatcher.close())
@@ -1,4 +1,4 @@
-import subprocess
+import asyncio
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -8,6 +8,10 @@ import loguru
 from app import constants
 from app.bot_helper import send
 from app.config import get_settings
+from app.database.dump import apply_retention, dump_database, get_dump_suffix
+
+
+DUMP_PREFIX = 'db_dump_'
 
 
 async def job(
@@ -16,26 +20,27 @@ async def job(
     settings = get_settings()
 
     formatted_dt = datetime.now().strftime(constants.dt_format_filename)
-    filename = filename or f'db_dump_{formatted_dt}.sql'
+    suffix = get_dump_suffix(settings)
+    path = Path(filename or f'{DUMP_PREFIX}{formatted_dt}{suffix}')
+    if not path.is_absolute():
+        path = settings.DB_DUMP_DIR / path
+    path.parent.mkdir(parents=True, exist_ok=True)
 
-    base_logger.info('Starting db dump to {}', filename)
+    base_logger.info(
+        'Starting {} db dump to {}', settings.DB_DUMP_FORMAT, path
+    )
 
     try:
-        command = f'pg_dump --file {filename}'
-
-        proc = subprocess.Popen(
-            command,
-            shell=True,
-            env={
-                'PGPASSWORD': settings.POSTGRES_PASSWORD,
-                'PGDATABASE': settings.POSTGRES_DB,
-                'PGPORT': str(settings.POSTGRES_PORT),
-                'PGHOST': settings.POSTGRES_HOST,
-                'PGUSER': settings.POSTGRES_USER,
-            },
+        result = await dump_database(path, settings)
+        base_logger.info(
+            'Db dump finished: {} bytes dumped, {} bytes written '
+            'in {:.1f} s ({:.1f} MB/s)',
+            result.raw_size,
+            result.size,
+            result.duration,
+            result.rate / 1024 / 1024,
         )
-        proc.wait()
-        await send.send_db_dump(filename)
+        await send.send_db_dump(path)
     except Exception as exc:  # pylint: disable=broad-except
         base_logger.exception('Error while dumping db: {}', exc)
         await send.send_traceback_message_safe(
@@ -44,4 +49,12 @@ async def job(
             code=traceback.format_exc(),
         )
     finally:
-        Path(filename).unlink()
+        removed = await asyncio.to_thread(
+            apply_retention,
+            path.parent,
+            DUMP_PREFIX,
+            settings.DB_DUMP_KEEP_DAILY,
+            settings.DB_DUMP_KEEP_WEEKLY,
+        )
+        if removed:
+            base_logger.info('Removed old db dumps: {}', removed)
@@ -1,13 +1,121 @@
+import asyncio
+import time
 import traceback
-from collections import defaultdict
+import weakref
+from collections import defaultdict, deque
 from itertools import product
 
 import loguru
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits, Timeout
 
 from app.bot_helper import send
-from app.config import get_settings
+from app.config import DefaultSettings, get_settings, on_settings_reload
 from app.endpoints.v1 import prefix
+from app.utils.common import percentile
+
+
+ENDPOINTS = ('ping_database', 'ping_application')
+
+
+class LatencyHistory:
+    """
+    Last `size` latencies (seconds) of every probe.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._history: dict[tuple[str, str], deque[float]] = {}
+
+    def add(self, host: str, endpoint: str, latency: float) -> None:
+        history = self._history.get((host, endpoint))
+        if history is None or history.maxlen != self.size:
+            # Size is changed by settings reload
+            history = self._history[(host, endpoint)] = deque(
+                history or (), maxlen=self.size
+            )
+        history.append(latency)
+
+    def percentiles(self) -> dict[str, dict[str, tuple[float, float]]]:
+        """
+        p50 and p95 latency (milliseconds) by host and endpoint.
+        """
+        result: dict[str, dict[str, tuple[float, float]]] = defaultdict(dict)
+        for (host, endpoint), history in self._history.items():
+            result[host][endpoint] = (
+                (percentile(history, 50) or 0) * 1000,
+                (percentile(history, 95) or 0) * 1000,
+            )
+        return result
+
+
+latency_history = LatencyHistory(get_settings().PING_HISTORY_SIZE)
+
+
+@on_settings_reload
+def _configure_latency_history(settings: DefaultSettings) -> None:
+    latency_history.size = settings.PING_HISTORY_SIZE
+
+
+# Connections belong to the loop, a job run on its own loop
+# (in executor pool) gets its own client
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def get_client() -> AsyncClient:
+    """
+    Client shared by job runs, so connections are kept alive
+    between checks.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = AsyncClient(
+            timeout=Timeout(get_settings().PING_TIMEOUT),
+            limits=Limits(max_connections=2 * len(ENDPOINTS)),
+        )
+    return client
+
+
+async def _probe(
+    client: AsyncClient,
+    base_logger: 'loguru.Logger',
+    host: str,
+    endpoint: str,
+    url: str,
+) -> str:
+    start = time.perf_counter()
+    try:
+        # Total time is limited too, not only each read
+        async with asyncio.timeout(get_settings().PING_TIMEOUT):
+            response = await client.get(url)
+    except Exception as e:  # pylint: disable=broad-except
+        base_logger.error(
+            'Health check "{}" on {} failed (url "{}"): {!r}',
+            endpoint,
+            host,
+            url,
+            e,
+        )
+        return f'Failed (url "{url}"): {e!r}'
+    latency = time.perf_counter() - start
+    latency_history.add(host, endpoint, latency)
+    if response.status_code != 200:
+        base_logger.error(
+            'Health check "{}" on {} failed with status code {}',
+            endpoint,
+            host,
+            response.status_code,
+        )
+        return f'Failed (status code: {response.status_code})'
+    base_logger.info(
+        'Health check "{}" on {} is successful ({:.1f} ms)',
+        endpoint,
+        host,
+        latency * 1000,
+    )
+    return 'Successful'
 
 
 async def job(base_logger: 'loguru.Logger') -> None:
@@ -18,45 +126,27 @@ async def job(base_logger: 'loguru.Logger') -> None:
         f'nginx:{settings.NGINX_EXTERNAL_PORT}',
         f'app:{settings.APP_PORT}',
     ]
-    endpoints = ['ping_database', 'ping_application']
 
+    client = get_client()
+    probes = list(product(hosts, ENDPOINTS))
+    statuses = await asyncio.gather(
+        *(
+            _probe(
+                client,
+                base_logger,
+                host,
+                endpoint,
+                base_url.format(host, endpoint),
+            )
+            for host, endpoint in probes
+        )
+    )
     result: dict[str, dict[str, str]] = defaultdict(dict)
-
-    async with AsyncClient() as client:
-        for host, endpoint in product(hosts, endpoints):
-            try:
-                response = await client.get(base_url.format(host, endpoint))
-                if response.status_code != 200:
-                    base_logger.error(
-                        'Health check "{}" on {} failed '
-                        'with status code {}',
-                        host,
-                        endpoint,
-                        response.status_code,
-                    )
-                    result[host][
-                        endpoint
-                    ] = f'Failed (status code: {response.status_code})'
-                    continue
-                base_logger.info(
-                    'Health check "{}" on {} is successful', host, endpoint
-                )
-                result[host][endpoint] = 'Successful'
-            except Exception as e:  # pylint: disable=broad-except
-                base_logger.error(
-                    'Health check "{}" on {} failed (url "{}"): {}',
-                    host,
-                    endpoint,
-                    base_url.format(host, endpoint),
-                    e,
-                )
-                result[host][endpoint] = (
-                    f'Failed (url "{base_url.format(host, endpoint)}"): '
-                    f'{e}'
-                )
+    for (host, endpoint), status in zip(probes, statuses):
+        result[host][endpoint] = status
 
     try:
-        await send.send_ping_status(result)
+        await send.send_ping_status(result, latency_history.percentiles())
     except Exception as exc:  # pylint: disable=broad-except
         base_logger.error('Failed to send ping status: {}', exc)
         await send.send_traceback_message_safe(
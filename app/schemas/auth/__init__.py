@@ -1,8 +1,10 @@
 from .token import Token, TokenData
+from .user import Principal
 from .user import User as UserSchema
 
 
 __all__ = [
+    'Principal',
     'Token',
     'TokenData',
     'UserSchema',
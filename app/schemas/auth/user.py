@@ -1,4 +1,5 @@
 from datetime import datetime
+from uuid import UUID
 
 from pydantic import BaseModel
 from pydantic_settings import SettingsConfigDict
@@ -12,3 +13,17 @@ class User(BaseModel):
     model_config = SettingsConfigDict(
         from_attributes=True,
     )
+
+
+class Principal(User):
+    """
+    Read-only snapshot of authenticated user,
+    one object is shared by requests through principal cache.
+    """
+
+    id: UUID
+
+    model_config = SettingsConfigDict(
+        from_attributes=True,
+        frozen=True,
+    )
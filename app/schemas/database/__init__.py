@@ -0,0 +1,7 @@
+from .pool import EnginePool, RolePools
+
+
+__all__ = [
+    'EnginePool',
+    'RolePools',
+]
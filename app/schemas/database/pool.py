@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class EnginePool(BaseModel):
+    pool_size: int
+    max_overflow: int = 0
+
+    @property
+    def max_connections(self) -> int:
+        return self.pool_size + self.max_overflow
+
+
+class RolePools(BaseModel):
+    processes: int = 1  # 0 means one process per CPU core
+    sync_engine: EnginePool
+    async_engine: EnginePool
@@ -0,0 +1,7 @@
+from .stats import ErrorStats, ErrorStatsResponse
+
+
+__all__ = [
+    'ErrorStats',
+    'ErrorStatsResponse',
+]
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ErrorStats(BaseModel):
+    fingerprint: str
+    title: str
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+    request_ids: list[str]
+
+
+class ErrorStatsResponse(BaseModel):
+    errors: list[ErrorStats]
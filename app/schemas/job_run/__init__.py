@@ -0,0 +1,10 @@
+from .run import JobRun, JobRunsResponse
+from .stats import JobStats, JobStatsResponse
+
+
+__all__ = [
+    'JobRun',
+    'JobRunsResponse',
+    'JobStats',
+    'JobStatsResponse',
+]
@@ -0,0 +1,23 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobRun(BaseModel):
+    id: UUID
+    name: str
+    dt_started: datetime
+    dt_finished: datetime
+    duration: float
+    status: str
+    log_id: str
+    error_fingerprint: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobRunsResponse(BaseModel):
+    runs: list[JobRun]
+    # Pass as `cursor` to get the next (older) page
+    next_cursor: str | None
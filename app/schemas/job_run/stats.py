@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class JobStats(BaseModel):
+    name: str
+    day: datetime
+    count: int
+    errors: int
+    p50: float
+    p95: float
+    max: float
+
+
+class JobStatsResponse(BaseModel):
+    stats: list[JobStats]
@@ -0,0 +1,7 @@
+from .stats import QueryStats, QueryStatsResponse
+
+
+__all__ = [
+    'QueryStats',
+    'QueryStatsResponse',
+]
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class QueryStats(BaseModel):
+    fingerprint: str
+    statement: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    rows: int
+
+
+class QueryStatsResponse(BaseModel):
+    queries: list[QueryStats]
@@ -1,6 +1,6 @@
 import typing as tp
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class JobConfig(BaseModel):
@@ -14,4 +14,12 @@ class JobInfo(BaseModel):
     minutes: int | None = None
     hours: int | None = None
     hour: int | None = None
+    # Job is cancelled when it runs longer, enforced by the wrapper
+    timeout: float | None = Field(None, gt=0)
+    # Where the job function runs, the default is the scheduler loop
+    executor: tp.Literal['asyncio', 'thread', 'process'] | None = None
+    max_instances: int | None = Field(None, ge=1)
+    coalesce: bool | None = None
+    misfire_grace_time: int | None = Field(None, ge=1)
+    jitter: int | None = Field(None, ge=0)
     config: JobConfig | None = None
@@ -0,0 +1,94 @@
+import gc
+import multiprocessing
+import typing as tp
+
+from fastapi import FastAPI
+from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+
+from app.config import DefaultSettings, reload_settings, setup_reload_signal
+from app.metrics import clear_multiprocess_dir, mark_process_dead
+from app.utils.common import get_hostname
+
+
+class UvicornWorker(BaseUvicornWorker):
+    CONFIG_KWARGS = {'loop': 'uvloop', 'http': 'httptools'}
+
+    def init_signals(self) -> None:
+        super().init_signals()
+        # Base worker resets SIGHUP to default, which kills the worker
+        setup_reload_signal()
+
+
+class ProductionServer(BaseApplication):  # pylint: disable=abstract-method
+    """
+    Gunicorn pre-fork server with uvicorn workers.
+
+    Application is loaded once in master process and shared
+    with forked workers (copy-on-write), SIGTERM stops accepting
+    new connections and waits for running requests to finish.
+    """
+
+    def __init__(
+        self, application: FastAPI, options: dict[str, tp.Any]
+    ) -> None:
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)  # type: ignore
+
+    def load(self) -> FastAPI:
+        return self.application
+
+
+def _freeze_gc(_: BaseApplication) -> None:
+    # Move all objects created by master to permanent generation,
+    # so garbage collector in workers doesn't touch (and copy) their pages.
+    gc.freeze()
+
+
+def _reload_settings(_: Arbiter) -> None:
+    # Master handles SIGHUP by re-forking workers, with preloaded
+    # application they would inherit settings cached before reload
+    reload_settings()
+
+
+def _clear_metrics(_: Arbiter) -> None:
+    clear_multiprocess_dir()
+
+
+def _mark_worker_dead(_: Arbiter, worker: Worker) -> None:
+    # Drop live gauges of exited worker from merged metrics
+    mark_process_dead(worker.pid)
+
+
+def get_workers_count(settings: DefaultSettings) -> int:
+    return settings.APP_WORKERS or multiprocessing.cpu_count()
+
+
+def get_server_options(settings: DefaultSettings) -> dict[str, tp.Any]:
+    host = get_hostname(settings.APP_HOST) or '0.0.0.0'
+    return {
+        'bind': f'{host}:{settings.APP_PORT}',
+        'workers': get_workers_count(settings),
+        'worker_class': f'{__name__}.UvicornWorker',
+        'preload_app': True,
+        'graceful_timeout': settings.APP_GRACEFUL_TIMEOUT,
+        'logconfig': 'log.ini',
+        'accesslog': None,
+        'when_ready': _freeze_gc,
+        'on_starting': _clear_metrics,
+        'on_reload': _reload_settings,
+        'child_exit': _mark_worker_dead,
+    }
+
+
+def run_production(
+    application: FastAPI, settings: DefaultSettings
+) -> None:  # pragma: no cover
+    ProductionServer(application, get_server_options(settings)).run()
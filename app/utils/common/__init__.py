@@ -1,10 +1,22 @@
+from .context import (
+    on_scheduler_loop,
+    request_id_context,
+    scheduler_loop_context,
+)
 from .datetime_utils import get_datetime_msk_tz
 from .hostname import get_hostname
 from .password import hash_password
+from .response import ModelResponse
+from .statistics import percentile
 
 
 __all__ = [
+    'ModelResponse',
     'get_hostname',
     'hash_password',
+    'percentile',
     'get_datetime_msk_tz',
+    'request_id_context',
+    'on_scheduler_loop',
+    'scheduler_loop_context',
 ]
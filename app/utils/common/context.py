@@ -0,0 +1,29 @@
+import asyncio
+import typing as tp
+from contextvars import ContextVar
+
+
+T = tp.TypeVar('T')
+
+# Id of the request being handled, set by `UniqueIDMiddleware`
+request_id_context: ContextVar[str | None] = ContextVar(
+    'request_id', default=None
+)
+# Set for scheduler jobs run on their own loop in pool threads
+scheduler_loop_context: ContextVar[
+    asyncio.AbstractEventLoop | None
+] = ContextVar('scheduler_loop', default=None)
+
+
+async def on_scheduler_loop(coro: tp.Coroutine[tp.Any, tp.Any, T]) -> T:
+    """
+    Await coroutine on the scheduler loop. Jobs run in pool threads
+    use it for clients created there (bot session), elsewhere
+    the coroutine is awaited as is.
+    """
+    loop = scheduler_loop_context.get()
+    if loop is None or loop is asyncio.get_running_loop():
+        return await coro
+    return await asyncio.wrap_future(
+        asyncio.run_coroutine_threadsafe(coro, loop)
+    )
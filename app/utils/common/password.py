@@ -1,6 +1,7 @@
 from app.config import get_settings
+from app.utils.password import get_crypt_context
 
 
 def hash_password(password: str) -> str:
     settings = get_settings()
-    return settings.PWD_CONTEXT.hash(password)
+    return get_crypt_context(settings.PASSWORD_HASH_ROUNDS).hash(password)
@@ -0,0 +1,21 @@
+import typing as tp
+
+import pydantic_core
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(ORJSONResponse):
+    """
+    Response for a model that is already validated.
+
+    FastAPI returns `Response` objects as is, without validating
+    and serializing them against `response_model`, so the model is
+    serialized once, straight to JSON bytes by pydantic-core.
+    Keep `response_model` in route decorator for OpenAPI schema.
+    """
+
+    def render(self, content: tp.Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return pydantic_core.to_json(content)
+        return super().render(content)
@@ -0,0 +1,13 @@
+import math
+import typing as tp
+
+
+def percentile(values: tp.Sequence[float], q: float) -> float | None:
+    """
+    Nearest-rank percentile of `values`, `q` is between 0 and 100.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
@@ -0,0 +1,9 @@
+from .aggregator import ErrorAggregator, get_error_fingerprint
+from .report import ErrorReport
+
+
+__all__ = [
+    'ErrorAggregator',
+    'ErrorReport',
+    'get_error_fingerprint',
+]
@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import html
+import traceback
+import typing as tp
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from app import constants
+from app.utils.common import get_datetime_msk_tz
+
+
+def get_error_fingerprint(exc: BaseException) -> str:
+    """
+    Hash of exception type and traceback frames (file, function, line).
+    Exception message is left out, so errors that differ only
+    in ids or values in the message share a fingerprint.
+    """
+    # walk_tb doesn't read source files unlike extract_tb
+    key = '|'.join(
+        [
+            f'{type(exc).__module__}.{type(exc).__qualname__}',
+            *(
+                f'{frame.f_code.co_filename}:{frame.f_code.co_name}:{lineno}'
+                for frame, lineno in traceback.walk_tb(exc.__traceback__)
+            ),
+        ]
+    )
+    return hashlib.sha1(  # nosec
+        key.encode(), usedforsecurity=False
+    ).hexdigest()[:16]
+
+
+class ErrorStats:
+    def __init__(self, title: str, sample_size: int) -> None:
+        self.title = title
+        self.count = 0
+        self.reported_count = 0
+        self.first_seen = get_datetime_msk_tz()
+        self.last_seen = self.first_seen
+        # The most recent ones
+        self.request_ids: deque[str] = deque(maxlen=sample_size)
+
+    def add(self, request_id: str | None) -> None:
+        self.count += 1
+        self.last_seen = get_datetime_msk_tz()
+        if request_id:
+            self.request_ids.append(request_id)
+
+    def is_quiet(self, period: float) -> bool:
+        return (
+            get_datetime_msk_tz() - self.last_seen
+        ).total_seconds() > period
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        return {
+            'title': self.title,
+            'count': self.count,
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen,
+            'request_ids': list(self.request_ids),
+        }
+
+
+def _format_dt(dt: datetime) -> str:
+    return dt.strftime(constants.dt_format)
+
+
+class ErrorAggregator:
+    """
+    Groups exceptions by fingerprint.
+
+    The first occurrence of an error is reported at once (`record`
+    returns True), repeats are only counted and reported with
+    `notify` as one summary per fingerprint at the end of `window`.
+    An error not seen for `quiet_period` seconds is counted anew
+    and reported at once again.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        notify: tp.Callable[[str], None],
+        window: float,
+        max_size: int,
+        sample_size: int,
+        quiet_period: float,
+    ) -> None:
+        self.notify = notify
+        self.window = window
+        self.max_size = max_size
+        self.sample_size = sample_size
+        self.quiet_period = quiet_period
+        self._errors: OrderedDict[str, ErrorStats] = OrderedDict()
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_loop: asyncio.AbstractEventLoop | None = None
+
+    def record(
+        self, exc: BaseException, request_id: str | None = None
+    ) -> bool:
+        """
+        Count exception, return whether it has to be reported now.
+        """
+        fingerprint = get_error_fingerprint(exc)
+        stats = self._errors.get(fingerprint)
+        if stats is None or stats.is_quiet(self.quiet_period):
+            stats = self._errors[fingerprint] = ErrorStats(
+                f'{type(exc).__name__}: {exc}'[:200], self.sample_size
+            )
+            while len(self._errors) > self.max_size:
+                self._errors.popitem(last=False)
+        self._errors.move_to_end(fingerprint)
+        stats.add(request_id)
+        if stats.count == 1:
+            stats.reported_count = 1
+            return True
+        self._schedule_flush()
+        return False
+
+    def stats(self) -> dict[str, dict[str, tp.Any]]:
+        return {
+            fingerprint: stats.to_dict()
+            for fingerprint, stats in reversed(self._errors.items())
+        }
+
+    def clear(self) -> None:
+        self._errors.clear()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def flush(self) -> None:
+        """
+        Report errors that repeated since the last report.
+        """
+        self._flush_handle = None
+        for fingerprint, stats in self._errors.items():
+            repeats = stats.count - stats.reported_count
+            if repeats <= 0:
+                continue
+            stats.reported_count = stats.count
+            self.notify(
+                f'Error {fingerprint} repeated {repeats} times '
+                f'({stats.count} in total): '
+                f'{html.escape(stats.title, quote=False)}\n'
+                f'First seen: {_format_dt(stats.first_seen)}, '
+                f'last seen: {_format_dt(stats.last_seen)}\n'
+                f'Request ids: {", ".join(stats.request_ids) or "-"}'
+            )
+
+    def _schedule_flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Timer of another (closed) event loop would never fire
+        if self._flush_handle is not None and self._flush_loop is loop:
+            return
+        self._flush_loop = loop
+        self._flush_handle = loop.call_later(self.window, self.flush)
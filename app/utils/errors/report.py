@@ -0,0 +1,77 @@
+import traceback
+
+from starlette.types import Scope
+from uvicorn.protocols import utils
+
+
+REPORT_HEADERS = frozenset(
+    {
+        b'host',
+        b'user-agent',
+        b'referer',
+        b'content-type',
+        b'content-length',
+        b'x-forwarded-for',
+        b'x-real-ip',
+    }
+)
+MAX_HEADER_LENGTH = 200
+
+
+class ErrorReport:
+    """
+    What is kept of a failed request until the report is sent:
+    a few whitelisted request fields and the traceback without
+    frame locals. Text is formatted by `message` and `code`,
+    off the request path.
+    """
+
+    __slots__ = (
+        'project_name',
+        'method',
+        'path',
+        'request_id',
+        'client',
+        'headers',
+        'traceback',
+    )
+
+    def __init__(
+        self, project_name: str, scope: Scope, exc: BaseException
+    ) -> None:
+        self.project_name = project_name
+        self.method: str = scope.get('method', '')
+        self.path: str = scope.get('path', '')
+        self.request_id: str | None = scope.get('request_id')
+        self.client = utils.get_client_addr(scope)  # type: ignore
+        self.headers = [
+            (
+                name.decode('latin-1'),
+                value[:MAX_HEADER_LENGTH].decode('latin-1'),
+            )
+            for name, value in scope.get('headers', ())
+            if name in REPORT_HEADERS
+        ]
+        # Source lines are read when `code` is formatted
+        self.traceback = traceback.TracebackException.from_exception(
+            exc, lookup_lines=False
+        )
+
+    @property
+    def message(self) -> str:
+        lines = [
+            f'*Exception occurred on {self.project_name}*:',
+            'REQUEST:',
+            f'\t- method: {self.method}',
+            f'\t- path: {self.path}',
+            f'\t- request_id: {self.request_id}',
+            f'\t- client: {self.client}',
+            *(f'\t- {name}: {value}' for name, value in self.headers),
+            '',
+            f'EXCEPTION: {"".join(self.traceback.format_exception_only())}',
+        ]
+        return '\n'.join(lines)
+
+    @property
+    def code(self) -> str:
+        return ''.join(self.traceback.format())
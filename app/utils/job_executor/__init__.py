@@ -0,0 +1,9 @@
+from .pool import PROCESS_CONTEXT, JobExecutor, run_job, shutdown_executors
+
+
+__all__ = [
+    'PROCESS_CONTEXT',
+    'JobExecutor',
+    'run_job',
+    'shutdown_executors',
+]
@@ -0,0 +1,193 @@
+import asyncio
+import functools
+import multiprocessing
+import threading
+import typing as tp
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+import loguru
+
+from app.bot_helper import bot, send
+from app.config import get_settings
+from app.database.connection import SessionManager
+from app.utils.common import scheduler_loop_context
+
+
+JobExecutor = tp.Literal['asyncio', 'thread', 'process']
+JobFunc = tp.Callable[..., tp.Coroutine[tp.Any, tp.Any, tp.Any]]
+# Pool workers start clean, without connections of the scheduler.
+# Enqueued loguru sinks must be added with the same context
+PROCESS_CONTEXT = 'spawn'
+
+_pools: dict[str, Executor] = {}
+# Replaced in pool processes by the scheduler logger, see `_init_worker`
+_logger = loguru.logger
+
+
+def _init_worker(logger: 'loguru.Logger') -> None:
+    # pylint: disable=global-statement
+    global _logger
+    _logger = logger
+
+
+def _get_pool(executor: JobExecutor) -> Executor:
+    pool = _pools.get(executor)
+    if pool is not None:
+        return pool
+    settings = get_settings()
+    if executor == 'thread':
+        pool = ThreadPoolExecutor(
+            settings.SCHEDULER_THREAD_POOL_SIZE, thread_name_prefix='job'
+        )
+    else:
+        # Workers get the logger while spawned, records go to
+        # scheduler sinks through their queues
+        pool = ProcessPoolExecutor(
+            settings.SCHEDULER_PROCESS_POOL_SIZE,
+            mp_context=multiprocessing.get_context(PROCESS_CONTEXT),
+            initializer=_init_worker,
+            initargs=(loguru.logger,),
+        )
+    _pools[executor] = pool
+    return pool
+
+
+class ThreadRun:
+    """
+    Task of a job run on its own loop in a pool thread,
+    cancelled from the scheduler loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[tp.Any] | None = None
+        self._cancelled = False
+
+    def start(self) -> None:
+        """
+        Called by the run task in the pool thread.
+        """
+        task = asyncio.current_task()
+        assert task is not None  # nosec
+        with self._lock:
+            self._loop, self._task = task.get_loop(), task
+            if self._cancelled:
+                task.cancel()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            if self._loop is None or self._task is None:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                # Run has already finished, its loop is closed
+                pass
+
+
+def _run_thread_job(  # pylint: disable=too-many-arguments
+    func: JobFunc,
+    log_id: str,
+    args: tuple[tp.Any, ...],
+    kwargs: dict[str, tp.Any],
+    scheduler_loop: asyncio.AbstractEventLoop,
+    run: ThreadRun,
+) -> tp.Any:
+    async def _run() -> tp.Any:
+        scheduler_loop_context.set(scheduler_loop)
+        run.start()
+        try:
+            return await func(
+                *args, base_logger=_logger.bind(uuid=log_id), **kwargs
+            )
+        finally:
+            await SessionManager().dispose_job_engine()
+
+    return asyncio.run(_run())
+
+
+async def _close_worker_resources() -> None:
+    # Bound to the loop of the run, the next run gets new ones
+    await send.dispatcher.close()
+    await bot.bot.session.close()
+    await SessionManager().async_engine.dispose()
+
+
+def _run_process_job(
+    func: JobFunc,
+    log_id: str,
+    args: tuple[tp.Any, ...],
+    kwargs: dict[str, tp.Any],
+) -> tp.Any:
+    async def _run() -> tp.Any:
+        try:
+            return await func(
+                *args, base_logger=_logger.bind(uuid=log_id), **kwargs
+            )
+        finally:
+            await _close_worker_resources()
+
+    return asyncio.run(_run())
+
+
+async def run_job(
+    executor: JobExecutor,
+    func: JobFunc,
+    log_id: str,
+    *args: tp.Any,
+    **kwargs: tp.Any,
+) -> tp.Any:
+    """
+    Run job function on the scheduler loop, or on its own loop
+    in a bounded thread or process pool. Job gets `base_logger`
+    bound to `log_id` wherever it runs.
+
+    Notifications and bot requests of thread jobs are sent by
+    the scheduler loop, a thread job gets its own database engine.
+    Process jobs get their own clients. Both are closed after each run.
+    Function run in process pool must be importable by name.
+
+    When cancelled (job timeout), a thread job is cancelled on its
+    loop, a process job can't be interrupted. Either way this returns
+    only when the pool run ends, so the job instance stays running
+    for `max_instances`.
+    """
+    if executor == 'asyncio':
+        return await func(
+            *args, base_logger=loguru.logger.bind(uuid=log_id), **kwargs
+        )
+    run = ThreadRun()
+    if executor == 'thread':
+        call = functools.partial(
+            _run_thread_job,
+            func,
+            log_id,
+            args,
+            kwargs,
+            asyncio.get_running_loop(),
+            run,
+        )
+    else:
+        call = functools.partial(_run_process_job, func, log_id, args, kwargs)
+    pool_future = _get_pool(executor).submit(call)
+    future = asyncio.wrap_future(pool_future)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # Not started yet, or stopped at the next await of the job
+        pool_future.cancel()
+        run.cancel()
+        await asyncio.wait([future])
+        raise
+
+
+def shutdown_executors() -> None:
+    for pool in _pools.values():
+        pool.shutdown(wait=True, cancel_futures=True)
+    _pools.clear()
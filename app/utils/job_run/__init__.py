@@ -0,0 +1,17 @@
+from .cursor import decode_cursor, encode_cursor
+from .database import get_job_runs, get_job_stats
+from .logs import JobLogBuffer, has_log_id, job_logs
+from .recorder import record_job_run, wait_job_runs
+
+
+__all__ = [
+    'JobLogBuffer',
+    'decode_cursor',
+    'encode_cursor',
+    'get_job_runs',
+    'get_job_stats',
+    'has_log_id',
+    'job_logs',
+    'record_job_run',
+    'wait_job_runs',
+]
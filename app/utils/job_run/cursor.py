@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(dt_started: datetime, run_id: UUID) -> str:
+    return base64.urlsafe_b64encode(
+        f'{dt_started.isoformat()}|{run_id}'.encode()
+    ).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Raises ValueError for a malformed cursor.
+    """
+    try:
+        dt_started, run_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        )
+    except Exception as exc:
+        raise ValueError(f'Invalid cursor: {cursor}') from exc
+    return datetime.fromisoformat(dt_started), UUID(run_id)
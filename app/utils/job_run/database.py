@@ -0,0 +1,62 @@
+import typing as tp
+from datetime import datetime
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import JobRun
+
+
+async def get_job_runs(
+    session: AsyncSession,
+    limit: int,
+    name: str | None = None,
+    before: tuple[datetime, UUID] | None = None,
+) -> tp.Sequence[JobRun]:
+    """
+    Newest runs first, `before` is (dt_started, id) of the last run
+    of the previous page.
+    """
+    query = sa.select(JobRun).order_by(
+        JobRun.dt_started.desc(), JobRun.id.desc()
+    )
+    if name is not None:
+        query = query.where(JobRun.name == name)
+    if before is not None:
+        query = query.where(
+            sa.tuple_(JobRun.dt_started, JobRun.id)
+            < sa.tuple_(sa.literal(before[0]), sa.literal(before[1]))
+        )
+    return (await session.scalars(query.limit(limit))).all()
+
+
+async def get_job_stats(
+    session: AsyncSession, since: datetime, name: str | None = None
+) -> tp.Sequence[sa.Row[tp.Any]]:
+    """
+    Count, errors and duration percentiles per job and day.
+    """
+    # pylint: disable=not-callable
+    day = sa.func.date_trunc('day', JobRun.dt_started)
+    query = (
+        sa.select(
+            JobRun.name,
+            day.label('day'),
+            sa.func.count().label('count'),
+            sa.func.count().filter(JobRun.status != 'ok').label('errors'),
+            sa.func.percentile_cont(0.5)
+            .within_group(JobRun.duration)
+            .label('p50'),
+            sa.func.percentile_cont(0.95)
+            .within_group(JobRun.duration)
+            .label('p95'),
+            sa.func.max(JobRun.duration).label('max'),
+        )
+        .where(JobRun.dt_started >= since)
+        .group_by(JobRun.name, day)
+        .order_by(JobRun.name, day)
+    )
+    if name is not None:
+        query = query.where(JobRun.name == name)
+    return (await session.execute(query)).all()
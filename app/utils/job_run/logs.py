@@ -0,0 +1,67 @@
+import threading
+
+import loguru
+
+from app.config import DefaultSettings, get_settings, on_settings_reload
+
+
+TRUNCATED_MESSAGE = '... log truncated\n'
+
+
+class JobLogBuffer:
+    """
+    One loguru sink for logs of all job runs.
+
+    Serialized records with `uuid` of a run started with `start`
+    are kept in memory (up to `max_size` characters per run) until
+    the run logs are taken with `pop`. Other records are dropped.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._buffers: dict[str, list[str]] = {}
+        self._sizes: dict[str, int] = {}
+        # Sink is called from loguru queue thread
+        self._lock = threading.Lock()
+
+    def __contains__(self, log_id: str) -> bool:
+        return log_id in self._buffers
+
+    def start(self, log_id: str) -> None:
+        with self._lock:
+            self._buffers[log_id] = []
+            self._sizes[log_id] = 0
+
+    def write(self, message: 'loguru.Message') -> None:
+        log_id: str = message.record['extra'].get('uuid', '')
+        with self._lock:
+            buffer = self._buffers.get(log_id)
+            if buffer is None:
+                return
+            size = self._sizes[log_id]
+            if size > self.max_size:
+                return
+            size += len(message)
+            self._sizes[log_id] = size
+            buffer.append(
+                TRUNCATED_MESSAGE if size > self.max_size else message
+            )
+
+    def pop(self, log_id: str) -> str:
+        with self._lock:
+            self._sizes.pop(log_id, None)
+            return ''.join(self._buffers.pop(log_id, ()))
+
+
+def has_log_id(record: 'loguru.Record') -> bool:
+    # Stateless: pickled with the logger into process pool workers,
+    # runs are looked up by `write` in the scheduler process
+    return 'uuid' in record['extra']
+
+
+job_logs = JobLogBuffer(get_settings().SCHEDULER_JOB_LOG_SIZE)
+
+
+@on_settings_reload
+def _configure_job_logs(settings: DefaultSettings) -> None:
+    job_logs.max_size = settings.SCHEDULER_JOB_LOG_SIZE
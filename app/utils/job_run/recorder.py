@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import loguru
+
+from app.database.connection import SessionManager
+from app.database.models import JobRun
+
+
+_pending: set[asyncio.Task[None]] = set()
+
+
+async def _write(job_run: JobRun) -> None:
+    try:
+        async with SessionManager().create_async_session() as session:
+            session.add(job_run)
+    except Exception as exc:  # pylint: disable=broad-except
+        loguru.logger.exception('Error while saving job run: {}', exc)
+
+
+def record_job_run(  # pylint: disable=too-many-arguments
+    name: str,
+    dt_started: datetime,
+    duration: float,
+    status: str,
+    log_id: str,
+    error_fingerprint: str | None = None,
+) -> None:
+    """
+    Save job run in background, the job doesn't wait for the database.
+    """
+    task = asyncio.create_task(
+        _write(
+            JobRun(
+                name=name,
+                dt_started=dt_started,
+                dt_finished=dt_started + timedelta(seconds=duration),
+                duration=duration,
+                status=status,
+                log_id=log_id,
+                error_fingerprint=error_fingerprint,
+            )
+        )
+    )
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def wait_job_runs() -> None:
+    """
+    Wait until runs recorded so far are saved.
+    """
+    if _pending:
+        await asyncio.gather(*_pending)
@@ -0,0 +1,12 @@
+from .hasher import (
+    PasswordHasher,
+    PasswordHasherOverloadedError,
+    get_crypt_context,
+)
+
+
+__all__ = [
+    'PasswordHasher',
+    'PasswordHasherOverloadedError',
+    'get_crypt_context',
+]
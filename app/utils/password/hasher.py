@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import typing as tp
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+from passlib.context import CryptContext
+
+from app.config import DefaultSettings, get_settings, on_settings_reload
+
+
+class PasswordHasherOverloadedError(Exception):
+    pass
+
+
+@functools.lru_cache
+def get_crypt_context(rounds: int) -> CryptContext:
+    """
+    Bcrypt context that marks hashes with any other cost as outdated.
+    """
+    return CryptContext(
+        schemes=['bcrypt'],
+        deprecated='auto',
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def _hash(password: str, rounds: int) -> str:
+    return get_crypt_context(rounds).hash(password)
+
+
+def _verify_and_update(
+    password: str, hashed_password: str, rounds: int
+) -> tuple[bool, str | None]:
+    return get_crypt_context(rounds).verify_and_update(
+        password, hashed_password
+    )
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a thread or process pool, so it doesn't block
+    the event loop. At most `PASSWORD_HASHER_WORKERS` hashes run
+    at once and at most `PASSWORD_HASHER_QUEUE_SIZE` wait for a worker,
+    calls above that fail fast with `PasswordHasherOverloadedError`.
+    """
+
+    EXECUTORS: dict[
+        str, type[ThreadPoolExecutor] | type[ProcessPoolExecutor]
+    ] = {
+        'thread': ThreadPoolExecutor,
+        'process': ProcessPoolExecutor,
+    }
+
+    executor: Executor | None
+    pending: int
+
+    def __new__(cls) -> 'PasswordHasher':
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(PasswordHasher, cls).__new__(cls)
+            cls.instance.executor = None
+            cls.instance.pending = 0
+            cls.instance.refresh()
+        return cls.instance  # noqa
+
+    def refresh(self) -> None:
+        settings = get_settings()
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        self.rounds = settings.PASSWORD_HASH_ROUNDS
+        self.max_pending = (
+            settings.PASSWORD_HASHER_WORKERS
+            + settings.PASSWORD_HASHER_QUEUE_SIZE
+        )
+        self.executor = self.EXECUTORS[settings.PASSWORD_HASHER_EXECUTOR](
+            max_workers=settings.PASSWORD_HASHER_WORKERS
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """
+        Verify password, second item is a new hash
+        if the stored one was made with another cost.
+        """
+        return await self._run(
+            _verify_and_update, password, hashed_password, self.rounds
+        )
+
+    async def _run(
+        self, func: tp.Callable[..., tp.Any], *args: tp.Any
+    ) -> tp.Any:
+        if self.pending >= self.max_pending:
+            raise PasswordHasherOverloadedError(
+                f'Too many pending password hashes: {self.pending}'
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, func, *args
+            )
+        finally:
+            self.pending -= 1
+
+
+@on_settings_reload
+def _refresh_password_hasher(_: DefaultSettings) -> None:
+    if hasattr(PasswordHasher, 'instance'):
+        PasswordHasher.instance.refresh()
@@ -1,3 +1,4 @@
+from .cache import principal_cache
 from .database import get_user
 from .service import (
     authenticate_user,
@@ -13,4 +14,5 @@ __all__ = [
     'verify_password',
     'get_current_user',
     'get_user',
+    'principal_cache',
 ]
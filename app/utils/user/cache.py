@@ -0,0 +1,142 @@
+import time
+from collections import OrderedDict
+
+import sqlalchemy as sa
+
+from app.config import DefaultSettings, get_settings, on_settings_reload
+from app.database.models import User
+from app.metrics import PRINCIPAL_CACHE_EVICTIONS, PRINCIPAL_CACHE_LOOKUPS
+from app.schemas.auth import Principal
+
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of users resolved from bearer tokens.
+
+    Users are kept as immutable `Principal` snapshots, the same object
+    is handed to concurrent requests. Entry lives for `ttl` seconds or
+    until the token expires, whichever comes first, and is dropped when
+    the user is changed through ORM session: by flush of a `User`
+    object or by `update(User)` / `delete(User)` statement executed
+    with a session (the latter drops all entries). Statements executed
+    on a connection directly (Core, raw SQL) are not seen.
+
+    Every worker process keeps its own cache and only sees changes
+    made through its own sessions: other workers keep a changed or
+    deleted user for up to `ttl` seconds (`PRINCIPAL_CACHE_TTL`).
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[
+            str, tuple[Principal, float]
+        ] = OrderedDict()
+        self._tokens_by_username: dict[str, set[str]] = {}
+
+    def get(self, token: str) -> Principal | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            self._miss()
+            return None
+        user, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(token)
+            self._miss()
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        PRINCIPAL_CACHE_LOOKUPS.labels('hit').inc()
+        return user
+
+    def set(
+        self, token: str, user: Principal, token_exp: float | None = None
+    ) -> None:
+        """
+        Put user to cache, `token_exp` is token expiration unix timestamp.
+        """
+        if self.max_size <= 0:
+            return
+        now = time.monotonic()
+        expires_at = now + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, now + token_exp - time.time())
+        if token in self._entries:
+            self._remove(token)
+        self._entries[token] = (user, expires_at)
+        self._tokens_by_username.setdefault(user.username, set()).add(token)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+            PRINCIPAL_CACHE_EVICTIONS.inc()
+
+    def invalidate(self, username: str) -> None:
+        for token in self._tokens_by_username.pop(username, set()):
+            self._entries.pop(token, None)
+
+    def invalidate_all(self) -> None:
+        self._entries.clear()
+        self._tokens_by_username.clear()
+
+    def clear(self) -> None:
+        self.invalidate_all()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _miss(self) -> None:
+        self.misses += 1
+        PRINCIPAL_CACHE_LOOKUPS.labels('miss').inc()
+
+    def _remove(self, token: str) -> None:
+        user, _ = self._entries.pop(token)
+        tokens = self._tokens_by_username.get(user.username)
+        if tokens is None:
+            return
+        tokens.discard(token)
+        if not tokens:
+            del self._tokens_by_username[user.username]
+
+
+_settings = get_settings()
+principal_cache = PrincipalCache(
+    max_size=_settings.PRINCIPAL_CACHE_SIZE,
+    ttl=_settings.PRINCIPAL_CACHE_TTL,
+)
+
+
+@on_settings_reload
+def _configure_principal_cache(settings: DefaultSettings) -> None:
+    # Entries over the new size are evicted on next `set`
+    principal_cache.max_size = settings.PRINCIPAL_CACHE_SIZE
+    principal_cache.ttl = settings.PRINCIPAL_CACHE_TTL
+
+
+@sa.event.listens_for(User, 'after_update')
+@sa.event.listens_for(User, 'after_delete')
+def _invalidate_user(
+    _mapper: sa.orm.Mapper,  # type: ignore
+    _connection: sa.Connection,
+    target: User,
+) -> None:
+    history = sa.inspect(target).attrs.username.history  # type: ignore
+    for username in {target.username, *(history.deleted or ())}:
+        principal_cache.invalidate(username)  # type: ignore
+
+
+@sa.event.listens_for(sa.orm.Session, 'do_orm_execute')
+def _invalidate_users(orm_execute_state: sa.orm.ORMExecuteState) -> None:
+    # Bulk statements skip mapper events and their rows are not known
+    if (
+        orm_execute_state.is_update or orm_execute_state.is_delete
+    ) and orm_execute_state.bind_mapper is sa.inspect(User):
+        principal_cache.invalidate_all()
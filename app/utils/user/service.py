@@ -8,8 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
 from app.database.connection import SessionManager
 from app.database.models import User
-from app.schemas.auth import TokenData
+from app.schemas.auth import Principal, TokenData
+from app.utils.password import PasswordHasher
 
+from .cache import principal_cache
 from .database import get_user
 
 
@@ -21,8 +23,13 @@ async def authenticate_user(
     user = await get_user(session, username)
     if not user:
         return None
-    if not verify_password(password, user.password):  # type: ignore
+    is_valid, new_hash = await PasswordHasher().verify(
+        password, user.password  # type: ignore
+    )
+    if not is_valid:
         return None
+    if new_hash is not None:
+        user.password = new_hash
     return user
 
 
@@ -55,7 +62,11 @@ def verify_password(
 
 async def get_current_user(
     token: str = Depends(get_settings().OAUTH2_SCHEME),
-) -> User:
+    session: AsyncSession = Depends(SessionManager().get_async_session),
+) -> Principal:
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail='Could not validate credentials',
@@ -73,8 +84,9 @@ async def get_current_user(
         token_data = TokenData(username=username)
     except JWTError as exc:
         raise credentials_exception from exc
-    async with SessionManager().create_async_session() as session:
-        user = await get_user(session, username=token_data.username)
+    user = await get_user(session, username=token_data.username)
     if user is None:
         raise credentials_exception
-    return user
+    principal = Principal.model_validate(user)
+    principal_cache.set(token, principal, token_exp=payload.get('exp'))
+    return principal
@@ -3,7 +3,7 @@ from pathlib import Path
 import pytest
 
 from app.bot_helper import send
-from app.config import get_settings
+from app.config import get_settings, override_settings
 
 
 pytestmark = pytest.mark.asyncio
@@ -15,7 +15,7 @@ class TestSendDbDumpHandler:
         await send.send_db_dump(tmp_file)
         mock_bot.send_document.assert_called_once()
         assert Path(
-            mock_bot.send_document.call_args[1]['document'].name
+            mock_bot.send_document.call_args[1]['document'].path
         ) == Path(tmp_file)
         assert (
             mock_bot.send_document.call_args[1]['chat_id']
@@ -29,31 +29,23 @@ class TestSendDbDumpHandler:
             mock_bot.send_document.call_args[1]['disable_notification'] is True
         )
 
-    # TODO
-    # async def test_send_db_dump_big_file(
-    #     self, tmp_file, mock_bot, mock_bot_client
-    # ):
-    #     mock_bot.send_document = AsyncMock(
-    #         side_effect=aiogram.exceptions.TelegramNetworkError(
-    #             'File too large for uploading'
-    #         )
-    #     )
-    #     settings = get_settings()
-    #     await send.send_db_dump(tmp_file)
-    #     mock_bot.send_document.assert_called_once()
-    #     mock_bot_client.send_document.assert_called_once()
-    #     assert Path(
-    #         mock_bot.send_document.call_args[1]['document'].name
-    #     ) == Path(tmp_file)
-    #     assert (
-    #         mock_bot.send_document.call_args[1]['chat_id']
-    #         == settings.TG_DB_DUMP_CHAT_ID
-    #     )
-    #     assert (
-    #         mock_bot.send_document.call_args[1]['caption']
-    #         == settings.PROJECT_NAME
-    #     )
-    #     assert (
-    #         mock_bot.send_document
-    #         .call_args[1]['disable_notification'] is True
-    #     )
+    async def test_send_db_dump_big_file(self, tmp_path, mock_bot):
+        dump = tmp_path / 'dump.sql.gz'
+        dump.write_bytes(b'dump' * 100)
+        settings = get_settings().model_copy(
+            update={'TG_UPLOAD_LIMIT': 100, 'TG_UPLOAD_PART_SIZE': 150}
+        )
+        with override_settings(settings):
+            await send.send_db_dump(dump)
+        documents = [
+            call.kwargs['document'].filename
+            for call in mock_bot.send_document.call_args_list
+        ]
+        assert sorted(documents) == [
+            'dump.sql.gz.manifest.json',
+            'dump.sql.gz.part001',
+            'dump.sql.gz.part002',
+            'dump.sql.gz.part003',
+        ]
+        for call in mock_bot.send_document.call_args_list:
+            assert call.kwargs['chat_id'] == settings.TG_DB_DUMP_CHAT_ID
@@ -0,0 +1,177 @@
+import asyncio
+import os
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiohttp import web
+
+from app.bot_helper import send
+from app.config import get_settings, override_settings
+from tests.utils import start_bot_api
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class StandInBotAPI:
+    """
+    Bot API server that accepts `sendDocument` and saves documents.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        # Error responses returned for a file before it is accepted
+        self.errors = {}
+
+    async def send_document(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            form = await request.post()
+            # aiogram sends `attach://<field>` and the file in <field>
+            document = form[form['document'].removeprefix('attach://')]
+            errors = self.errors.get(document.filename)
+            if errors:
+                error = errors.pop(0)
+                return web.json_response(error, status=error['error_code'])
+            (self.directory / document.filename).write_bytes(
+                document.file.read()
+            )
+            # Keep the request open, so concurrent uploads overlap
+            await asyncio.sleep(0.05)
+        finally:
+            self.in_flight -= 1
+        return web.json_response(
+            {
+                'ok': True,
+                'result': {
+                    'message_id': 1,
+                    'date': 0,
+                    'chat': {'id': int(form['chat_id']), 'type': 'private'},
+                },
+            }
+        )
+
+
+@pytest.fixture(name='bot_api')
+async def bot_api_fixture(tmp_path, mocker):
+    received = tmp_path / 'received'
+    received.mkdir()
+    api = StandInBotAPI(received)
+    application = web.Application(client_max_size=10 * 1024 * 1024)
+    application.router.add_post('/bot{token}/sendDocument', api.send_document)
+    runner, bot = await start_bot_api(application)
+    mocker.patch('app.bot_helper.bot.bot', bot)
+    yield api
+    await bot.session.close()
+    await runner.cleanup()
+
+
+@pytest.fixture(name='upload_settings')
+def upload_settings_fixture():
+    settings = get_settings().model_copy(
+        update={
+            'TG_UPLOAD_LIMIT': 64 * 1024,
+            'TG_UPLOAD_PART_SIZE': 32 * 1024,
+            'TG_UPLOAD_CONCURRENCY': 2,
+        }
+    )
+    with override_settings(settings):
+        yield settings
+
+
+@pytest.mark.usefixtures('upload_settings')
+class TestSendLargeFileHandler:
+    async def test_part_retried_after_flood_control(self, tmp_path, bot_api):
+        dump = tmp_path / 'dump.sql.gz'
+        dump.write_bytes(os.urandom(100 * 1024))
+        bot_api.errors['dump.sql.gz.part002'] = [
+            {
+                'ok': False,
+                'error_code': 429,
+                'description': 'Too Many Requests: retry after 0',
+                'parameters': {'retry_after': 0},
+            }
+        ]
+
+        await send.send_file(dump, 'dump', chat_id='1')
+
+        assert bot_api.requests == 4 + 1 + 1
+        restored = send.assemble_file(
+            bot_api.directory / 'dump.sql.gz.manifest.json'
+        )
+        assert restored.read_bytes() == dump.read_bytes()
+
+    async def test_failed_part_cancels_rest(
+        self, tmp_path, bot_api, upload_settings
+    ):
+        dump = tmp_path / 'dump.sql.gz'
+        dump.write_bytes(os.urandom(100 * 1024))
+        bot_api.errors['dump.sql.gz.part001'] = [
+            {
+                'ok': False,
+                'error_code': 400,
+                'description': 'Bad Request: rejected',
+            }
+        ]
+        settings = upload_settings.model_copy(update={'TG_MAX_RETRIES': 0})
+
+        with override_settings(settings):
+            with pytest.raises(TelegramBadRequest):
+                await send.send_file(dump, 'dump', chat_id='1')
+
+        # Parts waiting for their turn are cancelled, not sent
+        assert bot_api.requests < 4
+        assert not list(bot_api.directory.glob('*.manifest.json'))
+
+    async def test_parts_assembled(self, tmp_path, bot_api):
+        log = tmp_path / 'job.log'
+        log.write_bytes(os.urandom(100 * 1024) + b'log line\n' * 10000)
+
+        await send.send_file(log, 'job', chat_id='1')
+
+        received = bot_api.directory
+        parts = sorted(received.glob('job.log.gz.part*'))
+        assert len(parts) > 2
+        assert bot_api.max_in_flight == 2
+        restored = send.assemble_file(received / 'job.log.manifest.json')
+        assert restored == received / 'job.log'
+        assert restored.read_bytes() == log.read_bytes()
+
+    async def test_compressed_sent_as_is(self, tmp_path, bot_api):
+        dump = tmp_path / 'dump.sql.gz'
+        dump.write_bytes(os.urandom(100 * 1024))
+
+        await send.send_file(dump, 'dump', chat_id='1')
+
+        received = bot_api.directory
+        assert len(list(received.glob('dump.sql.gz.part*'))) == 4
+        restored = send.assemble_file(received / 'dump.sql.gz.manifest.json')
+        assert restored.read_bytes() == dump.read_bytes()
+
+    async def test_small_file(self, tmp_path, bot_api):
+        log = tmp_path / 'job.log'
+        log.write_bytes(b'log line\n')
+
+        await send.send_file(log, 'job', chat_id='1')
+
+        assert [path.name for path in bot_api.directory.iterdir()] == [
+            'job.log'
+        ]
+
+
+class TestAssembleFileHandler:
+    async def test_corrupted_part(self, tmp_path, bot_api, upload_settings):
+        dump = tmp_path / 'dump.sql.gz'
+        dump.write_bytes(os.urandom(upload_settings.TG_UPLOAD_LIMIT + 1))
+        await send.send_file(dump, 'dump', chat_id='1')
+
+        received = bot_api.directory
+        (received / 'dump.sql.gz.part001').write_bytes(b'corrupted')
+        with pytest.raises(ValueError, match='part001'):
+            send.assemble_file(received / 'dump.sql.gz.manifest.json')
+        assert not (received / 'dump.sql.gz').exists()
@@ -60,3 +60,14 @@ class TestSendPingStatusHandler:
             mock_bot.edit_message_text.call_args.kwargs['message_id']
             == mock_message_id.message_id
         )
+
+    @pytest.mark.usefixtures('mock_message_id')
+    async def test_send_ping_status_latency(self, mock_bot):
+        await send.send_ping_status(
+            {'host1': {'endpoint1': 'Successful'}},
+            {'host1': {'endpoint1': (12.3, 45.6)}},
+        )
+        assert (
+            'endpoint1: Successful (p50 12 ms, p95 46 ms)'
+            in mock_bot.edit_message_text.call_args.kwargs['text']
+        )
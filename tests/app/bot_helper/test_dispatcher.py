@@ -0,0 +1,235 @@
+import asyncio
+import os
+import threading
+from unittest import mock
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.bot_helper import dispatcher as dispatcher_module
+from app.bot_helper import send
+from app.bot_helper.dispatcher import (
+    Notification,
+    NotificationDispatcher,
+    _coalesce,
+)
+from app.config import get_settings, override_settings
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='dispatcher_settings')
+def dispatcher_settings_fixture(tmp_path):
+    settings = get_settings().model_copy(
+        update={
+            'TG_QUEUE_SIZE': 1,
+            'TG_BATCH_DELAY': 0,
+            'TG_MAX_RETRIES': 2,
+            'TG_SPILL_FILE': tmp_path / 'spill.jsonl',
+        }
+    )
+    with override_settings(settings):
+        yield settings
+
+
+class TestCoalesceHandler:
+    async def test_repeated(self):
+        notifications = [Notification('error', 'error', None)] * 3
+        assert _coalesce(notifications) == [
+            Notification('error\n(repeated 3 times)', 'error', None)
+        ]
+
+    async def test_batched_by_chat(self):
+        notifications = [
+            Notification('first', 'error', None),
+            Notification('second', 'error', None),
+            Notification('other', 'info', 'chat'),
+        ]
+        assert _coalesce(notifications) == [
+            Notification('first\n\nsecond', 'error', None),
+            Notification('other', 'info', 'chat'),
+        ]
+
+    async def test_message_limit(self):
+        notifications = [
+            Notification('a' * 3000, 'error', None),
+            Notification('b' * 3000, 'error', None),
+        ]
+        assert len(_coalesce(notifications)) == 2
+
+
+class TestNotificationDispatcherHandler:
+    @pytest.mark.usefixtures('dispatcher_settings')
+    async def test_send_batch(self):
+        sender = mock.AsyncMock()
+        dispatcher = NotificationDispatcher(sender)
+        dispatcher.enqueue('first')
+        dispatcher.enqueue('second', level='info', chat_id='chat')
+        await dispatcher.close()
+        sender.assert_has_calls(
+            [
+                mock.call('first', 'error', None),
+                mock.call('second', 'info', 'chat'),
+            ]
+        )
+
+    async def test_taken_before_close(self, dispatcher_settings):
+        sender = mock.AsyncMock()
+        dispatcher = NotificationDispatcher(sender)
+        settings = dispatcher_settings.model_copy(
+            update={'TG_BATCH_DELAY': 10}
+        )
+        with override_settings(settings):
+            dispatcher.enqueue('error')
+            # Background task waits for the batch with the message taken
+            await asyncio.sleep(0)
+            await dispatcher.close()
+        sender.assert_called_once_with('error', 'error', None)
+
+    async def test_spill_when_full(self, dispatcher_settings):
+        sender = mock.AsyncMock()
+        dispatcher = NotificationDispatcher(sender)
+        for _ in range(3):
+            dispatcher.enqueue('error')
+        await dispatcher.close()
+        sender.assert_called_once_with(
+            'error\n(repeated 3 times)', 'error', None
+        )
+        assert not list(dispatcher_settings.TG_SPILL_FILE.parent.iterdir())
+
+    @pytest.mark.usefixtures('dispatcher_settings')
+    async def test_spilled_in_thread(self):
+        sender = mock.AsyncMock()
+        dispatcher = NotificationDispatcher(sender)
+        rendered_in = []
+
+        def render():
+            rendered_in.append(threading.get_ident())
+            return 'spilled'
+
+        dispatcher.enqueue('error')
+        dispatcher.enqueue(render)
+        await dispatcher.close()
+        assert rendered_in != [threading.get_ident()]
+        assert len(rendered_in) == 1
+        sender.assert_called_once_with('error\n\nspilled', 'error', None)
+
+    async def test_spilled_sent_when_drained(
+        self, dispatcher_settings, mocker
+    ):
+        sender = mock.AsyncMock()
+        dispatcher = NotificationDispatcher(sender)
+        replace = os.replace
+        loaded_in = []
+
+        def replace_in_thread(*args):
+            loaded_in.append(threading.get_ident())
+            replace(*args)
+
+        mocker.patch.object(
+            dispatcher_module.os, 'replace', side_effect=replace_in_thread
+        )
+        for text in ('first', 'second', 'third'):
+            dispatcher.enqueue(text)
+        # Sent without new messages and before close, one per batch
+        for _ in range(100):
+            if sender.await_count == 3:
+                break
+            await asyncio.sleep(0.01)
+        # Spilling threads may write in any order
+        sender.assert_has_awaits(
+            [
+                mock.call('first', 'error', None),
+                mock.call('second', 'error', None),
+                mock.call('third', 'error', None),
+            ],
+            any_order=True,
+        )
+        assert loaded_in
+        assert threading.get_ident() not in loaded_in
+        await dispatcher.close()
+        assert not list(dispatcher_settings.TG_SPILL_FILE.parent.iterdir())
+
+    @pytest.mark.usefixtures('dispatcher_settings')
+    async def test_retry_after(self):
+        sender = mock.AsyncMock(
+            side_effect=[
+                TelegramRetryAfter(
+                    method=mock.Mock(), message='', retry_after=0
+                ),
+                None,
+            ]
+        )
+        dispatcher = NotificationDispatcher(sender)
+        dispatcher.enqueue('error')
+        await dispatcher.close()
+        assert sender.call_count == 2
+
+    @pytest.mark.usefixtures('dispatcher_settings')
+    async def test_callable_rendered(self):
+        sender = mock.AsyncMock()
+        render = mock.Mock(return_value='error')
+        dispatcher = NotificationDispatcher(sender)
+        dispatcher.enqueue(render)
+        render.assert_not_called()
+        await dispatcher.close()
+        sender.assert_called_once_with('error', 'error', None)
+
+    @pytest.mark.usefixtures('dispatcher_settings')
+    async def test_callable_failed(self):
+        sender = mock.AsyncMock()
+        dispatcher = NotificationDispatcher(sender)
+        dispatcher.enqueue(mock.Mock(side_effect=ValueError('broken')))
+        await dispatcher.close()
+        sender.assert_called_once_with(
+            'Error while formatting message: broken', 'error', None
+        )
+
+    async def test_dropped_after_retries(self, dispatcher_settings, mocker):
+        mocker.patch('asyncio.sleep', mock.AsyncMock())
+        sender = mock.AsyncMock(side_effect=ValueError)
+        dispatcher = NotificationDispatcher(sender)
+        dispatcher.enqueue('error')
+        await dispatcher.close()
+        assert sender.call_count == dispatcher_settings.TG_MAX_RETRIES + 1
+
+
+class TestSendSafeHandler:
+    async def test_traceback_enqueued(self, mock_dispatcher, mock_bot):
+        await send.send_traceback_message_safe(
+            logger=mock.Mock(), message='<error>', code='trace'
+        )
+        mock_dispatcher.assert_called_once_with(
+            '&lt;error&gt;\n\n<code>trace</code>', 'error'
+        )
+        mock_bot.send_message.assert_not_called()
+
+    async def test_error_report_enqueued(self, mock_dispatcher):
+        exc = ValueError('<error>')
+        await send.send_error_report_safe(mock.Mock(), exc, {'path': '/'})
+        await send.send_error_report_safe(mock.Mock(), exc, {'path': '/'})
+        mock_dispatcher.assert_called_once()
+        message = mock_dispatcher.call_args.args[0]()
+        assert 'ValueError: &lt;error&gt;' in message
+        send.error_aggregator.clear()
+
+    async def test_repeated_report_not_built(self, mock_dispatcher, mocker):
+        report = mocker.patch('app.bot_helper.send.message.ErrorReport')
+        exc = ValueError('error')
+        for _ in range(3):
+            await send.send_error_report_safe(mock.Mock(), exc, {})
+        report.assert_called_once()
+        mock_dispatcher.assert_called_once()
+        send.error_aggregator.clear()
+
+    async def test_repeated_traceback_aggregated(self, mock_dispatcher):
+        for _ in range(3):
+            try:
+                raise ValueError('error')
+            except ValueError:
+                await send.send_traceback_message_safe(
+                    logger=mock.Mock(), message='error', code='trace'
+                )
+        mock_dispatcher.assert_called_once()
+        send.error_aggregator.clear()
@@ -0,0 +1,71 @@
+import pytest
+
+from app import config
+from app.bot_helper import bot
+from app.bot_helper.send import error_aggregator
+from app.config import DefaultSettings
+from app.creator import get_app
+from app.database.connection import SessionManager, sql_instrumentation
+from app.scheduler.ping import latency_history
+from app.utils.job_run import job_logs
+from app.utils.password import PasswordHasher
+from app.utils.user import principal_cache
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='reload_env')
+def reload_env_fixture(monkeypatch):
+    with config.override_settings(config.get_settings()):
+        yield monkeypatch
+        monkeypatch.undo()
+        config.reload_settings()
+
+
+class TestGetSettingsHandler:
+    async def test_get_settings_cached(self):
+        assert config.get_settings() is config.get_settings()
+
+    async def test_reload_settings(self):
+        settings = config.get_settings()
+        with config.override_settings(settings):
+            reloaded = config.reload_settings()
+            assert reloaded is not settings
+            assert config.get_settings() is reloaded
+        assert config.get_settings() is settings
+
+    async def test_override_settings(self):
+        settings = config.get_settings()
+        new_settings = DefaultSettings(PROJECT_NAME='test_override')
+        with config.override_settings(new_settings):
+            assert config.get_settings() is new_settings
+            assert config.get_settings().PROJECT_NAME == 'test_override'
+        assert config.get_settings() is settings
+
+    async def test_reload_settings_applied(self, reload_env):
+        application = get_app(set_up_logger=False)
+        token = '1:' + 'a' * 35
+        for name, value in {
+            'TG_HELPER_BOT_TOKEN': token,
+            'POSTGRES_DB': 'reloaded',
+            'PASSWORD_HASH_ROUNDS': '5',
+            'SQL_SLOW_QUERY_MS': '7',
+            'ERROR_REPORT_WINDOW': '3',
+            'PRINCIPAL_CACHE_TTL': '4',
+            'SCHEDULER_JOB_LOG_SIZE': '100',
+            'PING_HISTORY_SIZE': '2',
+        }.items():
+            reload_env.setenv(name, value)
+
+        settings = config.reload_settings()
+
+        assert application.state.settings is settings
+        assert bot.bot.token == token
+        assert SessionManager().async_engine.url.database == 'reloaded'
+        assert PasswordHasher().rounds == 5
+        assert sql_instrumentation.slow_query_time == 0.007
+        assert error_aggregator.window == 3
+        assert principal_cache.ttl == 4
+        assert job_logs.max_size == 100
+        assert latency_history.size == 2
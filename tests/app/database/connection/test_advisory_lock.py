@@ -0,0 +1,114 @@
+import asyncio
+from unittest import mock
+
+import pytest
+import sqlalchemy as sa
+
+from app.database.connection import (
+    AdvisoryLock,
+    LeaderElection,
+    SessionManager,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+LOCK_KEY = 4242
+
+
+async def _terminate_lock_holder() -> None:
+    async with SessionManager().async_engine.connect() as connection:
+        await connection.execute(
+            sa.text(
+                'SELECT pg_terminate_backend(pid) FROM pg_locks '
+                "WHERE locktype = 'advisory' AND objid = :key"
+            ),
+            {'key': LOCK_KEY},
+        )
+
+
+@pytest.fixture(name='engine')
+async def engine_fixture(postgres):  # pylint: disable=unused-argument
+    engine = SessionManager().async_engine
+    yield engine
+    await engine.dispose()
+
+
+class TestAdvisoryLockHandler:
+    async def test_exclusive(self, engine):
+        first = AdvisoryLock(engine, LOCK_KEY)
+        second = AdvisoryLock(engine, LOCK_KEY)
+        assert await first.acquire() is True
+        assert await first.acquire() is True
+        assert await second.acquire() is False
+        await first.release()
+        assert first.locked is False
+        assert await second.acquire() is True
+        await second.release()
+
+    async def test_connection_lost(self, engine):
+        first = AdvisoryLock(engine, LOCK_KEY)
+        second = AdvisoryLock(engine, LOCK_KEY)
+        assert await first.acquire() is True
+        assert await first.check(1) is True
+        await _terminate_lock_holder()
+        assert await first.check(1) is False
+        assert first.locked is False
+        assert await second.acquire() is True
+        await second.release()
+
+    async def test_lock_lost_on_live_connection(self, engine):
+        lock = AdvisoryLock(engine, LOCK_KEY)
+        assert await lock.acquire() is True
+        connection = lock._connection  # pylint: disable=protected-access
+        assert connection is not None
+        await connection.execute(sa.text('SELECT pg_advisory_unlock_all()'))
+        assert await lock.check(1) is False
+        assert lock.locked is False
+
+    async def test_released_connection_reused(self, engine):
+        lock = AdvisoryLock(engine, LOCK_KEY)
+        assert await lock.acquire() is True
+        await lock.release()
+        # Connection returned to the pool doesn't keep the lock
+        async with engine.connect() as connection:
+            locks = await connection.scalar(
+                sa.text(
+                    "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory'"
+                )
+            )
+        assert locks == 0
+
+
+class TestLeaderElectionHandler:
+    async def test_failover(self, engine):
+        on_elected = [mock.Mock(), mock.Mock()]
+        on_deposed = [mock.Mock(), mock.Mock()]
+        first, second = elections = [
+            LeaderElection(
+                AdvisoryLock(engine, LOCK_KEY),
+                0.05,
+                on_elected=on_elected[i],
+                on_deposed=on_deposed[i],
+            )
+            for i in range(2)
+        ]
+        try:
+            await first.start()
+            await second.start()
+            assert first.is_leader is True
+            assert second.is_leader is False
+            on_elected[0].assert_called_once()
+
+            await _terminate_lock_holder()
+            async with asyncio.timeout(5):
+                while not second.is_leader:
+                    await asyncio.sleep(0.05)
+
+            assert first.is_leader is False
+            on_deposed[0].assert_called_once()
+            on_elected[1].assert_called_once()
+        finally:
+            for election in elections:
+                await election.stop()
+        on_deposed[1].assert_called_once()
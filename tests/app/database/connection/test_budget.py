@@ -0,0 +1,52 @@
+import pytest
+
+from app.config import get_settings
+from app.database.connection import (
+    check_connection_budget,
+    get_connection_budget,
+)
+from app.schemas.database import EnginePool, RolePools
+
+
+def _settings(**kwargs):
+    return get_settings().model_copy(
+        update={
+            'APP_WORKERS': 2,
+            'DB_POOLS': {
+                'app': RolePools(
+                    processes=0,
+                    sync_engine=EnginePool(pool_size=1),
+                    async_engine=EnginePool(pool_size=5, max_overflow=5),
+                ),
+                'scheduler': RolePools(
+                    sync_engine=EnginePool(pool_size=1),
+                    async_engine=EnginePool(pool_size=2),
+                ),
+            },
+            **kwargs,
+        }
+    )
+
+
+class TestConnectionBudgetHandler:
+    def test_budget(self):
+        assert get_connection_budget(_settings()) == {
+            'app': 22,
+            'scheduler': 3,
+        }
+
+    def test_processes_per_cpu(self, mocker):
+        mocker.patch('multiprocessing.cpu_count', return_value=3)
+        settings = _settings(APP_WORKERS=0)
+        assert get_connection_budget(settings)['app'] == 33
+
+    @pytest.mark.parametrize(
+        'max_connections, expected',
+        [(100, True), (28, True), (27, False)],
+    )
+    def test_check(self, max_connections, expected):
+        settings = _settings(
+            POSTGRES_MAX_CONNECTIONS=max_connections,
+            POSTGRES_RESERVED_CONNECTIONS=3,
+        )
+        assert check_connection_budget(settings) is expected
@@ -0,0 +1,99 @@
+import loguru
+import pytest
+from sqlalchemy import select, text
+
+from app.database.connection import SQLInstrumentation, sql_instrumentation
+from app.database.connection.instrumentation import (
+    get_fingerprint,
+    normalize_statement,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='records')
+def records_fixture():
+    messages = []
+    handler_id = loguru.logger.add(
+        lambda message: messages.append(message.record), level='DEBUG'
+    )
+    yield messages
+    loguru.logger.remove(handler_id)
+
+
+class TestNormalizeStatementHandler:
+    @pytest.mark.parametrize(
+        'statement, expected',
+        [
+            (
+                'SELECT *\n  FROM "user" WHERE id = $1',
+                'SELECT * FROM "user" WHERE id = ?',
+            ),
+            (
+                "SELECT 1 WHERE name = 'it''s' AND x IN ($1, $2, $3)",
+                'SELECT ? WHERE name = ? AND x IN (?)',
+            ),
+            (
+                'SELECT * FROM t1 WHERE x = %(x_1)s LIMIT 10',
+                'SELECT * FROM t1 WHERE x = ? LIMIT ?',
+            ),
+        ],
+    )
+    async def test_normalize(self, statement, expected):
+        assert normalize_statement(statement) == expected
+
+    async def test_same_fingerprint(self):
+        assert get_fingerprint(
+            'SELECT * FROM t WHERE x IN ($1, $2)'
+        ) == get_fingerprint('SELECT * FROM t WHERE x IN ($1, $2, $3)')
+
+
+class TestSQLInstrumentationHandler:
+    async def test_aggregate(self):
+        instrumentation = SQLInstrumentation(0, 1000, 10)
+        instrumentation.record('SELECT $1', 0.002, 1)
+        instrumentation.record('SELECT $2', 0.004, 1)
+        instrumentation.record('SELECT * FROM t', 0.001, 5)
+        stats = instrumentation.stats()
+        assert [value['count'] for value in stats.values()] == [2, 1]
+        first = stats[get_fingerprint('SELECT $1')]
+        assert first['statement'] == 'SELECT ?'
+        assert first['total_ms'] == pytest.approx(6)
+        assert first['max_ms'] == pytest.approx(4)
+        assert first['rows'] == 2
+        assert len(instrumentation.stats(limit=1)) == 1
+
+    async def test_max_fingerprints(self):
+        instrumentation = SQLInstrumentation(0, 1000, 1)
+        instrumentation.record('SELECT 1', 0.001, 1)
+        instrumentation.record('SELECT * FROM t', 0.001, 1)
+        assert len(instrumentation.stats()) == 1
+
+    async def test_logged_over_max_fingerprints(self, records):
+        instrumentation = SQLInstrumentation(0, 10, 1)
+        instrumentation.record('SELECT 1', 0.001, 1)
+        instrumentation.record('SELECT * FROM t', 0.02, 1)
+        assert len(instrumentation.stats()) == 1
+        assert records[0]['extra']['statement'] == 'SELECT * FROM t'
+
+    async def test_slow_query_logged(self, records):
+        instrumentation = SQLInstrumentation(0, 10, 10)
+        instrumentation.record('SELECT 1', 0.001, 1)
+        instrumentation.record('SELECT 2', 0.02, 1)
+        assert [record['level'].name for record in records] == ['WARNING']
+        assert records[0]['extra']['statement'] == 'SELECT ?'
+
+    async def test_sampled(self, records):
+        instrumentation = SQLInstrumentation(1, 1000, 10)
+        instrumentation.record('SELECT 1', 0.001, 1)
+        assert [record['level'].name for record in records] == ['DEBUG']
+
+    async def test_engine_events(self, create_async_session):
+        sql_instrumentation.reset()
+        async with create_async_session() as session:
+            await session.scalar(select(text('1')))
+        assert 'SELECT ?' in [
+            value['statement']
+            for value in sql_instrumentation.stats().values()
+        ]
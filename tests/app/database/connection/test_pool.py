@@ -0,0 +1,79 @@
+import pytest
+import sqlalchemy as sa
+from prometheus_client import REGISTRY
+
+from app.config import get_settings, override_settings
+from app.database.connection import DatabaseOverloadedError, get_pool_stats
+from app.database.connection.pool import AdmissionQueuePool
+
+
+def _create_engine(max_waiting: int) -> sa.Engine:
+    settings = get_settings().model_copy(
+        update={'DB_POOL_MAX_WAITING': max_waiting}
+    )
+    with override_settings(settings):
+        return sa.create_engine(
+            'sqlite://',
+            poolclass=AdmissionQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.01,
+        )
+
+
+class TestAdmissionQueuePoolHandler:
+    def test_timeout(self):
+        engine = _create_engine(max_waiting=1)
+        with engine.connect():
+            with pytest.raises(DatabaseOverloadedError):
+                engine.connect()
+        stats = get_pool_stats(engine.pool)
+        assert stats['timeouts'] == 1
+        assert stats['rejected'] == 0
+        assert stats['wait_count'] == 2
+        assert stats['wait_histogram']['inf'] == 2
+
+    def test_rejected_without_waiting(self):
+        engine = _create_engine(max_waiting=0)
+        with engine.connect():
+            assert get_pool_stats(engine.pool)['checked_out'] == 1
+            with pytest.raises(DatabaseOverloadedError):
+                engine.connect()
+        stats = get_pool_stats(engine.pool)
+        assert stats['rejected'] == 1
+        assert stats['timeouts'] == 0
+        assert stats['checked_out'] == 0
+
+    def test_recreate_keeps_admission_control(self):
+        engine = _create_engine(max_waiting=0)
+        engine.dispose()
+        assert isinstance(engine.pool, AdmissionQueuePool)
+
+    def test_prometheus_metrics(self):
+        engine = _create_engine(max_waiting=0)
+        before = REGISTRY.get_sample_value(
+            'db_pool_rejected_total',
+            {'engine': 'sync', 'reason': 'queue_full'},
+        )
+        with engine.connect():
+            assert (
+                REGISTRY.get_sample_value(
+                    'db_pool_checked_out_connections', {'engine': 'sync'}
+                )
+                == 1
+            )
+            with pytest.raises(DatabaseOverloadedError):
+                engine.connect()
+        assert (
+            REGISTRY.get_sample_value(
+                'db_pool_rejected_total',
+                {'engine': 'sync', 'reason': 'queue_full'},
+            )
+            == (before or 0) + 1
+        )
+        assert (
+            REGISTRY.get_sample_value(
+                'db_pool_checked_out_connections', {'engine': 'sync'}
+            )
+            == 0
+        )
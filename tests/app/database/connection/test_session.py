@@ -0,0 +1,75 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.connection import SessionManager
+from app.database.connection import session as session_module
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestCreateAsyncSessionHandler:
+    async def test_unused_session_no_commit(
+        self, mocker, create_async_session
+    ):
+        spy = mocker.spy(AsyncSession, 'commit')
+        async with create_async_session():
+            pass
+        spy.assert_not_called()
+
+    async def test_used_session_commit(self, mocker, create_async_session):
+        spy = mocker.spy(AsyncSession, 'commit')
+        async with create_async_session() as session:
+            await session.scalar(select(text('1')))
+        spy.assert_called_once()
+
+    async def test_pending_objects_commit(
+        self, mocker, create_async_session, not_created_user
+    ):
+        spy = mocker.spy(AsyncSession, 'commit')
+        async with create_async_session() as session:
+            session.add(not_created_user)
+        spy.assert_called_once()
+
+
+class TestGetAsyncSessionMakerHandler:
+    async def test_cached(self):
+        manager = SessionManager()
+        assert (
+            manager.get_async_session_maker()
+            is manager.get_async_session_maker()
+        )
+
+    async def test_override(self):
+        manager = SessionManager()
+        session_maker = manager.get_async_session_maker(autoflush=False)
+        assert session_maker is not manager.get_async_session_maker()
+        assert session_maker.kw['autoflush'] is False
+        assert session_maker.kw['expire_on_commit'] is False
+
+
+class TestLazyEngineHandler:
+    async def test_engines_created_on_first_use(self, mocker):
+        manager = SessionManager()
+        manager.refresh()
+        create_engine = mocker.spy(sa, 'create_engine')
+        create_async_engine = mocker.spy(session_module, 'create_async_engine')
+        assert manager.async_engine is manager.async_engine
+        create_async_engine.assert_called_once()
+        create_engine.assert_not_called()
+
+    async def test_role_pool_size(self):
+        manager = SessionManager()
+        try:
+            manager.set_role('tools')
+            assert manager.async_engine.pool.size() == 1  # type: ignore
+            assert manager.engine.pool.size() == 1  # type: ignore
+        finally:
+            manager.set_role('app')
+        assert manager.async_engine.pool.size() == 8  # type: ignore
+
+    async def test_unknown_role(self):
+        with pytest.raises(ValueError):
+            SessionManager().set_role('unknown')
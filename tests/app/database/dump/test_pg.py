@@ -0,0 +1,117 @@
+import shutil
+import sys
+import tarfile
+
+import pytest
+
+from app.config import get_settings
+from app.database.dump import (
+    DumpError,
+    dump_database,
+    get_dump_suffix,
+    restore_dump,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+# Writes arguments of each call to calls.txt next to itself
+FAKE_PG = '''#!{python}
+import pathlib, sys
+
+here = pathlib.Path(__file__).parent
+with open(here / 'calls.txt', 'a') as file:
+    file.write(' '.join(sys.argv) + '\\n')
+args = dict(arg.split('=', 1) for arg in sys.argv[1:] if '=' in arg)
+if pathlib.Path(sys.argv[0]).name == 'pg_restore':
+    if '--list' in sys.argv:
+        sys.stdout.write(';\\n; Archive\\n1; 0 0 TABLE public user\\n')
+elif args.get('--format') == 'directory':
+    dump = pathlib.Path(args['--file'])
+    dump.mkdir()
+    (dump / 'toc.dat').write_text('toc')
+else:
+    sys.stdout.write('dump')
+'''
+
+
+@pytest.fixture(name='fake_pg_bin')
+def fake_pg_bin_fixture(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    for name in ('pg_dump', 'pg_restore'):
+        script = bin_dir / name
+        script.write_text(FAKE_PG.format(python=sys.executable))
+        script.chmod(0o755)
+    monkeypatch.setenv('PATH', str(bin_dir))
+    return bin_dir
+
+
+def _settings(**kwargs):
+    return get_settings().model_copy(update=kwargs)
+
+
+class TestDumpDatabaseHandler:
+    async def test_directory(self, tmp_path, fake_pg_bin):
+        settings = _settings(DB_DUMP_FORMAT='directory', DB_DUMP_JOBS=3)
+        path = tmp_path / f'dump{get_dump_suffix(settings)}'
+        result = await dump_database(path, settings)
+
+        assert result.path == path
+        assert not (tmp_path / 'dump').exists()
+        with tarfile.open(path) as tar:
+            assert tar.getnames() == ['dump', 'dump/toc.dat']
+        calls = (fake_pg_bin / 'calls.txt').read_text().splitlines()
+        assert '--format=directory --jobs=3' in calls[0]
+        assert calls[1].endswith(f'pg_restore --list {tmp_path / "dump"}')
+
+    async def test_custom(self, tmp_path, fake_pg_bin):
+        settings = _settings(DB_DUMP_FORMAT='custom')
+        path = tmp_path / f'dump{get_dump_suffix(settings)}'
+        await dump_database(path, settings)
+
+        assert path.read_text() == 'dump'
+        calls = (fake_pg_bin / 'calls.txt').read_text().splitlines()
+        assert '--format=custom' in calls[0]
+        assert '--list' in calls[1]
+
+    async def test_empty_dump(self, tmp_path, fake_pg_bin):
+        (fake_pg_bin / 'pg_restore').write_text('#!/bin/sh\n')
+        settings = _settings(DB_DUMP_FORMAT='custom')
+        path = tmp_path / 'dump.dump'
+        with pytest.raises(DumpError, match='no entries'):
+            await dump_database(path, settings)
+        assert not path.exists()
+
+
+class TestRestoreDumpHandler:
+    async def test_packed_directory(self, tmp_path, fake_pg_bin):
+        settings = _settings(DB_DUMP_FORMAT='directory')
+        path = tmp_path / 'dump.tar'
+        await dump_database(path, settings)
+
+        await restore_dump(path, settings, jobs=4)
+
+        restore_call = (fake_pg_bin / 'calls.txt').read_text().splitlines()[-1]
+        assert '--jobs=4 --clean --if-exists --no-owner' in restore_call
+        assert f'--dbname={settings.POSTGRES_DB}' in restore_call
+        assert restore_call.endswith('/dump')
+
+    async def test_plain(self, tmp_path):
+        path = tmp_path / 'dump.sql.gz'
+        path.write_text('dump')
+        with pytest.raises(ValueError):
+            await restore_dump(path, get_settings())
+
+
+@pytest.mark.skipif(
+    shutil.which('pg_dump') is None, reason='pg_dump is not installed'
+)
+@pytest.mark.usefixtures('migrated_postgres')
+class TestLocalPostgresHandler:
+    async def test_dump_and_restore(self, tmp_path):
+        settings = _settings(DB_DUMP_FORMAT='directory', DB_DUMP_JOBS=2)
+        path = tmp_path / 'dump.tar'
+        result = await dump_database(path, settings)
+        assert result.size > 0
+        await restore_dump(path, settings)
@@ -0,0 +1,64 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.database.dump import apply_retention, get_expired
+
+
+pytestmark = pytest.mark.asyncio
+
+# Sunday, the last day of ISO week
+NOW = datetime(2024, 1, 14, 3)
+
+
+class TestGetExpiredHandler:
+    async def test_daily(self):
+        dumps = [
+            (Path(f'dump_{day}_{hour}'), NOW - timedelta(days=day, hours=hour))
+            for day in range(5)
+            for hour in (0, 1)
+        ]
+        expired = get_expired(dumps, keep_daily=3, keep_weekly=0)
+        assert sorted(expired) == sorted(
+            path
+            for path, created in dumps
+            if created.hour != 3 or created < NOW - timedelta(days=2)
+        )
+
+    async def test_weekly(self):
+        dumps = [
+            (Path(f'dump_{day}'), NOW - timedelta(days=day))
+            for day in range(21)
+        ]
+        expired = get_expired(dumps, keep_daily=1, keep_weekly=3)
+        kept = {path for path, _ in dumps} - set(expired)
+        assert kept == {Path('dump_0'), Path('dump_7'), Path('dump_14')}
+
+    async def test_nothing_kept(self):
+        dumps = [(Path('dump'), NOW)]
+        assert get_expired(dumps, keep_daily=0, keep_weekly=0) == [
+            Path('dump')
+        ]
+
+
+class TestApplyRetentionHandler:
+    async def test_removed(self, tmp_path):
+        old_file = tmp_path / 'db_dump_old.sql'
+        old_dir = tmp_path / 'db_dump_old'
+        new_file = tmp_path / 'db_dump_new.sql'
+        other = tmp_path / 'other.sql'
+        for path in (old_file, new_file, other):
+            path.write_text('dump')
+        old_dir.mkdir()
+        (old_dir / 'toc.dat').write_text('dump')
+        old = (NOW - timedelta(days=30)).timestamp()
+        for path in (old_file, old_dir, other):
+            os.utime(path, (old, old))
+
+        removed = apply_retention(tmp_path, 'db_dump_', 1, 0)
+
+        assert sorted(removed) == sorted([old_file, old_dir])
+        assert new_file.exists()
+        assert other.exists()
@@ -0,0 +1,93 @@
+import asyncio
+import gzip
+import os
+import sys
+
+import pytest
+
+from app.config import get_settings
+from app.database.dump import (
+    DumpError,
+    get_compressor,
+    get_pg_env,
+    stream_to_file,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+PRODUCER = (
+    'import sys, time\n'
+    'for _ in range(5):\n'
+    '    sys.stdout.write("select 1;\\n" * 10000)\n'
+    '    sys.stdout.flush()\n'
+    '    time.sleep(0.05)\n'
+)
+
+
+class TestStreamToFileHandler:
+    async def test_gzip(self, tmp_path):
+        path = tmp_path / 'dump.sql.gz'
+        result = await stream_to_file(
+            (sys.executable, '-c', PRODUCER),
+            path,
+            dict(os.environ),
+            get_compressor('gzip', 6),
+            64 * 1024,
+        )
+        data = gzip.decompress(path.read_bytes())
+        assert data == b'select 1;\n' * 50000
+        assert result.raw_size == len(data)
+        assert result.size == path.stat().st_size < result.raw_size
+        assert result.rate > 0
+
+    async def test_event_loop_not_blocked(self, tmp_path):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await stream_to_file(
+            (sys.executable, '-c', PRODUCER),
+            tmp_path / 'dump.sql',
+            dict(os.environ),
+            get_compressor('none', 0),
+            64 * 1024,
+        )
+        ticker.cancel()
+        assert ticks > 10
+
+    async def test_failed(self, tmp_path):
+        path = tmp_path / 'dump.sql'
+        with pytest.raises(DumpError, match='code 3: broken'):
+            await stream_to_file(
+                (
+                    sys.executable,
+                    '-c',
+                    'import sys; sys.stderr.write("broken"); sys.exit(3)',
+                ),
+                path,
+                dict(os.environ),
+                get_compressor('none', 0),
+                1024,
+            )
+        assert not path.exists()
+
+
+class TestGetCompressorHandler:
+    async def test_unknown(self):
+        with pytest.raises(ValueError):
+            get_compressor('lz4', 1)
+
+
+class TestGetPgEnvHandler:
+    async def test_env(self):
+        settings = get_settings()
+        env = get_pg_env(settings)
+        assert env['PGDATABASE'] == settings.POSTGRES_DB
+        assert env['PGPORT'] == str(settings.POSTGRES_PORT)
+        assert 'PATH' in env
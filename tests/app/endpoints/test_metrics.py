@@ -0,0 +1,28 @@
+import pytest
+from fastapi import status
+
+from app.config import get_settings
+from app.endpoints.v1 import prefix
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestMetricsHandler:
+    async def test_request_latency(self, client):
+        settings = get_settings()
+        route = f'{settings.PATH_PREFIX}{prefix}/health_check/ping_application'
+        await client.get(url=route)
+        await client.get(url='/not_found')
+        response = await client.get(url='/metrics')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'].startswith('text/plain')
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            f'route="{route}",status_code="200"}}'
+        ) in response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="unmatched",status_code="404"}'
+        ) in response.text
+        assert 'http_requests_in_flight 1.0' in response.text
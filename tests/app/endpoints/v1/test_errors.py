@@ -0,0 +1,34 @@
+import pytest
+from fastapi import status
+
+from app.bot_helper import send
+from app.config import get_settings
+from app.endpoints.v1 import prefix
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestGetErrorsHandler:
+    @staticmethod
+    def get_url() -> str:
+        settings = get_settings()
+        return f'{settings.PATH_PREFIX}{prefix}/errors'
+
+    async def test_unauthorized(self, client):
+        response = await client.get(url=self.get_url())
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.usefixtures('created_user')
+    async def test_errors(self, client, user_headers):
+        for _ in range(2):
+            try:
+                raise ValueError('error')
+            except ValueError as exc:
+                send.error_aggregator.record(exc, 'request')
+        response = await client.get(url=self.get_url(), headers=user_headers)
+        assert response.status_code == status.HTTP_200_OK
+        (error,) = response.json()['errors']
+        assert error['title'] == 'ValueError: error'
+        assert error['count'] == 2
+        assert error['request_ids'] == ['request', 'request']
@@ -0,0 +1,98 @@
+import typing as tp
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+
+from app.config import get_settings
+from app.database.models import JobRun
+from app.endpoints.v1 import prefix
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='job_runs')
+async def job_runs_fixture(session):
+    # Midday, so all runs fall on one day
+    now = datetime.now(timezone.utc).replace(hour=12, minute=0)
+    runs = [
+        JobRun(
+            name='ping' if i % 2 else 'db_dump',
+            dt_started=now - timedelta(minutes=i),
+            dt_finished=now - timedelta(minutes=i) + timedelta(seconds=i),
+            duration=float(i),
+            status='error' if i == 3 else 'ok',
+            log_id=f'log-{i}',
+        )
+        for i in range(1, 6)
+    ]
+    session.add_all(runs)
+    await session.commit()
+    return runs
+
+
+def _get_url(path: str) -> str:
+    settings = get_settings()
+    return f'{settings.PATH_PREFIX}{prefix}/jobs/{path}'
+
+
+class TestGetRunsHandler:
+    async def test_unauthorized(self, client):
+        response = await client.get(url=_get_url('runs'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.usefixtures('job_runs')
+    async def test_pages(self, client, user_headers):
+        log_ids, cursor = [], None
+        while True:
+            params: dict[str, tp.Any] = {'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            response = await client.get(
+                url=_get_url('runs'), params=params, headers=user_headers
+            )
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            log_ids.append([run['log_id'] for run in page['runs']])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert log_ids == [['log-1', 'log-2'], ['log-3', 'log-4'], ['log-5']]
+
+    @pytest.mark.usefixtures('job_runs')
+    async def test_by_name(self, client, user_headers):
+        response = await client.get(
+            url=_get_url('runs'), params={'name': 'ping'}, headers=user_headers
+        )
+        assert [run['log_id'] for run in response.json()['runs']] == [
+            'log-1',
+            'log-3',
+            'log-5',
+        ]
+
+    @pytest.mark.usefixtures('created_user')
+    async def test_invalid_cursor(self, client, user_headers):
+        response = await client.get(
+            url=_get_url('runs'),
+            params={'cursor': 'invalid'},
+            headers=user_headers,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestGetStatsHandler:
+    @pytest.mark.usefixtures('job_runs')
+    async def test_stats(self, client, user_headers):
+        response = await client.get(
+            url=_get_url('stats'), headers=user_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        stats = [
+            (row['name'], row['count'], row['errors'], row['p50'], row['max'])
+            for row in response.json()['stats']
+        ]
+        assert stats == [
+            ('db_dump', 2, 0, 3.0, 4.0),
+            ('ping', 3, 1, 3.0, 5.0),
+        ]
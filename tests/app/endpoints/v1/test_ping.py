@@ -2,6 +2,7 @@ import pytest
 from fastapi import status
 
 from app.config import get_settings
+from app.database.connection import DatabaseOverloadedError
 from app.endpoints.v1 import prefix
 
 
@@ -27,6 +28,33 @@ class TestHealthCheckHandler:
         response = await client.get(url=self.get_url_database())
         assert response.status_code == status.HTTP_200_OK, response.json()
 
+    async def test_ping_database_overloaded(self, client, mocker):
+        mocker.patch(
+            'app.endpoints.v1.ping.health_check_db',
+            side_effect=DatabaseOverloadedError('timeout'),
+        )
+        response = await client.get(url=self.get_url_database())
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['Retry-After'] == str(
+            get_settings().DB_RETRY_AFTER
+        )
+
+    @staticmethod
+    def get_url_database_pool() -> str:
+        settings = get_settings()
+        return f'{settings.PATH_PREFIX}{prefix}/health_check/database_pool'
+
+    async def test_database_pool_unauthorized(self, client):
+        response = await client.get(url=self.get_url_database_pool())
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_database_pool(self, client, user_headers):
+        response = await client.get(
+            url=self.get_url_database_pool(), headers=user_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['size'] == 8
+
 
 class TestPingAuthHandler:
     @staticmethod
@@ -0,0 +1,32 @@
+import pytest
+from fastapi import status
+
+from app.config import get_settings
+from app.database.connection import sql_instrumentation
+from app.endpoints.v1 import prefix
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestGetQueriesHandler:
+    @staticmethod
+    def get_url() -> str:
+        settings = get_settings()
+        return f'{settings.PATH_PREFIX}{prefix}/queries'
+
+    async def test_unauthorized(self, client):
+        response = await client.get(url=self.get_url())
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.usefixtures('created_user')
+    async def test_queries(self, client, user_headers):
+        sql_instrumentation.reset()
+        sql_instrumentation.record('SELECT $1', 1000, 1)
+        response = await client.get(
+            url=self.get_url(), headers=user_headers, params={'limit': 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        (query,) = response.json()['queries']
+        assert query['statement'] == 'SELECT ?'
+        assert query['count'] == 1
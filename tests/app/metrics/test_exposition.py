@@ -0,0 +1,25 @@
+from prometheus_client import REGISTRY
+
+from app.metrics import clear_multiprocess_dir, generate_metrics, get_registry
+
+
+class TestGetRegistryHandler:
+    def test_single_process(self, monkeypatch):
+        monkeypatch.delenv('PROMETHEUS_MULTIPROC_DIR', raising=False)
+        assert get_registry() is REGISTRY
+
+    def test_multiprocess(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+        assert get_registry() is not REGISTRY
+        content, content_type = generate_metrics()
+        assert content == b''
+        assert content_type.startswith('text/plain')
+
+
+class TestClearMultiprocessDirHandler:
+    def test_clear(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+        (tmp_path / 'counter_1.db').write_bytes(b'')
+        (tmp_path / 'keep.txt').write_bytes(b'')
+        clear_multiprocess_dir()
+        assert [path.name for path in tmp_path.iterdir()] == ['keep.txt']
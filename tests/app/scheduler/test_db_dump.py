@@ -0,0 +1,56 @@
+import gzip
+from unittest import mock
+
+import pytest
+
+from app.config import get_settings, override_settings
+from app.scheduler import db_dump
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='fake_pg_dump')
+def fake_pg_dump_fixture(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    pg_dump = bin_dir / 'pg_dump'
+    pg_dump.write_text('#!/bin/sh\necho "select $PGDATABASE;"\n')
+    pg_dump.chmod(0o755)
+    monkeypatch.setenv('PATH', f'{bin_dir}:{tmp_path}')
+
+
+@pytest.fixture(name='mock_send_db_dump')
+def mock_send_db_dump_fixture(mocker):
+    return mocker.patch('app.bot_helper.send.send_db_dump')
+
+
+@pytest.mark.usefixtures('fake_pg_dump')
+class TestDbDumpJobHandler:
+    async def test_dump_sent(self, tmp_path, mocker):
+        sent = []
+
+        async def send_db_dump(path):
+            sent.append(gzip.decompress(path.read_bytes()))
+
+        mocker.patch('app.bot_helper.send.send_db_dump', send_db_dump)
+        settings = get_settings().model_copy(
+            update={'DB_DUMP_DIR': tmp_path / 'dumps'}
+        )
+        with override_settings(settings):
+            await db_dump(base_logger=mock.Mock())
+        assert sent == [f'select {settings.POSTGRES_DB};\n'.encode()]
+        assert len(list((tmp_path / 'dumps').iterdir())) == 1
+
+    @pytest.mark.usefixtures('mock_send_db_dump')
+    async def test_retention(self, tmp_path):
+        settings = get_settings().model_copy(
+            update={
+                'DB_DUMP_DIR': tmp_path / 'dumps',
+                'DB_DUMP_KEEP_DAILY': 0,
+                'DB_DUMP_KEEP_WEEKLY': 0,
+            }
+        )
+        with override_settings(settings):
+            await db_dump(base_logger=mock.Mock())
+        assert not list((tmp_path / 'dumps').iterdir())
@@ -0,0 +1,298 @@
+import asyncio
+import importlib
+import json
+import os
+import sys
+from unittest import mock
+
+import loguru
+import pytest
+
+import tools.load_config
+from app.config import get_settings, override_settings
+from app.scheduler import list_of_jobs
+from app.schemas import scheduler as scheduler_schemas
+from app.utils.job_executor import shutdown_executors
+from app.utils.job_run import has_log_id, job_logs
+
+
+pytestmark = pytest.mark.asyncio
+
+scheduler_main = importlib.import_module('app.scheduler.__main__')
+job_info_wrapper = (
+    scheduler_main._job_info_wrapper  # pylint: disable=protected-access
+)
+
+
+async def process_job(base_logger):
+    # Module level, so process pool workers can import it
+    base_logger.info('Process job message')
+    return os.getpid()
+
+
+@pytest.fixture(name='mock_record_job_run')
+def mock_record_job_run_fixture(mocker):
+    return mocker.patch.object(scheduler_main, 'record_job_run')
+
+
+@pytest.fixture(name='mock_send_traceback')
+def mock_send_traceback_fixture(mocker):
+    return mocker.patch(
+        'app.bot_helper.send.send_traceback_message_safe',
+        new_callable=mock.AsyncMock,
+    )
+
+
+@pytest.fixture(name='job_log_sink')
+def job_log_sink_fixture():
+    handler_id = loguru.logger.add(
+        job_logs.write, serialize=True, enqueue=True, filter=has_log_id
+    )
+    yield
+    loguru.logger.remove(handler_id)
+
+
+@pytest.fixture(name='scheduler_logger')
+def scheduler_logger_fixture(tmp_path):
+    settings = get_settings().model_copy(
+        update={'LOGGING_SCHEDULER_FILE': tmp_path / 'scheduler.log'}
+    )
+    with override_settings(settings):
+        scheduler_main.configure_logger()
+        yield
+    shutdown_executors()
+    loguru.logger.remove()
+    loguru.logger.add(sys.stderr)
+
+
+@pytest.fixture(name='sent_logs')
+def sent_logs_fixture(mocker):
+    sent_logs = []
+
+    async def send_file(filename, caption, **_):
+        sent_logs.append((caption, filename.read_text()))
+
+    mocker.patch('app.bot_helper.send.send_file', send_file)
+    mocker.patch(
+        'app.bot_helper.send.send_message_safe', new_callable=mock.AsyncMock
+    )
+    return sent_logs
+
+
+@pytest.mark.usefixtures('mock_send_traceback')
+class TestJobWrapperHandler:
+    async def test_timeout(self, mock_record_job_run):
+        cancelled = asyncio.Event()
+
+        async def job(**_):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=job, trigger='interval', name='slow', timeout=0.05
+            )
+        )
+        assert job_info.timeout is None
+        with pytest.raises(TimeoutError):
+            await job_info.func()
+        assert cancelled.is_set()
+        assert mock_record_job_run.call_args.args[3] == 'timeout'
+
+    async def test_error(self, mock_record_job_run):
+        async def job(**_):
+            raise ValueError('error')
+
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=job, trigger='interval', name='failing', timeout=10
+            )
+        )
+        with pytest.raises(ValueError):
+            await job_info.func()
+        assert mock_record_job_run.call_args.args[3] == 'error'
+
+    async def test_finished_in_time(self, mock_record_job_run):
+        async def job(**_):
+            return 'result'
+
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=job, trigger='interval', name='fast', timeout=10
+            )
+        )
+        assert await job_info.func() == 'result'
+        assert mock_record_job_run.call_args.args[3] == 'ok'
+
+    @pytest.mark.usefixtures('mock_record_job_run', 'job_log_sink')
+    async def test_send_logs(self, sent_logs):
+        async def job(base_logger):
+            base_logger.info('Job message')
+            loguru.logger.info('Not a job message')
+
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=job,
+                trigger='interval',
+                name='logged',
+                config=scheduler_schemas.JobConfig(send_logs=True),
+            )
+        )
+        await job_info.func()
+        await job_info.func()
+
+        assert len(sent_logs) == 2
+        caption, logs = sent_logs[0]
+        log_id = caption.removeprefix('job-logged-')
+        records = [json.loads(line)['record'] for line in logs.splitlines()]
+        assert [record['message'] for record in records] == [
+            'Job logged started (args=(), kwargs={})',
+            'Job message',
+            'Job logged finished',
+        ]
+        assert {record['extra']['uuid'] for record in records} == {log_id}
+        assert log_id not in job_logs
+        assert not list(
+            (get_settings().LOGGING_FILE_DIR / 'scheduler').glob('*logged*')
+        )
+
+    @pytest.mark.usefixtures('mock_record_job_run', 'job_log_sink')
+    async def test_send_logs_on_error(self, sent_logs):
+        async def job(base_logger):
+            base_logger.info('Job message')
+            raise ValueError('error')
+
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=job,
+                trigger='interval',
+                name='logged',
+                config=scheduler_schemas.JobConfig(send_logs=True),
+            )
+        )
+        with pytest.raises(ValueError):
+            await job_info.func()
+        ((_, logs),) = sent_logs
+        assert 'Job message' in logs
+
+    @pytest.mark.usefixtures('mock_record_job_run', 'scheduler_logger')
+    async def test_process_job_logs_sent(self, sent_logs):
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=process_job,
+                trigger='interval',
+                name='logged',
+                executor='process',
+                config=scheduler_schemas.JobConfig(send_logs=True),
+            )
+        )
+        assert await job_info.func() != os.getpid()
+        ((_, logs),) = sent_logs
+        assert 'Process job message' in logs
+
+    @pytest.mark.usefixtures('mock_record_job_run', 'sent_logs')
+    async def test_cancelled_logs_dropped(self, mocker):
+        start = mocker.spy(job_logs, 'start')
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=lambda **_: asyncio.sleep(10),
+                trigger='interval',
+                name='logged',
+                config=scheduler_schemas.JobConfig(send_logs=True),
+            )
+        )
+        task = asyncio.create_task(job_info.func())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert start.call_args.args[0] not in job_logs
+
+
+class TestGetSchedulerHandler:
+    async def test_job_options(self, mocker):
+        async def job(**_):
+            pass
+
+        mocker.patch.object(
+            scheduler_main,
+            'list_of_jobs',
+            [
+                scheduler_schemas.JobInfo(
+                    func=job,
+                    trigger='interval',
+                    name='job',
+                    minutes=1,
+                    timeout=30,
+                    max_instances=2,
+                    coalesce=True,
+                    misfire_grace_time=15,
+                    jitter=5,
+                    executor='thread',
+                )
+            ],
+        )
+        (scheduled,) = scheduler_main.get_scheduler().get_jobs()
+        assert scheduled.max_instances == 2
+        assert scheduled.coalesce is True
+        assert scheduled.misfire_grace_time == 15
+        assert scheduled.trigger.jitter == 5
+        assert scheduled.executor == 'default'
+
+    async def test_wrapped_once(self, mocker):
+        async def job(**_):
+            pass
+
+        job_info = scheduler_schemas.JobInfo(
+            func=job,
+            trigger='interval',
+            name='job',
+            minutes=1,
+            config=scheduler_schemas.JobConfig(send_logs=True),
+        )
+        mocker.patch.object(scheduler_main, 'list_of_jobs', [job_info])
+        scheduler_main.get_scheduler()
+        (scheduled,) = scheduler_main.get_scheduler().get_jobs()
+        assert scheduled.func.__wrapped__ is job
+        assert job_info.func is job
+        assert job_info.config is not None
+
+    async def test_jobs_match_config(self):
+        settings = get_settings()
+        config = tools.load_config.get_config(
+            settings.BASE_DIR / settings.CONFIG_FILENAME
+        )['scheduler']
+        assert {
+            job_info.name: job_info.model_dump(
+                exclude={'func', 'name'}, exclude_none=True
+            )
+            for job_info in list_of_jobs
+        } == config
+
+
+class TestStepDownHandler:
+    @pytest.mark.usefixtures('mock_record_job_run', 'mock_send_traceback')
+    async def test_running_jobs_cancelled(self):
+        started = asyncio.Event()
+
+        async def job(**_):
+            started.set()
+            await asyncio.Event().wait()
+
+        job_info = job_info_wrapper(
+            scheduler_schemas.JobInfo(
+                func=job, trigger='interval', name='long'
+            )
+        )
+        task = asyncio.create_task(job_info.func())
+        await started.wait()
+        scheduler = mock.Mock()
+        scheduler_main._step_down(  # pylint: disable=protected-access
+            scheduler
+        )
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        scheduler.pause.assert_called_once()
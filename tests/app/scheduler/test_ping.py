@@ -0,0 +1,133 @@
+import asyncio
+import importlib
+import time
+from unittest import mock
+
+import httpx
+import pytest
+from aiohttp import web
+
+from app.bot_helper import bot
+from app.config import get_settings, override_settings
+from app.utils.job_executor import run_job
+from tests.utils import start_bot_api
+
+
+# `app.scheduler.ping` attribute is the job function, not the module
+ping = importlib.import_module('app.scheduler.ping')
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='mock_send_ping_status')
+def mock_send_ping_status_fixture(mocker):
+    return mocker.patch('app.bot_helper.send.send_ping_status')
+
+
+@pytest.fixture(name='latency_history')
+def latency_history_fixture(mocker):
+    return mocker.patch.object(ping, 'latency_history', ping.LatencyHistory(3))
+
+
+@pytest.fixture(name='bot_api')
+async def bot_api_fixture(mocker):
+    """
+    Stand-in Bot API server, returns Telegram methods called.
+    """
+    methods = []
+
+    async def handle(request):
+        methods.append(request.match_info['method'])
+        if request.match_info['method'] != 'sendMessage':
+            return web.json_response({'ok': True, 'result': True})
+        form = await request.post()
+        chat = {'id': int(form['chat_id']), 'type': 'private'}
+        return web.json_response(
+            {
+                'ok': True,
+                'result': {'message_id': 1, 'date': 0, 'chat': chat},
+            }
+        )
+
+    application = web.Application()
+    application.router.add_post('/bot{token}/{method}', handle)
+    runner, api_bot = await start_bot_api(application)
+    mocker.patch('app.bot_helper.bot.bot', api_bot)
+    mocker.patch('app.bot_helper.send.ping_status.MESSAGE_ID', None)
+    settings = get_settings().model_copy(update={'TG_ERROR_CHAT_ID': '1'})
+    with override_settings(settings):
+        yield methods
+    await api_bot.session.close()
+    await runner.cleanup()
+
+
+def _mock_client(mocker, handler) -> None:
+    mocker.patch.object(
+        ping,
+        'get_client',
+        return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+class TestLatencyHistoryHandler:
+    async def test_percentiles(self):
+        history = ping.LatencyHistory(3)
+        for latency in (1.0, 0.001, 0.002, 0.003):
+            history.add('host', 'endpoint', latency)
+        assert history.percentiles() == {'host': {'endpoint': (2.0, 3.0)}}
+
+    async def test_resize(self):
+        history = ping.LatencyHistory(3)
+        for latency in (0.001, 0.002, 0.003):
+            history.add('host', 'endpoint', latency)
+        history.size = 2
+        history.add('host', 'endpoint', 0.004)
+        assert history.percentiles() == {'host': {'endpoint': (3.0, 4.0)}}
+
+
+@pytest.mark.usefixtures('latency_history')
+class TestPingJobHandler:
+    async def test_concurrent(self, mocker, mock_send_ping_status):
+        async def handler(request):
+            await asyncio.sleep(0.2)
+            if 'nginx' in request.url.host:
+                return httpx.Response(502)
+            return httpx.Response(200)
+
+        _mock_client(mocker, handler)
+        start = time.perf_counter()
+        await ping.job(base_logger=mock.Mock())
+        assert time.perf_counter() - start < 0.6
+
+        result, latency = mock_send_ping_status.call_args.args
+        settings = get_settings()
+        app_host = f'app:{settings.APP_PORT}'
+        nginx_host = f'nginx:{settings.NGINX_EXTERNAL_PORT}'
+        assert result[app_host] == dict.fromkeys(ping.ENDPOINTS, 'Successful')
+        assert result[nginx_host] == dict.fromkeys(
+            ping.ENDPOINTS, 'Failed (status code: 502)'
+        )
+        assert set(latency) == {app_host, nginx_host}
+
+    async def test_timeout(self, mocker, mock_send_ping_status):
+        async def handler(request):
+            if 'nginx' in request.url.host:
+                await asyncio.sleep(10)
+            return httpx.Response(200)
+
+        _mock_client(mocker, handler)
+        settings = get_settings().model_copy(update={'PING_TIMEOUT': 0.1})
+        with override_settings(settings):
+            await ping.job(base_logger=mock.Mock())
+
+        result, latency = mock_send_ping_status.call_args.args
+        nginx_host = f'nginx:{settings.NGINX_EXTERNAL_PORT}'
+        for status in result[nginx_host].values():
+            assert status.startswith('Failed')
+        assert nginx_host not in latency
+
+    async def test_thread_executor(self, mocker, bot_api):
+        _mock_client(mocker, lambda _: httpx.Response(200))
+        # Bot session is opened on this (scheduler) loop
+        await bot.bot.send_message(chat_id=1, text='started')
+        await run_job('thread', ping.job, 'log-id')
+        assert bot_api == ['sendMessage', 'sendMessage', 'pinChatMessage']
@@ -0,0 +1,25 @@
+import pytest
+from fastapi import status
+
+from app.config import get_settings
+from app.endpoints.v1 import prefix
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestUniqueIDMiddlewareHandler:
+    @staticmethod
+    def get_url() -> str:
+        settings = get_settings()
+        return f'{settings.PATH_PREFIX}{prefix}/health_check/ping_application'
+
+    async def test_log_id_header(self, client):
+        response = await client.get(url=self.get_url())
+        assert response.status_code == status.HTTP_200_OK, response.json()
+        assert len(response.headers['log-id']) == 32
+
+    async def test_log_id_unique(self, client):
+        first = await client.get(url=self.get_url())
+        second = await client.get(url=self.get_url())
+        assert first.headers['log-id'] != second.headers['log-id']
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from fastapi import status
+
+from app.config import get_settings, override_settings
+from app.endpoints.v1 import prefix
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='profiling_settings')
+def profiling_settings_fixture(tmp_path):
+    settings = get_settings().model_copy(
+        update={
+            'PROFILING_ENABLED': True,
+            'PROFILING_TOKEN': 'secret',
+            'PROFILING_DIR': tmp_path,
+        }
+    )
+    with override_settings(settings):
+        yield settings
+
+
+class TestProfilingMiddlewareHandler:
+    @staticmethod
+    def get_url() -> str:
+        settings = get_settings()
+        return f'{settings.PATH_PREFIX}{prefix}/health_check/ping_application'
+
+    async def test_header(self, client, profiling_settings):
+        response = await client.get(
+            url=self.get_url(), headers={'X-Profile': 'secret'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        path = (
+            profiling_settings.PROFILING_DIR
+            / f'{response.headers["log-id"]}.speedscope.json'
+        )
+        assert 'speedscope' in json.loads(path.read_text())['$schema']
+
+    async def test_query_param_ignored(self, client, profiling_settings):
+        response = await client.get(
+            url=self.get_url(), params={'profile': 'secret'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert not list(profiling_settings.PROFILING_DIR.iterdir())
+
+    @pytest.mark.parametrize('headers', [{}, {'X-Profile': 'wrong'}])
+    async def test_not_profiled(self, client, profiling_settings, headers):
+        response = await client.get(url=self.get_url(), headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert not list(profiling_settings.PROFILING_DIR.iterdir())
+
+    async def test_disabled(self, client, profiling_settings):
+        settings = profiling_settings.model_copy(
+            update={'PROFILING_ENABLED': False}
+        )
+        with override_settings(settings):
+            await client.get(
+                url=self.get_url(), headers={'X-Profile': 'secret'}
+            )
+        assert not list(profiling_settings.PROFILING_DIR.iterdir())
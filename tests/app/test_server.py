@@ -0,0 +1,63 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+
+import pytest
+
+from app import config, server
+from app.config import get_settings
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='restore_signals')
+def restore_signals_fixture():
+    handlers = {
+        signum: signal.getsignal(signum)
+        for signum in server.UvicornWorker.SIGNALS
+    }
+    yield
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+class TestProductionServerHandler:
+    async def test_workers_count_default(self):
+        settings = get_settings().model_copy(update={'APP_WORKERS': 0})
+        assert server.get_workers_count(settings) == (
+            multiprocessing.cpu_count()
+        )
+
+    async def test_workers_count_from_settings(self):
+        settings = get_settings().model_copy(update={'APP_WORKERS': 3})
+        assert server.get_workers_count(settings) == 3
+
+    async def test_load_config(self):
+        application = object()
+        production_server = server.ProductionServer(
+            application,  # type: ignore
+            {'workers': 3, 'preload_app': True},
+        )
+        assert production_server.cfg.workers == 3
+        assert production_server.cfg.preload_app
+        assert production_server.load() is application
+
+    async def test_settings_reloaded_on_reload(self):
+        settings = get_settings()
+        options = server.get_server_options(settings)
+        assert options['preload_app']
+        with config.override_settings(settings):
+            options['on_reload'](object())
+            assert get_settings() is not settings
+
+    @pytest.mark.usefixtures('restore_signals')
+    async def test_worker_reloads_on_sighup(self):
+        worker = server.UvicornWorker.__new__(server.UvicornWorker)
+        worker.init_signals()
+        settings = get_settings()
+        with config.override_settings(settings):
+            os.kill(os.getpid(), signal.SIGHUP)
+            await asyncio.sleep(0)
+            assert get_settings() is not settings
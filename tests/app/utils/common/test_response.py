@@ -0,0 +1,20 @@
+import json
+from datetime import datetime, timezone
+
+from app.schemas.auth import UserSchema
+from app.utils.common import ModelResponse
+
+
+class TestModelResponseHandler:
+    def test_model(self):
+        now = datetime(2023, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        model = UserSchema(username='user', dt_created=now, dt_updated=now)
+        response = ModelResponse(model)
+        assert response.body == model.model_dump_json().encode()
+        assert response.headers['content-type'] == 'application/json'
+        assert json.loads(response.body)['dt_created'] == (
+            '2023-01-02T03:04:05Z'
+        )
+
+    def test_plain_content(self):
+        assert ModelResponse({'key': [1, 2]}).body == b'{"key":[1,2]}'
@@ -0,0 +1,72 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from app.utils.errors import ErrorAggregator, get_error_fingerprint
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _raise(exc_type: type[Exception], message: str) -> Exception:
+    with pytest.raises(exc_type) as exc_info:
+        raise exc_type(message)
+    return exc_info.value
+
+
+class TestGetErrorFingerprintHandler:
+    async def test_message_ignored(self):
+        assert get_error_fingerprint(
+            _raise(ValueError, 'id=1')
+        ) == get_error_fingerprint(_raise(ValueError, 'id=2'))
+
+    async def test_type(self):
+        assert get_error_fingerprint(
+            _raise(ValueError, 'error')
+        ) != get_error_fingerprint(_raise(KeyError, 'error'))
+
+
+class TestErrorAggregatorHandler:
+    async def test_first_reported(self):
+        aggregator = ErrorAggregator(mock.Mock(), 60, 10, 2, 3600)
+        assert aggregator.record(_raise(ValueError, '1'), 'a') is True
+        assert aggregator.record(_raise(ValueError, '2'), 'b') is False
+        assert aggregator.record(_raise(ValueError, '3'), 'c') is False
+        (stats,) = aggregator.stats().values()
+        assert stats['count'] == 3
+        assert stats['title'] == 'ValueError: 1'
+        assert stats['request_ids'] == ['b', 'c']
+        aggregator.clear()
+
+    async def test_summary_after_window(self):
+        notify = mock.Mock()
+        aggregator = ErrorAggregator(notify, 0, 10, 5, 3600)
+        for request_id in ('a', 'b', 'c'):
+            aggregator.record(_raise(ValueError, '<1>'), request_id)
+        notify.assert_not_called()
+        await asyncio.sleep(0.01)
+        notify.assert_called_once()
+        summary = notify.call_args.args[0]
+        assert 'repeated 2 times (3 in total)' in summary
+        assert 'ValueError: &lt;1&gt;' in summary
+        assert 'Request ids: a, b, c' in summary
+        aggregator.flush()
+        notify.assert_called_once()
+
+    async def test_max_size(self):
+        aggregator = ErrorAggregator(mock.Mock(), 60, 1, 5, 3600)
+        aggregator.record(_raise(ValueError, 'error'))
+        aggregator.record(_raise(KeyError, 'error'))
+        (stats,) = aggregator.stats().values()
+        assert stats['title'] == "KeyError: 'error'"
+
+    async def test_reported_again_after_quiet_period(self):
+        aggregator = ErrorAggregator(mock.Mock(), 60, 10, 5, 0)
+        assert aggregator.record(_raise(ValueError, '1'), 'a') is True
+        await asyncio.sleep(0.01)
+        assert aggregator.record(_raise(ValueError, '2'), 'b') is True
+        (stats,) = aggregator.stats().values()
+        assert stats['count'] == 1
+        assert stats['title'] == 'ValueError: 2'
+        assert stats['request_ids'] == ['b']
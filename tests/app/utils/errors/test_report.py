@@ -0,0 +1,54 @@
+import pytest
+
+from app.utils.errors import ErrorReport
+from app.utils.errors.report import MAX_HEADER_LENGTH
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _raise(message: str) -> Exception:
+    with pytest.raises(ValueError) as exc_info:
+        raise ValueError(message)
+    return exc_info.value
+
+
+@pytest.fixture(name='scope')
+def scope_fixture():
+    return {
+        'type': 'http',
+        'method': 'POST',
+        'path': '/api/v1/user/me',
+        'request_id': 'request-id',
+        'client': ('127.0.0.1', 5000),
+        'headers': [
+            (b'host', b'localhost'),
+            (b'user-agent', b'a' * 1000),
+            (b'authorization', b'Bearer secret'),
+            (b'cookie', b'session=secret'),
+        ],
+        'state': {'user': 'secret'},
+    }
+
+
+class TestErrorReportHandler:
+    async def test_message(self, scope):
+        report = ErrorReport('project', scope, _raise('error'))
+        message = report.message
+        assert message.startswith('*Exception occurred on project*:')
+        assert '\t- method: POST' in message
+        assert '\t- path: /api/v1/user/me' in message
+        assert '\t- request_id: request-id' in message
+        assert '\t- client: 127.0.0.1:5000' in message
+        assert '\t- host: localhost' in message
+        assert 'EXCEPTION: ValueError: error' in message
+
+    async def test_headers_filtered(self, scope):
+        report = ErrorReport('project', scope, _raise('error'))
+        assert 'secret' not in report.message
+        assert dict(report.headers)['user-agent'] == 'a' * MAX_HEADER_LENGTH
+
+    async def test_code(self, scope):
+        report = ErrorReport('project', scope, _raise('error'))
+        assert report.code.startswith('Traceback (most recent call last):')
+        assert 'raise ValueError(message)' in report.code
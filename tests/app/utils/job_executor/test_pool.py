@@ -0,0 +1,145 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import loguru
+import pytest
+import sqlalchemy as sa
+
+from app.bot_helper import send
+from app.bot_helper.dispatcher import NotificationDispatcher
+from app.config import get_settings, override_settings
+from app.database.connection import SessionManager
+from app.utils.common import on_scheduler_loop
+from app.utils.job_executor import PROCESS_CONTEXT, run_job, shutdown_executors
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def job(value, base_logger):
+    # Module level, so process pool workers can import it
+    base_logger.info('Job value {}', value)
+    return value * 2, os.getpid(), threading.get_ident()
+
+
+async def current_loop():
+    return asyncio.get_running_loop()
+
+
+@pytest.fixture(name='sent')
+def sent_fixture(mocker):
+    sent = []
+
+    async def send_message(message, *_):
+        sent.append(message)
+
+    mocker.patch(
+        'app.bot_helper.send.message.dispatcher',
+        NotificationDispatcher(send_message),
+    )
+    settings = get_settings().model_copy(update={'TG_BATCH_DELAY': 0})
+    with override_settings(settings):
+        yield sent
+
+
+@pytest.fixture(name='records')
+def records_fixture():
+    records = []
+    # Workers get logger when spawned, sinks must be enqueued
+    loguru.logger.remove()
+    loguru.logger.add(
+        lambda message: records.append(message.record),
+        enqueue=True,
+        context=PROCESS_CONTEXT,
+    )
+    yield records
+    shutdown_executors()
+    loguru.logger.remove()
+    loguru.logger.add(sys.stderr)
+
+
+class TestRunJobHandler:
+    @pytest.mark.parametrize('executor', ['asyncio', 'thread', 'process'])
+    async def test_run(self, executor, records):
+        result, pid, thread_id = await run_job(executor, job, 'log-id', 21)
+        loguru.logger.complete()
+
+        assert result == 42
+        assert (pid == os.getpid()) is (executor != 'process')
+        assert (thread_id == threading.get_ident()) is (executor == 'asyncio')
+        assert [
+            (record['message'], record['extra']) for record in records
+        ] == [('Job value 21', {'uuid': 'log-id'})]
+
+    @pytest.mark.usefixtures('records')
+    async def test_error(self):
+        async def failing(base_logger):
+            raise ValueError(base_logger)
+
+        with pytest.raises(ValueError):
+            await run_job('thread', failing, 'log-id')
+
+    @pytest.mark.usefixtures('records')
+    async def test_thread_notification_sent(self, sent):
+        async def notifying(base_logger):
+            await send.send_message_safe(base_logger, 'from job')
+
+        await send.send_message_safe(loguru.logger, 'from scheduler')
+        await run_job('thread', notifying, 'log-id')
+        await send.message.dispatcher.close()
+        assert sorted('\n\n'.join(sent).split('\n\n')) == [
+            'from job',
+            'from scheduler',
+        ]
+
+    @pytest.mark.usefixtures('records')
+    async def test_on_scheduler_loop(self):
+        async def using_scheduler_loop(**_):
+            return await on_scheduler_loop(current_loop())
+
+        assert (
+            await run_job('thread', using_scheduler_loop, 'log-id')
+            is asyncio.get_running_loop()
+        )
+
+    @pytest.mark.usefixtures('records', 'postgres')
+    async def test_thread_job_database(self):
+        async def select_one(**_):
+            async with SessionManager().create_async_session() as session:
+                return await session.scalar(sa.text('SELECT 1'))
+
+        # Connections of the scheduler engine belong to this loop
+        assert await select_one() == 1
+        assert await run_job('thread', select_one, 'log-id') == 1
+
+    @pytest.mark.usefixtures('records')
+    async def test_thread_job_cancelled(self):
+        cancelled = threading.Event()
+
+        async def slow(**_):
+            try:
+                await asyncio.Event().wait()
+            finally:
+                cancelled.set()
+
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                await run_job('thread', slow, 'log-id')
+        assert cancelled.is_set()
+
+    @pytest.mark.usefixtures('records')
+    async def test_waits_for_pool_run(self):
+        finished = threading.Event()
+
+        async def blocking(**_):
+            # Can't be cancelled, holds the loop of its thread
+            time.sleep(0.2)
+            finished.set()
+
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                await run_job('thread', blocking, 'log-id')
+        assert finished.is_set()
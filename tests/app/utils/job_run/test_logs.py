@@ -0,0 +1,42 @@
+import loguru
+import pytest
+
+from app.utils.job_run import JobLogBuffer, has_log_id
+from app.utils.job_run.logs import TRUNCATED_MESSAGE
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(name='buffer')
+def buffer_fixture():
+    buffer = JobLogBuffer(max_size=100)
+    handler_id = loguru.logger.add(
+        buffer.write, format='{message}', filter=has_log_id
+    )
+    yield buffer
+    loguru.logger.remove(handler_id)
+
+
+class TestJobLogBufferHandler:
+    async def test_demultiplexed(self, buffer):
+        buffer.start('first')
+        buffer.start('second')
+        loguru.logger.bind(uuid='first').info('one')
+        loguru.logger.bind(uuid='second').info('two')
+        loguru.logger.bind(uuid='other').info('other')
+        loguru.logger.info('no uuid')
+        loguru.logger.bind(uuid='first').info('three')
+
+        assert buffer.pop('first') == 'one\nthree\n'
+        assert buffer.pop('second') == 'two\n'
+        assert 'first' not in buffer
+        assert buffer.pop('first') == ''
+
+    async def test_truncated(self, buffer):
+        buffer.start('run')
+        logger = loguru.logger.bind(uuid='run')
+        for _ in range(20):
+            logger.info('x' * 9)
+        # Ten 10 characters messages fit, the rest is replaced by one marker
+        assert buffer.pop('run') == ('x' * 9 + '\n') * 10 + TRUNCATED_MESSAGE
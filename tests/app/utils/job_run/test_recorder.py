@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+import sqlalchemy as sa
+
+from app.database.models import JobRun
+from app.utils.job_run import (
+    decode_cursor,
+    encode_cursor,
+    record_job_run,
+    wait_job_runs,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestRecordJobRunHandler:
+    async def test_saved(self, session):
+        dt_started = datetime.now(timezone.utc)
+        record_job_run('ping', dt_started, 1.5, 'error', 'log', 'abc')
+        await wait_job_runs()
+
+        run = await session.scalar(sa.select(JobRun))
+        assert run.name == 'ping'
+        assert run.dt_started == dt_started
+        assert run.duration == 1.5
+        assert (run.dt_finished - run.dt_started).total_seconds() == 1.5
+        assert run.error_fingerprint == 'abc'
+
+
+class TestCursorHandler:
+    async def test_round_trip(self):
+        value = (datetime.now(timezone.utc), uuid4())
+        assert decode_cursor(encode_cursor(*value)) == value
+
+    async def test_invalid(self):
+        with pytest.raises(ValueError):
+            decode_cursor('invalid')
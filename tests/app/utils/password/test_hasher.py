@@ -0,0 +1,59 @@
+# pylint: disable=redefined-outer-name
+
+import asyncio
+
+import pytest
+
+from app.config import get_settings, override_settings
+from app.utils.password import (
+    PasswordHasher,
+    PasswordHasherOverloadedError,
+    get_crypt_context,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def hasher():
+    settings = get_settings().model_copy(
+        update={
+            'PASSWORD_HASH_ROUNDS': 4,
+            'PASSWORD_HASHER_WORKERS': 1,
+            'PASSWORD_HASHER_QUEUE_SIZE': 0,
+        }
+    )
+    with override_settings(settings):
+        PasswordHasher().refresh()
+        yield PasswordHasher()
+    PasswordHasher().refresh()
+
+
+class TestPasswordHasherHandler:
+    async def test_hash_and_verify(self, hasher):
+        hashed_password = await hasher.hash('password')
+        assert await hasher.verify('password', hashed_password) == (
+            True,
+            None,
+        )
+
+    async def test_verify_wrong_password(self, hasher):
+        hashed_password = await hasher.hash('password')
+        is_valid, _ = await hasher.verify('wrong', hashed_password)
+        assert not is_valid
+
+    async def test_verify_rehash_on_cost_change(self, hasher):
+        hashed_password = get_crypt_context(5).hash('password')
+        is_valid, new_hash = await hasher.verify('password', hashed_password)
+        assert is_valid
+        assert new_hash is not None
+        assert new_hash.split('$')[2] == '04'
+
+    async def test_overloaded(self, hasher):
+        results = await asyncio.gather(
+            hasher.hash('password'),
+            hasher.hash('password'),
+            return_exceptions=True,
+        )
+        assert isinstance(results[1], PasswordHasherOverloadedError)
@@ -0,0 +1,113 @@
+# pylint: disable=unused-argument
+
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pydantic
+import pytest
+import sqlalchemy as sa
+from prometheus_client import REGISTRY
+
+from app.database.models import User
+from app.schemas.auth import Principal
+from app.utils import user
+from app.utils.user.cache import PrincipalCache
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def build_principal() -> Principal:
+    now = datetime.now(timezone.utc)
+    return Principal(
+        id=uuid.uuid4(),
+        username=uuid.uuid4().hex,
+        dt_created=now,
+        dt_updated=now,
+    )
+
+
+class TestPrincipalCacheHandler:
+    async def test_get_miss(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        assert cache.get('token') is None
+        assert cache.stats()['misses'] == 1
+
+    async def test_get_hit(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        user_model = build_principal()
+        cache.set('token', user_model)
+        assert cache.get('token') is user_model
+        assert cache.stats()['hits'] == 1
+
+    async def test_get_expired_token(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        cache.set('token', build_principal(), token_exp=time.time())
+        assert cache.get('token') is None
+        assert cache.stats()['size'] == 0
+
+    async def test_set_evicts_least_recently_used(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        cache.set('token1', build_principal())
+        cache.set('token2', build_principal())
+        cache.get('token1')
+        cache.set('token3', build_principal())
+        assert cache.get('token2') is None
+        assert cache.get('token1') is not None
+        assert cache.stats()['evictions'] == 1
+
+    async def test_invalidate(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        user_model = build_principal()
+        cache.set('token1', user_model)
+        cache.set('token2', user_model)
+        cache.invalidate(user_model.username)
+        assert cache.stats()['size'] == 0
+
+
+class TestGetCurrentUserCacheHandler:
+    async def test_get_current_user_cached(
+        self, session, created_user, user_token
+    ):
+        before = REGISTRY.get_sample_value(
+            'principal_cache_lookups_total', {'result': 'hit'}
+        )
+        first = await user.get_current_user(user_token, session)
+        second = await user.get_current_user(user_token, session)
+        assert first is second
+        assert user.principal_cache.stats()['hits'] == 1
+        assert (
+            REGISTRY.get_sample_value(
+                'principal_cache_lookups_total', {'result': 'hit'}
+            )
+            == (before or 0) + 1
+        )
+
+    async def test_get_current_user_invalidated_on_update(
+        self, session, created_user, user_token
+    ):
+        await user.get_current_user(user_token, session)
+        created_user.password = 'new_password'
+        await session.commit()
+        assert user.principal_cache.stats()['size'] == 0
+
+    async def test_get_current_user_snapshot(
+        self, session, created_user, user_token
+    ):
+        principal = await user.get_current_user(user_token, session)
+        assert isinstance(principal, Principal)
+        assert principal.id == created_user.id
+        with pytest.raises(pydantic.ValidationError):
+            principal.username = 'changed'  # type: ignore
+
+    async def test_get_current_user_invalidated_on_bulk_update(
+        self, session, created_user, user_token
+    ):
+        await user.get_current_user(user_token, session)
+        await session.execute(
+            sa.update(User)
+            .where(User.id == created_user.id)
+            .values(password='new_password')
+        )
+        assert user.principal_cache.stats()['size'] == 0
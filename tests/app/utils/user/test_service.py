@@ -70,27 +70,30 @@ class TestVerifyPasswordHandler:
         assert not user.verify_password('password', hashed_wrong_password)
 
 
-@pytest.mark.usefixtures('migrated_postgres')
 class TestGetCurrentUserHandler:
-    async def test_get_current_user_no_token(self):
+    async def test_get_current_user_no_token(self, session):
         with pytest.raises(HTTPException):
-            await user.get_current_user('')
+            await user.get_current_user('', session)
 
-    async def test_get_current_user_username_none(self):
+    async def test_get_current_user_username_none(self, session):
         with pytest.raises(HTTPException):
-            await user.get_current_user(user.create_access_token(data={}))
+            await user.get_current_user(
+                user.create_access_token(data={}), session
+            )
 
-    async def test_get_current_user_user_none(self, potential_user):
+    async def test_get_current_user_user_none(self, session, potential_user):
         with pytest.raises(HTTPException):
             await user.get_current_user(
                 user.create_access_token(
                     data={'sub': potential_user.username}
                 ),
+                session,
             )
 
-    async def test_get_current_user_ok(self, created_user):
+    async def test_get_current_user_ok(self, session, created_user):
         user_model = await user.get_current_user(
             user.create_access_token(data={'sub': created_user.username}),
+            session,
         )
         assert user_model is not None
         assert user_model.id == created_user.id
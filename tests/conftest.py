@@ -16,6 +16,7 @@ from alembic.config import Config
 from httpx import AsyncClient
 from sqlalchemy_utils import create_database, database_exists, drop_database
 
+from app.bot_helper import send
 from app.config import get_settings
 from app.creator import get_app
 from app.database.connection import SessionManager
@@ -36,6 +37,22 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    """
+    Drops users cached by previous tests.
+    """
+    user.principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_error_aggregator():
+    """
+    Drops errors counted by previous tests.
+    """
+    send.error_aggregator.clear()
+
+
 @pytest.fixture()
 def postgres() -> str:  # type: ignore
     """
@@ -154,3 +171,9 @@ def tmp_file():
         f.write('test')
     yield tmp_filename
     pathlib.Path(tmp_filename).unlink()
+
+
+@pytest.fixture(autouse=True)
+def mock_dispatcher(mocker):
+    """Keep notifications queued by code under test out of Telegram"""
+    return mocker.patch.object(send.dispatcher, 'enqueue')
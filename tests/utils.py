@@ -3,9 +3,14 @@ from pathlib import Path
 from types import SimpleNamespace
 from typing import Union
 
+import aiogram
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
 from alembic.config import Config
 from configargparse import Namespace
 
+from app.bot_helper.bot import BotSession
+
 
 PROJECT_PATH = Path(__file__).parent.parent.resolve()
 
@@ -43,3 +48,23 @@ def make_alembic_config(
         config.set_main_option('sqlalchemy.url', cmd_opts.pg_url)
 
     return config
+
+
+async def start_bot_api(
+    application: web.Application,
+) -> tuple[web.AppRunner, aiogram.Bot]:
+    """
+    Запускает сервер, заменяющий Bot API, и бота, который к нему обращается.
+    """
+    runner = web.AppRunner(application)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    bot = aiogram.Bot(
+        token='42:TEST',
+        session=BotSession(
+            api=TelegramAPIServer.from_base(f'http://127.0.0.1:{port}')
+        ),
+    )
+    return runner, bot
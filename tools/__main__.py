@@ -1,6 +1,17 @@
 import argparse
 
-from tools import gen, hash_password, load_config, open_sqlalchemy, run_job
+from app.database.connection import SessionManager
+from tools import (
+    assemble_file,
+    benchmark,
+    calibrate_password_hash,
+    gen,
+    hash_password,
+    load_config,
+    open_sqlalchemy,
+    restore_db,
+    run_job,
+)
 
 
 if __name__ == '__main__':
@@ -18,6 +29,7 @@ if __name__ == '__main__':
         nargs='*',
     )
     args = arg_parser.parse_args()
+    SessionManager().set_role('tools')
     match args.tool_name:
         case 'runjob':
             run_job.main(*args.tool_args)
@@ -27,7 +39,15 @@ if __name__ == '__main__':
             open_sqlalchemy.main(*args.tool_args)
         case 'hash-password':
             hash_password.main(*args.tool_args)
+        case 'calibrate-password-hash':
+            calibrate_password_hash.main(*args.tool_args)
         case 'load_config':
             load_config.main(*args.tool_args)
+        case 'benchmark':
+            benchmark.main(*args.tool_args)
+        case 'restore-db':
+            restore_db.main(*args.tool_args)
+        case 'assemble-file':
+            assemble_file.main(*args.tool_args)
         case _:
             raise ValueError(f'Unknown tool: {args.tool_name}')
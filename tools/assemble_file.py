@@ -0,0 +1,12 @@
+from pathlib import Path
+
+from loguru import logger
+
+from app.bot_helper.send import assemble_file
+
+
+def main(manifest: str) -> None:
+    """
+    Restore file sent in parts from parts downloaded next to manifest.
+    """
+    logger.info('Assembled {}', assemble_file(Path(manifest)))
@@ -0,0 +1,6 @@
+from ._main import main
+
+
+__all__ = [
+    'main',
+]
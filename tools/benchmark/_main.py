@@ -0,0 +1,24 @@
+import typing as tp
+
+from loguru import logger
+
+from . import middleware, serialization, session, settings
+
+
+list_of_benchmarks: dict[str, tp.Callable[..., None]] = {
+    'settings': settings.run,
+    'middleware': middleware.run,
+    'session': session.run,
+    'serialization': serialization.run,
+}
+
+
+def main(*args: tp.Any) -> None:
+    """Run benchmark by name (or all benchmarks)."""
+
+    names = [args[0]] if args else list(list_of_benchmarks)
+    for name in names:
+        if name not in list_of_benchmarks:
+            raise ValueError(f'Unknown benchmark: {name}')
+        logger.info('Running benchmark {}', name)
+        list_of_benchmarks[name](*args[1:])
@@ -0,0 +1,19 @@
+import time
+import timeit
+import typing as tp
+
+
+def measure(func: tp.Callable[[], tp.Any], number: int) -> float:
+    """Return mean time of one call in microseconds."""
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+async def measure_async(
+    func: tp.Callable[[], tp.Awaitable[tp.Any]], number: int
+) -> float:
+    """Return mean time of one awaited call in microseconds."""
+    await func()  # warm up
+    start = time.perf_counter()
+    for _ in range(number):
+        await func()
+    return (time.perf_counter() - start) / number * 1e6
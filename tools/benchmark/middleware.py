@@ -0,0 +1,98 @@
+import asyncio
+import sys
+import time
+import typing as tp
+import uuid
+
+import loguru
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import requests
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from uvicorn.protocols import utils
+
+from app.config import get_settings
+from app.creator import UniqueIDMiddleware, get_app
+from app.endpoints.v1 import prefix
+
+
+class LegacyUniqueIDMiddleware(BaseHTTPMiddleware):
+    """
+    Previous `BaseHTTPMiddleware` implementation, kept as baseline.
+    """
+
+    async def dispatch(
+        self, request: requests.Request, call_next: tp.Any
+    ) -> Response:
+        request.scope['request_id'] = uuid.uuid4().hex
+        response = Response(status_code=500)
+        request_info_dict = {
+            'request': {
+                'id': request['request_id'],
+                'method': request.method,
+                'scheme': request['scheme'],
+                'http_version': request['http_version'],
+                'path': utils.get_path_with_query_string(request.scope),  # type: ignore  # pylint: disable=line-too-long
+                'client': utils.get_client_addr(request.scope),  # type: ignore
+            },
+            'uuid': request['request_id'],
+        }
+        try:
+            with loguru.logger.contextualize(**request_info_dict):
+                response = await call_next(request)
+        finally:
+            request_info_dict['response'] = {
+                'status_code': response.status_code,
+            }
+            response.headers['log-id'] = request['request_id']
+            with loguru.logger.contextualize(**request_info_dict):
+                loguru.logger.info(
+                    '{request[client]} - "{request[method]} {request[path]} '
+                    'HTTP/{request[http_version]}" {response[status_code]}',
+                    request=request_info_dict['request'],
+                    response=request_info_dict['response'],
+                )
+        return response
+
+
+async def _requests_per_second(
+    application: FastAPI, url: str, number: int
+) -> float:
+    async with AsyncClient(app=application, base_url='http://test') as client:
+        await client.get(url)
+        start = time.perf_counter()
+        for _ in range(number):
+            await client.get(url)
+        return number / (time.perf_counter() - start)
+
+
+def run(number: str = '2000') -> None:
+    """Compare throughput of ping_application with both middlewares."""
+
+    settings = get_settings()
+    url = f'{settings.PATH_PREFIX}{prefix}/health_check/ping_application'
+    loguru.logger.remove()
+    loguru.logger.add(lambda _: None, serialize=True)
+
+    legacy_app = get_app(set_up_logger=False)
+    # Only request id middleware differs, the rest of the stack is kept
+    legacy_app.user_middleware = [
+        (
+            Middleware(LegacyUniqueIDMiddleware)
+            if middleware.cls is UniqueIDMiddleware
+            else middleware
+        )
+        for middleware in legacy_app.user_middleware
+    ]
+    before = asyncio.run(_requests_per_second(legacy_app, url, int(number)))
+    after = asyncio.run(
+        _requests_per_second(get_app(set_up_logger=False), url, int(number))
+    )
+
+    loguru.logger.remove()
+    loguru.logger.add(sys.stderr)
+    loguru.logger.info('BaseHTTPMiddleware: {:.0f} requests/sec', before)
+    loguru.logger.info('ASGI middleware: {:.0f} requests/sec', after)
+    loguru.logger.info('Speedup: {:.2f}x', after / before)
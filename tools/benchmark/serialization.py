@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from loguru import logger
+from pydantic import BaseModel
+
+from app.schemas import PingMessage, PingResponse
+from app.schemas.auth import Token, UserSchema
+from app.utils.common import ModelResponse
+
+from ._utils import measure, measure_async
+
+
+def _get_models() -> list[BaseModel]:
+    now = datetime.now(tz=timezone.utc)
+    return [
+        PingResponse(message=PingMessage.OK, detail='username'),
+        Token(access_token='x' * 160, token_type='bearer'),
+        UserSchema(username='username', dt_created=now, dt_updated=now),
+    ]
+
+
+async def _measure_model(model: BaseModel, number: int) -> None:
+    field = create_response_field(
+        name=f'Response_{type(model).__name__}', type_=type(model)
+    )
+
+    async def validated(response_class: type[JSONResponse]) -> None:
+        content = await serialize_response(
+            field=field, response_content=model, is_coroutine=True
+        )
+        response_class(content)
+
+    default = await measure_async(lambda: validated(JSONResponse), number)
+    orjson = await measure_async(lambda: validated(ORJSONResponse), number)
+    prevalidated = measure(lambda: ModelResponse(model), number)
+    logger.info(
+        '{}: JSONResponse {:.2f} us, ORJSONResponse {:.2f} us, '
+        'ModelResponse {:.2f} us ({:.1f}x)',
+        type(model).__name__,
+        default,
+        orjson,
+        prevalidated,
+        default / prevalidated,
+    )
+
+
+def run(number: str = '20000') -> None:
+    """Compare serialization time per response for API schemas."""
+
+    for model in _get_models():
+        asyncio.run(_measure_model(model, int(number)))
@@ -0,0 +1,48 @@
+import asyncio
+
+from loguru import logger
+from sqlalchemy import select, text
+
+from app.database.connection import SessionManager
+
+from ._utils import measure, measure_async
+
+
+async def _open_close() -> None:
+    async with SessionManager().create_async_session():
+        pass
+
+
+async def _noop_transaction() -> None:
+    async with SessionManager().create_async_session() as session:
+        await session.connection()
+
+
+async def _commit() -> None:
+    async with SessionManager().create_async_session() as session:
+        await session.scalar(select(text('1')))
+
+
+async def _run_async(number: int) -> dict[str, float]:
+    results = {
+        'open/close': await measure_async(_open_close, number),
+        'no-op transaction': await measure_async(_noop_transaction, number),
+        'select + commit': await measure_async(_commit, number),
+    }
+    await SessionManager().async_engine.dispose()
+    return results
+
+
+def run(number: str = '1000') -> None:
+    """Measure hot paths of SessionManager (needs configured database)."""
+
+    manager = SessionManager()
+    manager.refresh()
+    results = {
+        'get_async_session_maker': measure(
+            manager.get_async_session_maker, int(number)
+        ),
+        **asyncio.run(_run_async(int(number))),
+    }
+    for name, value in results.items():
+        logger.info('{}: {:.2f} us', name, value)
@@ -0,0 +1,24 @@
+from loguru import logger
+
+from app.config import get_settings
+from app.config.utils import create_settings
+
+from ._utils import measure
+
+
+# get_current_user, create_access_token, verify_password, send_message
+CALLS_PER_REQUEST = 4
+
+
+def run(number: str = '10000') -> None:
+    """Compare building settings with getting cached settings."""
+
+    created = measure(create_settings, int(number))
+    cached = measure(get_settings, int(number))
+    logger.info('create_settings: {:.2f} us/call', created)
+    logger.info('get_settings: {:.2f} us/call', cached)
+    logger.info(
+        'Saving per request ({} calls): {:.2f} us',
+        CALLS_PER_REQUEST,
+        (created - cached) * CALLS_PER_REQUEST,
+    )
@@ -0,0 +1,29 @@
+import time
+
+from loguru import logger
+
+from app.utils.password import get_crypt_context
+
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+
+def main(target_ms: str = '250') -> None:
+    """Pick bcrypt cost for target hashing latency on current hardware."""
+
+    best_rounds = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        context = get_crypt_context(rounds)
+        start = time.perf_counter()
+        context.hash('calibration')
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info('Rounds {}: {:.1f} ms', rounds, elapsed_ms)
+        if elapsed_ms > float(target_ms):
+            break
+        best_rounds = rounds
+    logger.info(
+        'Recommended PASSWORD_HASH_ROUNDS={} for target {} ms',
+        best_rounds,
+        target_ms,
+    )
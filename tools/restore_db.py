@@ -0,0 +1,16 @@
+import asyncio
+from pathlib import Path
+
+from loguru import logger
+
+from app.config import get_settings
+from app.database.dump import restore_dump
+
+
+def main(path: str, jobs: str = '0') -> None:
+    """
+    Restore custom or directory dump made by `db_dump` job.
+    """
+    logger.info('Restoring {}', path)
+    asyncio.run(restore_dump(Path(path), get_settings(), int(jobs)))
+    logger.info('Restored {}', path)
@@ -1,7 +1,10 @@
 import asyncio
+import typing as tp
 
 from loguru import logger
 
+from app.bot_helper import send
+
 
 try:
     from app.scheduler import list_of_jobs
@@ -21,4 +24,11 @@ def main(job_name: str) -> None:
         logger.error('Job {} is not unique', job_name)
         return
     job = jobs[0]
-    asyncio.run(job.func(base_logger=logger))
+    asyncio.run(_run(job.func))
+
+
+async def _run(func: tp.Callable[..., tp.Awaitable[tp.Any]]) -> None:
+    try:
+        await func(base_logger=logger)
+    finally:
+        await send.dispatcher.close()